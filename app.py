@@ -7,15 +7,38 @@ import networkx as nx
 import geopandas as gpd
 import os
 import pandas as pd
-from scipy.spatial import KDTree
-from shapely.geometry import Point
 import requests
 import branca.colormap as cm
-import copy
+import numpy as np
 from datetime import datetime
+from zoneinfo import ZoneInfo
 import altair as alt
 import itertools
 import base64
+from shapely.geometry import LineString, mapping
+from shapely.ops import substring
+
+from src.config.settings import (
+    CACHE_DIR, CCH_VERIFY, COST_KERNEL_VERIFY, REFUGE_SNAP_MAX_M, ROADS_SHP, ROUTING_ENGINE,
+    SHADOW_ARCHIVE_DIR, SHADOW_CSV_PATTERN, SNAPSHOT_DIR, TIME_DEPENDENT_ROUTING, TIME_SLOT_MINUTES
+)
+from src.data.edge_table import EdgeTable, build_edge_table
+from src.data.node_table import NodeTable, build_node_table
+from src.data.shadow_archive import open_shadow_archive
+from src.data.shadow_matrix import TIME_SLOTS, slot_label, slot_of_minutes, time_slots_every
+from src.data.snapshot import load_snapshot, save_snapshot, source_hash
+from src.logic.astar import astar_path, bidirectional_astar_path
+from src.logic.cch import CCH
+from src.logic.constrained import constrained_shortest_path
+from src.logic.costs import compute_costs, compute_personal_cost, edge_walk_time, shade_response
+from src.logic.graph_core import RoadNetwork, build_road_network
+from src.logic.landmarks import LandmarkStore
+from src.logic.overlay import CostOverlay
+from src.logic.pareto import pareto_front, select_from_front
+from src.logic.reach import cool_reach
+from src.logic.refuge import build_refuges, path_to_refuge, refuge_field
+from src.logic.snapping import RoadSnapper, get_transformer, insert_virtual_nodes
+from src.logic.time_dependent import shade_along, td_dijkstra
 
 
 # ======================================
@@ -163,7 +186,7 @@ def search_place_kakao(query):
 # ======================================
 @st.cache_data
 def load_roads():
-    shp_path = "data/non_buffered_roads.shp"   # ← PoC 구역용
+    shp_path = ROADS_SHP   # ← PoC 구역용 (data/non_buffered_roads.shp)
     # shp_path = "data/processed_roads.shp"    # ← 버퍼 적용 버전
 
     if not os.path.exists(shp_path):
@@ -182,25 +205,24 @@ def load_roads():
 
 
 # =========================
-# 그림자 데이터 로드
+# 그림자 데이터 로드 (날짜 x 시간대 x 링크 아카이브, mmap)
 # =========================
-@st.cache_data
+@st.cache_resource
 def load_shadow_data():
-    csv_path = "data/hourly_link_stat_20250708.csv"
-
-    if not os.path.exists(csv_path):
-        st.error(f"그림자 데이터 파일을 찾을 수 없습니다: {csv_path}")
+    # 날짜별 CSV가 바뀌었을 때만 아카이브 재생성 → 평소에는 mmap 핸들만 반환
+    # (날짜·시간대 한 칸은 요청 시 필요한 것만 디스크에서 읽음)
+    try:
+        archive = open_shadow_archive(SHADOW_CSV_PATTERN, SHADOW_ARCHIVE_DIR)
+    except ValueError as e:
+        # 컬럼 체크 (PoC 안정성)
+        st.error(f"그림자 데이터 컬럼이 올바르지 않습니다: {e}")
         st.stop()
 
-    df = pd.read_csv(csv_path)
-
-    # 컬럼 체크 (PoC 안정성)
-    required_cols = {"link_id", "time_slot", "shadow_ratio"}
-    if not required_cols.issubset(df.columns):
-        st.error(f"그림자 데이터 컬럼이 올바르지 않습니다: {df.columns.tolist()}")
+    if not archive.dates:
+        st.error(f"그림자 데이터 파일을 찾을 수 없습니다: {SHADOW_CSV_PATTERN}")
         st.stop()
 
-    return df
+    return archive
 
 
 # =========================
@@ -222,94 +244,129 @@ def load_shade_shelters():
         st.warning(f"그늘막 데이터 로드 중 오류 발생: {e}")
         return pd.DataFrame()
 
-# ====================================
-# KDTree용 노드 좌표 만들기 (한 번만)
-# ====================================
-def build_node_index(roads_gdf):
-    node_coords = {}
-
-    for _, row in roads_gdf.iterrows():
-        geom = row.geometry
-        if geom.geom_type != "LineString":
-            continue
-
-        coords = list(geom.coords)
-        node_coords[row["u"]] = coords[0]     # 시작점
-        node_coords[row["v"]] = coords[-1]    # 끝점
-
-    node_ids = list(node_coords.keys())
-    node_xy  = list(node_coords.values())
-
-    tree = KDTree(node_xy)
-    return tree, node_ids, node_xy
-
-
 # ======================================
-# 사용자 좌표 -> 가장 가까운 노드 찾기
+# 사용자 좌표 -> 가장 가까운 도로 선분 스냅 (STRtree, 1회 생성)
 # ======================================
-def get_nearest_node(lat, lon, tree, node_ids, node_xy):
-    # Kakao 좌표 → TM좌표
-    pt = gpd.GeoDataFrame(
-        geometry=[Point(lon, lat)],
-        crs="EPSG:4326"
-    ).to_crs("EPSG:5179")
+@st.cache_resource
+def build_road_snapper(_net):
+    return RoadSnapper(_net, _net.edges.geometries())
 
-    x, y = pt.geometry.iloc[0].x, pt.geometry.iloc[0].y
 
-    dist, idx = tree.query((x, y))
-    return node_ids[idx]
+def snap_endpoints(snapper, start_lat, start_lon, end_lat, end_lon):
+    # 출발/도착 일괄 스냅 → 선분 중간이면 가상 노드(-1, -2)를 삽입한 질의 네트워크
+    snaps = snapper.snap_points([start_lon, end_lon], [start_lat, end_lat])
+    qnet, (u_node, v_node) = insert_virtual_nodes(snapper, snaps)
+    return qnet, u_node, v_node, snaps
 
 
 # ===============================================
-# 시간대별 그림자 반영 함수
+# 도로망 바이너리 스냅샷 (원본 해시가 같으면 mmap 로드, 다르면 재생성)
 # ===============================================
-def attach_shadow_by_hour(G, shadow_df):
-    for hour in range(8, 20):
-        df_h = shadow_df[shadow_df["time_slot"] == hour]
-        ratio_map = df_h.set_index("link_id")["shadow_ratio"].to_dict()
+def build_network_arrays():
+    # 원본 파싱 (shapefile) → 스냅샷 배열 (그림자는 별도 아카이브)
+    roads_gdf = load_roads()
 
-        for _, _, d in G.edges(data=True):
-            if "shadow_by_hour" not in d:
-                d["shadow_by_hour"] = {}
+    nodes = build_node_table(roads_gdf)
+    edges = build_edge_table(roads_gdf, nodes)
+    net = RoadNetwork(nodes.ids, edges.records["u"], edges.records["v"], node_index=nodes)
 
-            if d.get("indoor") or d.get("tunnel"):
-                d["shadow_by_hour"][hour] = 1.0
-            else:
-                d["shadow_by_hour"][hour] = ratio_map.get(d["link_id"], 0.0)
+    return {
+        "node_ids": nodes.ids,
+        "node_xy": nodes.xy,
+        "node_lonlat": nodes.lonlat,
+        "edge_records": edges.records,
+        "edge_coords": edges.coords,
+        "edge_lonlat": edges.lonlat,
+        "csr_indptr": net.indptr,
+        "csr_indices": net.indices,
+        "csr_arc_edge": net.arc_edge,
+    }
+
+
+@st.cache_resource
+def load_network():
+    key = source_hash([ROADS_SHP])
+    snapshot = load_snapshot(SNAPSHOT_DIR, key)
+
+    if snapshot is not None:
+        arrays = snapshot["arrays"]
+    else:
+        arrays = build_network_arrays()
+        try:
+            save_snapshot(SNAPSHOT_DIR, key, arrays, meta={"sources": [ROADS_SHP]})
+        except OSError:
+            pass  # 쓰기 불가 환경이면 메모리 배열로만 사용
+
+    return {
+        "nodes": NodeTable(arrays["node_ids"], arrays["node_xy"], lonlat=arrays["node_lonlat"]),
+        "edges": EdgeTable(arrays["edge_records"], arrays["edge_coords"], lonlat=arrays["edge_lonlat"]),
+        "csr": (arrays["csr_indptr"], arrays["csr_indices"], arrays["csr_arc_edge"]),
+    }
 
 
 # ===============================================
 # 시간대별 그림자 반영된 Base Graph 생성 (1회만)
 # ===============================================
 @st.cache_resource
-def build_base_graph_with_shadow(_roads_gdf, _shadow_df):
+def build_base_graph_with_shadow(_network, _archive):
+    # 엣지 인덱스 = 도로 행 순서 / 속성은 구조화 엣지 테이블에서 읽는다
+    # nx.Graph는 참조 엔진용 노드 쌍 인덱스 → 같은 u/v 쌍의 평행 링크는 eids에 모두 보관
+    nodes, edges = _network["nodes"], _network["edges"]
     G = nx.Graph()
 
-    for _, row in _roads_gdf.iterrows():
-        G.add_edge(
-            row["u"], row["v"],
-            link_id=row["link_id"],
-            length=row["length"],
-            geometry=row.geometry,
-            footbridge=row.get("footbridge", 0),
-            tunnel=row.get("tunnel", 0),
-            indoor=row.get("indoor", 0),
-        )
+    edge_u = nodes.ids[edges.records["u"]].tolist()
+    edge_v = nodes.ids[edges.records["v"]].tolist()
+    for eid, (u, v) in enumerate(zip(edge_u, edge_v)):
+        if G.has_edge(u, v):
+            G[u][v]["eids"].append(eid)
+        else:
+            G.add_edge(u, v, eid=eid, eids=[eid])
+
+    G.graph["edges"] = edges
+    G.graph["csr"] = _network["csr"]
+
+    # 적재 리포트: 예전 nx.Graph 덮어쓰기로 사라지던 평행 링크 수
+    G.graph["parallel_report"] = {
+        "links": len(edges),
+        "node_pairs": G.number_of_edges(),
+        "collapsed_before": len(edges) - G.number_of_edges(),
+    }
 
-    attach_shadow_by_hour(G, _shadow_df)
+    # 날짜·시간대별 그림자: 아카이브 핸들 + 엣지 → 아카이브 링크 행 (1회 매핑)
+    G.graph["shadow_archive"] = _archive
+    G.graph["shadow_rows"] = _archive.link_rows(edges.link_id)
+    G.graph["shadow_covered"] = edges.flag("indoor") | edges.flag("tunnel")
 
     return G
 
 
+# ===============================================
+# 배열 기반 라우팅 네트워크 생성 (1회만)
+# ===============================================
+@st.cache_resource
+def build_base_network(_base_G, _nodes):
+    return build_road_network(_base_G, _nodes)
+
+
 # ======================================
-# 선택 시간대의 shadow_ratio 적용
+# 선택 날짜·시간대의 shadow_ratio 적용 (요청별 오버레이 생성)
 # ======================================
-def apply_shadow_ratio(G, time_slot, rain_mm):
-    for _, _, d in G.edges(data=True):
-        if rain_mm > 0:
-            d["shadow_ratio"] = 0.0
-        else:
-            d["shadow_ratio"] = d["shadow_by_hour"][time_slot]
+def get_shadow_column(base_G, net, date, time_slot, rain_mm):
+    if rain_mm > 0:
+        return np.zeros(net.root.n_edges, dtype=np.float64)
+
+    # 아카이브에서 (date, time_slot) 한 칸만 읽음 (uint8 % → 0~1, 저장 시간대 사이는 앞뒤 두 칸 선형 보간)
+    return base_G.graph["shadow_archive"].edge_shadow(
+        date, time_slot, base_G.graph["shadow_rows"], base_G.graph["shadow_covered"]
+    )
+
+
+def apply_shadow_ratio(base_G, net, date, time_slot, rain_mm):
+    # net: 질의 네트워크 (가상 노드 분할 엣지는 원본 엣지의 그늘 비율을 그대로 사용)
+    shadow = get_shadow_column(base_G, net, date, time_slot, rain_mm)
+    G = CostOverlay(base_G, net, net.extend(shadow, additive=False))
+    G.date, G.time_slot, G.rain_mm = date, time_slot, rain_mm
+    return G
 
 
 # ========================================
@@ -425,8 +482,9 @@ def get_realtime_weather_forecast(lat, lon):
 # time_slot 기준 env 선택 함수
 # ======================================
 def get_env_at_time(env, time_slot):
+    # 예보는 정시 단위 → 분 단위 시간대는 해당 시각의 예보 사용
     for f in env["raw_forecast"]:
-        if f["hour"] == time_slot:
+        if f["hour"] == int(time_slot):
             return f
 
     # fallback
@@ -441,7 +499,7 @@ def build_forecast_for_graph(env, avg_shadow, time_slot):
 
     for f in env["raw_forecast"]:
         base = f["temp"]
-        feels = base - avg_shadow * 5.0
+        feels = calc_feels_like(base, avg_shadow)
 
         graph_data.append({
             "time": f["time"],
@@ -530,75 +588,269 @@ def calc_indoor_penalty(d):
     return time_penalty, fatigue_penalty
 
 # ======================================
-# 비용 함수 (쿨링/최단/큰길)
+# 강수 구간 키 (비용 캐시용)
+# ======================================
+def calc_rain_bucket(rain_mm):
+    # (강수 페널티, 비 여부) → 비가 오면 그늘 0이므로 시간대와 무관
+    return calc_rain_penalty(rain_mm), rain_mm > 0
+
+
+def freeze_arrays(costs):
+    # 캐시된 벡터는 세션 간 공유되므로 읽기 전용으로 고정
+    for arr in costs.values():
+        arr.flags.writeable = False
+    return costs
+
+
+# ======================================
+# 비용 캐시 (날짜 x time_slot x 강수 구간 x 모드)
 # ======================================
-def apply_costs(G, rain_mm=0.0):
-    rain_penalty = calc_rain_penalty(rain_mm)
+@st.cache_resource(max_entries=48)
+def get_mode_costs(_base_G, _net, date, time_slot, rain_bucket):
+    rain_penalty, is_wet = rain_bucket
+    shadow = get_shadow_column(_base_G, _net, date, time_slot, 1.0 if is_wet else 0.0)
 
-    for _, _, d in G.edges(data=True):
-        # ---------- 기본 값 ----------
-        length = float(d.get("length", 1.0))
-        shadow = float(d.get("shadow_ratio", 0.0))
+    return freeze_arrays(
+        compute_costs(_net.edge_attrs, shadow, rain_penalty)
+    )
 
-        tunnel = bool(d.get("tunnel", 0))
-        footbridge = bool(d.get("footbridge", 0))
-        indoor = bool(d.get("indoor", 0))
 
-        # 1️⃣ 최단 경로
-        total_penalty = rain_penalty + calc_facility_penalty(d, "shortest")
-        d["cost_shortest"] = length * (1 + total_penalty)
+# 퍼스널 비용은 선호도 조합마다 달라 작은 LRU로만 보관
+@st.cache_resource(max_entries=32)
+def get_personal_cost(
+    _base_G, _net, date, time_slot, rain_bucket,
+    cooling_weight, avoid_footbridge, avoid_tunnel, avoid_indoor
+):
+    rain_penalty, is_wet = rain_bucket
+    shadow = get_shadow_column(_base_G, _net, date, time_slot, 1.0 if is_wet else 0.0)
+
+    pref = {
+        "cooling_weight": cooling_weight,
+        "avoid_footbridge": avoid_footbridge,
+        "avoid_tunnel": avoid_tunnel,
+        "avoid_indoor": avoid_indoor,
+    }
+    cost = compute_personal_cost(_net.edge_attrs, shadow, rain_penalty, pref)
 
-        # 2️⃣ 큰길 우선
-        is_main = (length >= 100 and not tunnel and not footbridge and not indoor)
-        main_factor = 1.0 if is_main else 1.5
-        total_penalty = rain_penalty + calc_facility_penalty(d, "main")
-        d["cost_main"] = length * main_factor * (1 + total_penalty)
+    return freeze_arrays({"cost_personal": cost})["cost_personal"]
 
-        # ------------------
-        # 3️⃣ 쿨링 경로
-        # ------------------
-        heat_penalty = (1 - shadow) * 2.0
-        _, fatigue_penalty = calc_indoor_penalty(d)
-        cooling_penalty = heat_penalty + fatigue_penalty
 
-        total_penalty = rain_penalty + calc_facility_penalty(d, "cooling")
-        d["cost_cooling"] = length * (1 + cooling_penalty + total_penalty)
+# ======================================
+# 비용 함수 (쿨링/최단/큰길)
+# ======================================
+def apply_costs(G, time_slot, rain_mm=0.0):
+    # G: 요청별 CostOverlay (G.date: 그림자 날짜) / 캐시된 비용 벡터를 그대로 참조
+    rain_bucket = calc_rain_bucket(rain_mm)
+    date_key, slot_key = (None, None) if rain_bucket[1] else (G.date, time_slot)
+
+    costs = get_mode_costs(G.base_G, G.net.root, date_key, slot_key, rain_bucket)
+    G.costs.update({key: G.net.extend(arr) for key, arr in costs.items()})
 
 
 # ======================================
 # 퍼스널 비용 함수
 # ======================================
-def apply_personal_costs(G, rain_mm, pref):
+def apply_personal_costs(G, time_slot, rain_mm, pref):
+    rain_bucket = calc_rain_bucket(rain_mm)
+    date_key, slot_key = (None, None) if rain_bucket[1] else (G.date, time_slot)
+
+    G.costs["cost_personal"] = G.net.extend(get_personal_cost(
+        G.base_G, G.net.root, date_key, slot_key, rain_bucket,
+        float(pref["cooling_weight"]),
+        bool(pref["avoid_footbridge"]),
+        bool(pref["avoid_tunnel"]),
+        bool(pref["avoid_indoor"]),
+    ))
+
+
+# ======================================
+# 비용 커널 검증 (COST_KERNEL_VERIFY, 스칼라 규칙과 엣지별 대조)
+# ======================================
+def scalar_edge_costs(d, shadow, rain_penalty, pref):
+    # 벡터화 이전 apply_costs / apply_personal_costs 규칙 그대로 (엣지 1개)
+    length = float(d["length"])
+    tunnel, footbridge, indoor = bool(d["tunnel"]), bool(d["footbridge"]), bool(d["indoor"])
+
+    is_main = (length >= 100 and not tunnel and not footbridge and not indoor)
+    _, fatigue_penalty = calc_indoor_penalty(d)
+
+    facility = 0.0
+    if pref["avoid_tunnel"] and tunnel:
+        facility += 0.6
+    if pref["avoid_footbridge"] and footbridge:
+        facility += 0.4
+    if pref["avoid_indoor"] and indoor:
+        facility += 0.5
     cw = pref["cooling_weight"]
 
-    for _, _, d in G.edges(data=True):
-        length = float(d.get("length", 1.0))
-        shadow = float(d.get("shadow_ratio", 0.0))
+    return {
+        "cost_shortest": length * (1 + rain_penalty + calc_facility_penalty(d, "shortest")),
+        "cost_main": length * (1.0 if is_main else 1.5) * (1 + rain_penalty + calc_facility_penalty(d, "main")),
+        "cost_cooling": length * (
+            1 + (1 - shadow) * 2.0 + fatigue_penalty + rain_penalty + calc_facility_penalty(d, "cooling")
+        ),
+        "cost_personal": length * (
+            1 + (1 - shadow) * 2.0 * cw + (1 - cw) + rain_penalty + facility
+        ),
+    }
+
 
-        tunnel = bool(d.get("tunnel", 0))
-        footbridge = bool(d.get("footbridge", 0))
-        indoor = bool(d.get("indoor", 0))
+def verify_cost_kernels(base_G, net, date, time_slots=TIME_SLOTS, rain_values=(0.0, 1.5, 4.0)):
+    # compute_costs / compute_personal_cost / edge_walk_time 결과가 스칼라 규칙과 엣지마다 같은지 (다르면 AssertionError)
+    attrs = net.edge_attrs
+    edges = [{key: arr[e] for key, arr in attrs.items()} for e in range(net.n_edges)]
+    prefs = [
+        {"cooling_weight": cw, "avoid_footbridge": af, "avoid_tunnel": at, "avoid_indoor": ai}
+        for cw, af, at, ai in itertools.product((0.0, 0.5, 1.0), (False, True), (False, True), (False, True))
+    ]
+
+    # 보행 시간: edge_walk_time vs calc_edge_time
+    for rain_mm in rain_values:
+        walk = edge_walk_time(attrs, rain_mm)
+        for e, d in enumerate(edges):
+            expected = calc_edge_time(d, rain_mm=rain_mm)
+            assert abs(walk[e] - expected) <= 1e-9 * max(1.0, abs(expected)), (
+                f"edge_time mismatch: edge={e} rain={rain_mm} vector={walk[e]} scalar={expected}"
+            )
 
-        # --- 기본 패널티 ---
+    for time_slot, rain_mm in itertools.product(time_slots, rain_values):
         rain_penalty = calc_rain_penalty(rain_mm)
-        facility_penalty = 0.0
+        shadow = get_shadow_column(base_G, net, date, time_slot, rain_mm)
+        vector = compute_costs(attrs, shadow, rain_penalty)
+
+        for pref in prefs:
+            vector["cost_personal"] = compute_personal_cost(attrs, shadow, rain_penalty, pref)
+            for e, d in enumerate(edges):
+                for key, expected in scalar_edge_costs(d, shadow[e], rain_penalty, pref).items():
+                    assert abs(vector[key][e] - expected) <= 1e-9 * max(1.0, abs(expected)), (
+                        f"{key} mismatch: edge={e} slot={time_slot} rain={rain_mm} "
+                        f"pref={pref} vector={vector[key][e]} scalar={expected}"
+                    )
+
+
+# ======================================
+# ALT 랜드마크 거리표 (디스크 캐시, 시간대별 증분)
+# ======================================
+@st.cache_resource
+def get_landmark_store(_base_G, _net):
+    store = LandmarkStore(_net, os.path.join(CACHE_DIR, "alt"))
+
+    # 최신 날짜의 맑은 날 정시 비용 벡터만 거리표 계산 (없는 것만)
+    # (분 단위 시간대·다른 날짜·비 오는 날·퍼스널은 기준 거리표 하한을 배율 조정해 사용 → 거리표 수 고정)
+    date = _base_G.graph["shadow_archive"].dates[-1]
+    for time_slot in TIME_SLOTS:
+        costs = get_mode_costs(_base_G, _net, date, time_slot, calc_rain_bucket(0.0))
+        store.precompute(costs.values())
+
+    # 이전 날짜 기준 거리표 파일 정리
+    store.prune()
+    return store
+
+
+# ======================================
+# 시간 의존 탐색 입력 (보행 시계에 따라 그늘이 바뀌는 모드)
+# ======================================
+TIME_DEPENDENT_KEYS = ("cost_cooling",)
+
+
+@st.cache_resource(max_entries=16)
+def get_shade_response(_net, cost_key, rain_bucket):
+    # 비용 = a + b x shadow 계수 (원본 엣지 순서, 강수 구간별 1회)
+    rain_penalty, _ = rain_bucket
+    a, b = shade_response(
+        lambda shadow: compute_costs(_net.edge_attrs, shadow, rain_penalty)[cost_key],
+        _net.n_edges,
+    )
+    return freeze_arrays({"a": a, "b": b})
 
-        if pref["avoid_tunnel"] and tunnel:
-            facility_penalty += 0.6
-        if pref["avoid_footbridge"] and footbridge:
-            facility_penalty += 0.4
-        if pref["avoid_indoor"] and indoor:
-            facility_penalty += 0.5
 
-        # --- 시원함 패널티 ---
-        heat_penalty = (1 - shadow) * 2.0 * cw
+@st.cache_resource(max_entries=8)
+def get_edge_walk_time(_net, rain_mm):
+    return freeze_arrays({"time": edge_walk_time(_net.edge_attrs, rain_mm)})["time"]
 
-        # --- 시간 패널티 ---
-        time_penalty = (1 - cw)
 
-        d["cost_personal"] = length * (
-            1 + heat_penalty + time_penalty + rain_penalty + facility_penalty
+def td_shade_column(G):
+    # 저장 시간대 인덱스 j → 질의 네트워크 엣지 그늘 (맑은 날, 시간 의존 탐색·KPI 공통)
+    slots = G.base_G.graph["shadow_archive"].time_slots
+    return lambda j: G.net.extend(get_shadow_column(G.base_G, G.net.root, G.date, slots[j], 0.0), additive=False)
+
+
+def find_time_dependent_path(G, u_node, v_node, cost_key):
+    # 엣지마다 보행 시계로 잰 진입 시각의 그늘로 비용 평가 (저장 시간대 사이 선형 보간)
+    net, root = G.net, G.net.root
+
+    response = get_shade_response(root, cost_key, calc_rain_bucket(G.rain_mm))
+    path, stats = td_dijkstra(
+        net, net.node_index[u_node], net.node_index[v_node], G.time_slot,
+        net.extend(get_edge_walk_time(root, G.rain_mm)),
+        net.extend(response["a"]), net.extend(response["b"]),
+        G.base_G.graph["shadow_archive"].time_slots,
+        td_shade_column(G),
+    )
+    G.search_stats[cost_key] = dict(stats, engine="time_dependent")
+    return path
+
+
+# ======================================
+# CCH 전처리 (위상 기반 축약 순서, 1회만)
+# ======================================
+@st.cache_resource
+def get_cch(_net):
+    return CCH(_net)
+
+
+# ======================================
+# 최적 경로 탐색 함수 (엔진 선택)
+# ======================================
+def find_path(G, u_node, v_node, cost_key):
+    # G: 요청별 CostOverlay
+    # networkx: 참조 엔진 / csgraph: scipy C 구현 Dijkstra
+    # astar / bidirectional: 노드 좌표 직선거리 휴리스틱 (모드별 m당 최소 비용으로 스케일)
+    # alt: 랜드마크 거리표 휴리스틱 (쿨링 비용처럼 m당 비용 편차가 큰 모드에 유리)
+    # cch: 비용 벡터별 커스터마이즈 후 소거 트리 질의 (CCH_VERIFY=True 면 Dijkstra와 대조)
+    # TIME_DEPENDENT_ROUTING=True (선택): 쿨링 비용은 ROUTING_ENGINE 대신 보행 시계 기반 시간 의존 탐색 (비 오는 날은 그늘 0 → 정적)
+    # 실제로 쓴 엔진은 search_stats[cost_key]["engine"]에 기록 (화면 표시용)
+    if TIME_DEPENDENT_ROUTING and cost_key in TIME_DEPENDENT_KEYS and G.rain_mm <= 0:
+        return find_time_dependent_path(G, u_node, v_node, cost_key)
+
+    G.search_stats[cost_key] = {"engine": ROUTING_ENGINE}
+
+    if ROUTING_ENGINE == "networkx":
+        path = nx.shortest_path(G.nx_graph(), u_node, v_node, weight=G.weight_fn(cost_key))
+        return G.to_node_path(path, cost_key)
+
+    net = G.net
+    if ROUTING_ENGINE == "alt":
+        store = get_landmark_store(G.base_G, net.root)
+        t = net.node_index[v_node]
+        idx, stats = astar_path(
+            net, net.node_index[u_node], t, G.costs[cost_key],
+            heuristic=store.heuristic(G.costs[cost_key], t, net),
         )
+        G.search_stats[cost_key].update(stats)
+        return net.to_node_path(idx, G.costs[cost_key])
+
+    if ROUTING_ENGINE == "cch":
+        s, t = net.node_index[u_node], net.node_index[v_node]
+        idx, stats = get_cch(net.root).query(s, t, G.costs[cost_key], net)
+
+        if CCH_VERIFY:
+            ref = net.distances_from(s, G.costs[cost_key])[t]
+            stats["dijkstra_cost"] = float(ref)
+            stats["verified"] = bool(abs(stats["cost"] - ref) <= 1e-6 * max(1.0, ref))
+
+        G.search_stats[cost_key].update(stats)
+        return net.to_node_path(idx, G.costs[cost_key])
+
+    if ROUTING_ENGINE in ("astar", "bidirectional"):
+        search = astar_path if ROUTING_ENGINE == "astar" else bidirectional_astar_path
+        idx, stats = search(
+            net, net.node_index[u_node], net.node_index[v_node], G.costs[cost_key]
+        )
+        G.search_stats[cost_key].update(stats)
+        return net.to_node_path(idx, G.costs[cost_key])
+
+    return net.shortest_path(u_node, v_node, G.costs[cost_key])
 
 
 # ======================================
@@ -618,38 +870,336 @@ def find_constrained_best_path(
     # base_path 대비 우회율 제한 내에서 cost_key 기준 최적 경로 선택
 
     # 1. 기준 길이
-    base_length = nx.path_weight(G, base_path, "length")
+    base_length = calc_path_weight(G, base_path, "length")
     max_length = base_length * (1 + detour_limit)
 
-    # 2. 후보 경로 생성 (길이 기준)
-    path_gen = nx.shortest_simple_paths(G, u_node, v_node, weight=cost_key)
+    if ROUTING_ENGINE == "networkx":
+        return find_constrained_path_yen(
+            G, u_node, v_node, base_path, cost_key, max_length, max_candidates
+        )
+
+    # 2. 길이 제약 최소 비용 경로 (라벨 설정법, 후보 개수 제한 없음)
+    net = G.net
+    try:
+        return constrained_shortest_path(
+            net,
+            net.node_index[u_node],
+            net.node_index[v_node],
+            G.costs[cost_key],
+            net.edge_attrs["length"],
+            max_length,
+        )
+    except nx.NetworkXNoPath:
+        return base_path
+
+
+# ======================================
+# 길이 vs 햇빛 노출 파레토 프론트 (OD x 날짜 x 시간대별 1회)
+# ======================================
+@st.cache_resource(max_entries=32)
+def get_pareto_front(_G, _u_node, _v_node, od_key, date, time_slot, rain_bucket):
+    # _G: 해당 날짜·time_slot / 강수 구간의 CostOverlay (캐시 키에서 제외)
+    # od_key: 출발/도착 스냅 위치 (가상 노드 ID는 요청마다 같으므로 스냅 엣지·비율로 구분)
+    net = _G.net
+    return pareto_front(net, net.node_index[_u_node], net.node_index[_v_node], _G.shadow)
+
+
+# 캐시된 프론트에서 우회 제한 + 퍼스널 비용 기준 경로 즉시 선택
+def select_personal_from_front(G, front, base_length, time_slot, rain_mm, pref):
+    apply_personal_costs(G, time_slot, rain_mm, pref)
+
+    point = select_from_front(
+        front,
+        lambda path: calc_path_weight(G, path, "cost_personal"),
+        base_length,
+        pref.get("detour_limit", 0.2),
+    )
+    return point["path"] if point else None
+
+
+# 참조 엔진: Yen 알고리즘 후보 열거 (networkx)
+def find_constrained_path_yen(G, u_node, v_node, base_path, cost_key, max_length, max_candidates):
+    # 후보 경로 생성 (cost_key 기준)
+    path_gen = nx.shortest_simple_paths(G.nx_graph(), u_node, v_node, weight=G.weight_fn(cost_key))
 
     best_path = None
     best_cost = float("inf")
 
     for path in itertools.islice(path_gen, max_candidates):
-        path_length = nx.path_weight(G, path, "length")
+        path = G.to_node_path(path, cost_key)
+        path_length = calc_path_weight(G, path, "length")
 
-        # 3. 우회율 초과 → 스킵
+        # 우회율 초과 → 스킵
         if path_length > max_length:
             continue
 
-        # 4. 목적 cost 계산
-        cost = nx.path_weight(G, path, cost_key)
+        # 목적 cost 계산
+        cost = calc_path_weight(G, path, cost_key)
 
         if cost < best_cost:
             best_cost = cost
             best_path = path
 
-    # 5. fallback (안전장치)
+    # fallback (안전장치)
     return best_path if best_path else base_path
 
 
+# ======================================
+# 출발 시각 스윕 (08~19시 쿨링 경로를 한 번에)
+# ======================================
+@st.cache_resource(max_entries=8)
+def get_sweep_stack(_base_G, _net, date, time_slots, rains):
+    # 시간대별 쿨링 비용·그늘 (원본 네트워크, 시간대 x 엣지) → 스윕마다 질의 네트워크로 한 번에 확장
+    # 비용은 apply_costs, 그늘은 apply_shadow_ratio와 같은 캐시·규칙 (비 오는 시간대는 그늘 0)
+    cost, shadow = [], []
+    for slot, rain_mm in zip(time_slots, rains):
+        rain_bucket = calc_rain_bucket(rain_mm)
+        date_key, slot_key = (None, None) if rain_bucket[1] else (date, slot)
+        cost.append(get_mode_costs(_base_G, _net, date_key, slot_key, rain_bucket)["cost_cooling"])
+        shadow.append(get_shadow_column(_base_G, _net, date, slot, rain_mm))
+
+    return freeze_arrays({"cost": np.stack(cost), "shadow": np.stack(shadow)})
+
+
+def sweep_departure_slots(base_G, query_net, u_node, v_node, date, env, time_slots=TIME_SLOTS, bound_path=None):
+    # 시간대별 비용 벡터(캐시)를 쌓아 같은 스냅 출발/도착으로 한 번의 dijkstra → 시간대별 KPI
+    # 시간대 비용은 출발 시간대 그늘 기준 (보행 시계 반영은 선택한 출발 시각의 쿨링 경로에만)
+    # bound_path: 같은 OD의 아무 경로 (지도 쿨링 경로 등) → 시간대별 탐색 범위를 그 경로 비용 이내로 제한
+    envs = [get_env_at_time(env, slot) for slot in time_slots]
+    stack = get_sweep_stack(base_G, query_net.root, date, tuple(time_slots), tuple(env_at["rain"] for env_at in envs))
+    shadow = query_net.extend(stack["shadow"], additive=False)
+    length = query_net.edge_attrs["length"]
+    edge_time = {
+        rain_mm: query_net.extend(get_edge_walk_time(query_net.root, rain_mm))
+        for rain_mm in {env_at["rain"] for env_at in envs}
+    }
+
+    paths = query_net.stacked_shortest_paths(
+        u_node, v_node, query_net.extend(stack["cost"]),
+        bound_eids=None if bound_path is None else bound_path.eids,
+    )
+
+    # 이웃 시간대는 같은 경로가 많음 → 거리·소요시간은 경로(엣지 목록)별 1회, 그늘·체감온도만 시간대별
+    # (오버레이 없이 엣지 벡터로: calc_path_length / calc_path_time / calc_avg_shadow와 같은 규칙)
+    walk = {}
+    rows = []
+    for k, (slot, env_at, path) in enumerate(zip(time_slots, envs, paths)):
+        eids = path.eids
+        key = (tuple(eids), env_at["rain"])
+        if key not in walk:
+            walk[key] = (float(length[eids].sum()), float(edge_time[env_at["rain"]][eids].sum()))
+
+        total = walk[key][0]
+        shadow_k = float(length[eids] @ shadow[k, eids]) / total if total > 0 else 0.0
+        rows.append({
+            "time_slot": slot,
+            "path": path,
+            "length": walk[key][0],
+            "time": walk[key][1],
+            "shadow": shadow_k,
+            "feels_like": calc_feels_like(env_at["temp"], shadow_k),
+            "temp": env_at["temp"],
+            "rain": env_at["rain"],
+        })
+
+    # 추천: 비 안 오는 시간대 우선 → 체감온도 최저 → 그늘 많은 순
+    best = min(rows, key=lambda r: (r["rain"] > 0, r["feels_like"], -r["shadow"]))
+    return {"slots": rows, "best": best["time_slot"]}
+
+
+# ======================================
+# 쿨 리치 (N분 안에 가장 빠른 길로 닿는 범위 + 그 길의 그늘 비율)
+# ======================================
+def find_cool_reach(G, u_node, minutes):
+    # 스냅된 출발지에서 보행 시간(calc_edge_time과 같은 규칙) 기준 one-to-many 1회
+    net = G.net
+    edge_time = net.extend(get_edge_walk_time(net.root, G.rain_mm))
+
+    t0 = time.perf_counter()
+    reach = cool_reach(net, net.node_index[u_node], edge_time, G.shadow, minutes * 60.0)
+    reach["elapsed_ms"] = (time.perf_counter() - t0) * 1000
+    return reach
+
+
+def build_reach_geojson(G, reach):
+    # 닿는 조각 → GeoJSON FeatureCollection (예산 경계에 걸린 링크는 양끝에서 닿는 구간만 잘라서)
+    features = []
+    for eid, lo, hi, entry_time, share in zip(
+        reach["eids"].tolist(), reach["lo"].tolist(), reach["hi"].tolist(),
+        reach["entry_time"].tolist(), reach["share"].tolist(),
+    ):
+        line = LineString(G.net.edge_lonlat_of(eid))
+        if lo > 0.0 or hi < 1.0:
+            line = substring(line, lo, hi, normalized=True)
+        if line.is_empty or line.length == 0:
+            continue
+
+        features.append({
+            "type": "Feature",
+            "geometry": mapping(line),
+            "properties": {
+                "share": round(share * 100, 1),
+                "minutes": round(entry_time / 60, 1),
+            },
+        })
+
+    return {"type": "FeatureCollection", "features": features}
+
+
+# ======================================
+# 최근접 피난처 (그늘막 + 실내 링크, 시작 시 1회 스냅)
+# ======================================
+@st.cache_resource
+def get_refuges(_net, _snapper, _shelters):
+    if _shelters is None or _shelters.empty:
+        snaps = {"edge": np.zeros(0, dtype=np.int64), "fraction": np.zeros(0), "xy": np.zeros((0, 2)), "distance": np.zeros(0)}
+        names = []
+    else:
+        snaps = _snapper.snap(_shelters["경도"].to_numpy(), _shelters["위도"].to_numpy())
+        names = _shelters["관리번호"].astype(str).tolist()
+
+    refuges = build_refuges(_net, snaps, names, REFUGE_SNAP_MAX_M)
+    lon, lat = get_transformer("EPSG:5179", "EPSG:4326").transform(*refuges["xy"].T)
+    refuges["lonlat"] = np.column_stack([lon, lat])
+    return refuges
+
+
+@st.cache_resource(max_entries=32)
+def get_refuge_field(_base_G, _net, _refuges, metric, date, time_slot, rain_bucket, rain_mm):
+    # metric: "length" / "time" / 모드 비용 키 (cost_cooling 등, 날짜 x 시간대 x 강수 구간별)
+    # 노드별 최근접 피난처·비용·보행 시간 → 어느 위치에서든 조회만으로 응답
+    edge_time = get_edge_walk_time(_net, rain_mm)
+    if metric == "length":
+        weights = _net.edge_attrs["length"]
+    elif metric == "time":
+        weights = edge_time
+    else:
+        weights = get_mode_costs(_base_G, _net, date, time_slot, rain_bucket)[metric]
+
+    return freeze_arrays(refuge_field(_net, _refuges, weights, edge_time))
+
+
+def get_refuge_field_for(G, refuges, metric):
+    rain_bucket = calc_rain_bucket(G.rain_mm)
+    static = rain_bucket[1] or metric in ("length", "time")
+    date_key, slot_key = (None, None) if static else (G.date, G.time_slot)
+    return get_refuge_field(G.base_G, G.net.root, refuges, metric, date_key, slot_key, rain_bucket, G.rain_mm)
+
+
+def refuge_weights(G, metric):
+    # 질의 네트워크 엣지 순서의 metric 가중치 (가상 노드 분할 엣지 포함)
+    net = G.net
+    if metric == "length":
+        return net.edge_attrs["length"]
+    if metric == "time":
+        return net.extend(get_edge_walk_time(net.root, G.rain_mm))
+    return G.costs[metric]
+
+
+def find_refuge_path(G, refuges, u_node, metric):
+    # 출발 노드 → 최근접 피난처 (거리장의 predecessor를 따라가기만, 가상 노드는 양끝 중 유리한 쪽)
+    net = G.net
+    field = get_refuge_field_for(G, refuges, metric)
+    weights = refuge_weights(G, metric)
+
+    idx = net.node_index[u_node]
+    start, offset = min(net.endpoint_offsets(idx, weights), key=lambda c: field["cost"][c[0]] + c[1])
+    chain = path_to_refuge(field, start)
+    if chain is None:
+        return None
+
+    path = net.to_node_path(chain if start == idx else [idx] + chain, weights)
+
+    # 앵커 노드 → 피난처 지점 (그늘막이 링크 중간이면 그 비율만큼)
+    r = int(field["refuge"][start])
+    e, last = refuges["edge"][r], net.node_index[path[-1]]
+    to_refuge = refuges["to_u"][r] if last == net.edge_u[e] else refuges["to_v"][r]
+    first = 0.0 if start == idx else float(net.extend(get_edge_walk_time(net.root, G.rain_mm))[path.eids[0]])
+
+    return {
+        "path": path,
+        "refuge": r,
+        "cost": float(field["cost"][start] + offset),
+        "time": float(field["time"][start] + first),
+        "length": calc_path_length(G, path) + float(net.root.edge_attrs["length"][e] * to_refuge),
+    }
+
+
+def find_refuge_route(base_G, snapper, refuges, snap, date, time_slot, rain_mm):
+    # 출발지만 스냅한 질의 네트워크에서 가장 가까운 피난처 (비 오면 그늘 대신 보행 시간 기준)
+    refuge_net, (refuge_origin,) = insert_virtual_nodes(snapper, [snap])
+    G_refuge = apply_shadow_ratio(base_G, refuge_net, date, time_slot, rain_mm)
+    apply_costs(G_refuge, time_slot, rain_mm)
+    refuge_route = find_refuge_path(G_refuge, refuges, refuge_origin, "time" if rain_mm > 0 else "cost_cooling")
+    if refuge_route is not None:
+        refuge_route["graph"] = G_refuge
+    return refuge_route
+
+
+# ======================================
+# 뷰·차트 전용 결과 (요청될 때 1회 계산 → 세션 결과에 저장)
+# ======================================
+def get_lazy_result(result, key, compute):
+    # 경로 없음은 None으로 저장 → 해당 뷰만 안내하고 일반 경로 결과는 그대로
+    if key not in result:
+        try:
+            result[key] = compute()
+        except nx.NetworkXNoPath:
+            result[key] = None
+    return result[key]
+
+
+def get_result_front(result):
+    # 거리 vs 그늘 파레토 프론트 (비교 차트 · 퍼스널 설정 변경 시 재선택)
+    G, (u_node, v_node) = result["graph"], result["nodes"]
+    return get_lazy_result(result, "front", lambda: get_pareto_front(
+        G, u_node, v_node, result["od_key"], result["date"], result["time_slot"], calc_rain_bucket(result["rain_mm"])
+    ))
+
+
+def get_result_refuge(result, base_G, snapper, refuges):
+    return get_lazy_result(result, "refuge", lambda: find_refuge_route(
+        base_G, snapper, refuges, result["snaps"][0], result["date"], result["time_slot"], result["rain_mm"]
+    ))
+
+
+def get_result_sweep(result, base_G, env):
+    # 지도 쿨링 경로를 탐색 범위 상한으로 (시간대별 비용 벡터를 쌓아 한 번에 탐색)
+    G, (u_node, v_node) = result["graph"], result["nodes"]
+    return get_lazy_result(result, "departure_sweep", lambda: sweep_departure_slots(
+        base_G, G.net, u_node, v_node, result["date"], env, bound_path=result["paths"]["cooling"]
+    ))
+
+
+def calc_max_refuge_distance(G, path, field):
+    # 경로 위 노드마다 최근접 피난처 거리 조회 (노드당 O(1), 가상 노드는 양끝 노드 기준)
+    net = G.net
+    length = net.edge_attrs["length"]
+    cost = field["cost"]
+    return max(
+        (min(cost[a] + off for a, off in net.endpoint_offsets(net.node_index[node], length)) for node in path),
+        default=0.0,
+    )
+
+
 # ======================================
 # KPI 보조 함수 (길이, 그늘 계산)
 # ======================================
+def calc_path_weight(G, path, key):
+    return sum(float(d[key]) for d in G.path_edges(path))
+
 def calc_path_length(G, path):
-    return nx.path_weight(G, path, weight="length")
+    return calc_path_weight(G, path, "length")
+
+# 구간별 그늘 비율 (시간 의존 경로는 path.clock으로 잰 구간 진입 시각의 그늘, 아니면 출발 시각 그늘)
+def calc_path_shadows(G, path):
+    eids = G.path_eids(path)
+    clock = getattr(path, "clock", None)
+    if clock is None:
+        return np.asarray(G.shadow, dtype=np.float64)[eids]
+
+    slots = G.base_G.graph["shadow_archive"].time_slots
+    return shade_along(eids, clock, G.time_slot, slots, td_shade_column(G))
 
 #그늘 평균 계산 함수
 def calc_avg_shadow(G, path):
@@ -660,12 +1210,8 @@ def calc_avg_shadow(G, path):
     total_len = 0.0
     shadow_sum = 0.0
 
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i + 1]
-        d = G[u][v]
-
+    for d, shadow in zip(G.path_edges(path), calc_path_shadows(G, path).tolist()):
         length = float(d.get("length", 0.0))
-        shadow = float(d.get("shadow_ratio", 0.0))
 
         total_len += length
         shadow_sum += length * shadow
@@ -673,7 +1219,12 @@ def calc_avg_shadow(G, path):
     return shadow_sum / total_len if total_len > 0 else 0.0
 
 
-# 링크별 시간 계산 함수
+# 체감온도 (그늘 비율 1.0 → -5℃)
+def calc_feels_like(base_temp, avg_shadow):
+    return base_temp - avg_shadow * 5.0
+
+
+# 링크별 시간 계산 함수 (스칼라 기준 규칙, verify_cost_kernels에서 edge_walk_time 대조용)
 def calc_edge_time(d, base_speed=1.2, rain_mm=0.0):
     # d: edge data, return: seconds
 
@@ -703,12 +1254,11 @@ def calc_edge_time(d, base_speed=1.2, rain_mm=0.0):
 
 # 경로 전체 소요시간 계산 함수
 def calc_path_time(G, path, rain_mm=0.0):
-    total_time = 0.0
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i + 1]
-        d = G[u][v]
-        total_time += calc_edge_time(d, rain_mm=rain_mm)
-    return total_time
+    # 원본 엣지 보행 시간을 질의 네트워크로 확장 → 분할 엣지는 구간 비율만큼 (신호대기·실내 페널티도 나눠 가짐)
+    if not path or len(path) < 2:
+        return 0.0
+    edge_time = G.net.extend(get_edge_walk_time(G.net.root, rain_mm))
+    return float(edge_time[G.path_eids(path)].sum())
 
 
 # 습도에 따른 불쾌도 산정 함수
@@ -732,9 +1282,7 @@ def count_obstacles(G, path):
         "indoor": 0,
     }
 
-    for i in range(len(path) - 1):
-        d = G[path[i]][path[i + 1]]
-
+    for d in G.path_edges(path):
         if d.get("crosswalk"):
             counts["crosswalk"] += 1
         if d.get("footbridge"):
@@ -820,8 +1368,8 @@ def calculate_kpis(
     # 4. 체감온도
     # - shadow_ratio 1.0 → -5℃
     # -----------------------------
-    temp_short = base_temp - shadow_short * 5.0
-    temp_target = base_temp - shadow_target * 5.0
+    temp_short = calc_feels_like(base_temp, shadow_short)
+    temp_target = calc_feels_like(base_temp, shadow_target)
 
     temp_diff = temp_target - temp_short  # 음수면 더 시원
 
@@ -1161,6 +1709,122 @@ def render_multi_route_summary(
     st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
 
 
+# ======================================
+# 파레토 프론트 (거리 vs 그늘) 차트
+# ======================================
+def render_pareto_front_chart(front, G, paths):
+    if not front:
+        return
+
+    st.markdown("### 📈 거리 vs 그늘 선택지")
+    st.caption("같은 출발·도착지에서 더 짧으면서 더 그늘진 경로가 없는 후보들이에요.")
+
+    front_df = pd.DataFrame({
+        "length": [p["length"] for p in front],
+        "shadow": [
+            (1 - p["unshaded"] / p["length"]) * 100 if p["length"] > 0 else 0.0
+            for p in front
+        ],
+    })
+
+    route_labels = {
+        "cooling": "❄️ 쿨링", "shortest": "⏱️ 최단",
+        "main": "🛣️ 큰길", "personal": "🎯 나의 경로",
+    }
+    route_df = pd.DataFrame([
+        {
+            "length": calc_path_length(G, path),
+            "shadow": calc_avg_shadow(G, path) * 100,
+            "route": route_labels[key],
+        }
+        for key, path in paths.items() if path
+    ])
+
+    line = alt.Chart(front_df).mark_line(point=True, color="#7E57C2").encode(
+        x=alt.X("length:Q", title="이동 거리(m)", scale=alt.Scale(zero=False)),
+        y=alt.Y("shadow:Q", title="그늘 비율(%)"),
+        tooltip=[alt.Tooltip("length:Q", format=".0f"), alt.Tooltip("shadow:Q", format=".1f")],
+    )
+
+    points = alt.Chart(route_df).mark_point(size=140, filled=True).encode(
+        x="length:Q",
+        y="shadow:Q",
+        color=alt.Color("route:N", title="경로"),
+        tooltip=["route:N", alt.Tooltip("length:Q", format=".0f"), alt.Tooltip("shadow:Q", format=".1f")],
+    )
+
+    chart = (line + points).properties(height=320, background='#FDFBF7')
+    st.altair_chart(chart, use_container_width=True)
+
+
+# ======================================
+# 출발 시각별 그늘·체감온도 차트
+# ======================================
+def render_departure_sweep(sweep, time_slot, time_dependent=False):
+    # time_dependent: 지도 쿨링 경로가 보행 시계 기준 탐색인지 (스윕은 항상 출발 시각 그늘 고정 추정)
+    if not sweep:
+        return
+
+    st.markdown("### 🕒 언제 출발하면 제일 시원할까?")
+
+    rows = sweep["slots"]
+    best = next(r for r in rows if r["time_slot"] == sweep["best"])
+
+    # 스윕은 정시 격자 → 고른 출발 시각은 가장 가까운 스윕 시간대에 표시
+    nearest = min((r["time_slot"] for r in rows), key=lambda slot: abs(slot - time_slot))
+    on_grid = abs(nearest - time_slot) < 1e-6
+
+    if abs(best["time_slot"] - time_slot) < 1e-6:
+        st.success(f"지금 고른 {slot_label(time_slot)} 출발이 제일 시원해! 체감 {best['feels_like']:.1f}℃, 그늘 {best['shadow'] * 100:.0f}%야. 🐾")
+    else:
+        st.success(
+            f"**{slot_label(best['time_slot'])}** 에 출발하면 제일 시원해! "
+            f"체감 {best['feels_like']:.1f}℃, 그늘 {best['shadow'] * 100:.0f}% · 약 {best['time'] / 60:.0f}분 걸려. 🐾"
+        )
+
+    df = pd.DataFrame({
+        "slot": [slot_label(r["time_slot"]) for r in rows],
+        "shadow": [r["shadow"] * 100 for r in rows],
+        "feels_like": [round(r["feels_like"], 1) for r in rows],
+        "minutes": [round(r["time"] / 60, 1) for r in rows],
+        "best": [r["time_slot"] == sweep["best"] for r in rows],
+    })
+
+    base = alt.Chart(df).encode(x=alt.X("slot:O", title="출발 시각"))
+    tooltip = [
+        alt.Tooltip("slot:O", title="출발"),
+        alt.Tooltip("shadow:Q", title="그늘(%)", format=".1f"),
+        alt.Tooltip("feels_like:Q", title="체감온도(℃)"),
+        alt.Tooltip("minutes:Q", title="소요(분)"),
+    ]
+
+    bars = base.mark_bar(opacity=0.8).encode(
+        y=alt.Y("shadow:Q", title="쿨링 경로 그늘 비율(%, 출발 시각 기준 추정)"),
+        color=alt.condition("datum.best", alt.value("#7E57C2"), alt.value("#B2F2BB")),
+        tooltip=tooltip,
+    )
+    line_feels = base.mark_line(point=True, color="#339AF0").encode(
+        y=alt.Y("feels_like:Q", title="체감온도(℃)", scale=alt.Scale(zero=False)),
+        tooltip=tooltip,
+    )
+    vline = alt.Chart(pd.DataFrame({"slot": [slot_label(nearest)]})).mark_rule(
+        color="black", strokeDash=[4, 4]
+    ).encode(x="slot:O")
+
+    chart = alt.layer(bars + vline, line_feels).resolve_scale(y="independent").properties(
+        height=320, background='#FDFBF7'
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+    caption = "막대는 시간대별 쿨링 경로의 그늘 비율, 파란 선은 그 경로의 체감온도예요. 점선은 지금 고른 출발 시각이에요."
+    if not on_grid:
+        caption += f" ({slot_label(time_slot)}은 정시 사이라 가장 가까운 {slot_label(nearest)}에 표시했어요.)"
+    caption += " 시간대별 값은 경로 전체를 출발 시각의 그늘로 본 추정치예요."
+    if time_dependent:
+        caption += " 지도의 쿨링 경로는 걸으며 바뀌는 그늘까지 반영해서 수치가 조금 다를 수 있어요."
+    st.caption(caption)
+
+
 # ======================================
 # 경로 점수화 로직
 # ======================================
@@ -1289,6 +1953,9 @@ def grade_story(grade):
 # ======================================
 # 모든 경로 지도 범례 렌더링
 # ======================================
+REACH_VIEW = "🧊 쿨 리치"
+REFUGE_VIEW = "🏖 가까운 피난처"
+
 ROUTE_COLOR_MAP = {
     "cooling": {
         "label": "❄️ 쿨링 경로",
@@ -1399,55 +2066,59 @@ def draw_path_layer(
 
     bounds_coords = []
 
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i + 1]
-        if not graph.has_edge(u, v):
+    for data, shadow in zip(graph.path_edges(path), calc_path_shadows(graph, path).tolist()):
+        # 엣지 테이블의 EPSG:4326 좌표 버퍼 (요청마다 좌표 변환하지 않음)
+        coords = [(lat, lon) for lon, lat in data["lonlat"].tolist()]
+        if len(coords) < 2:
             continue
 
-        data = graph[u][v]
-        geom = data.get("geometry")
-        shadow = data.get("shadow_ratio", 0.0)
-
-        # 5179 → 4326 변환
-        try:
-            gdf = gpd.GeoDataFrame(geometry=[geom], crs="EPSG:5179").to_crs("EPSG:4326")
-        except Exception:
-            continue
-
-        for g in gdf.geometry:
-            coords = []
-
-            if g.geom_type == "LineString":
-                coords = [(y, x) for x, y in g.coords]
-
-            elif g.geom_type == "Polygon":
-                coords = [(y, x) for x, y in g.exterior.coords]
+        # 색상 결정
+        line_color = colormap(shadow) if is_gradient else color
+        line_tooltip = (
+            f"그늘 비율: {shadow * 100:.0f}%" if is_gradient else tooltip
+        )
 
-            elif g.geom_type == "MultiLineString":
-                for part in g.geoms:
-                    coords = [(y, x) for x, y in part.coords]
+        folium.PolyLine(
+            coords,
+            color=line_color,
+            weight=weight,
+            opacity=opacity,
+            tooltip=line_tooltip,
+        ).add_to(m)
 
+        bounds_coords.extend(coords)
 
-            else:
-                continue
+    return bounds_coords
 
-            # 색상 결정
-            line_color = colormap(shadow) if is_gradient else color
-            line_tooltip = (
-                f"그늘 비율: {shadow * 100:.0f}%" if is_gradient else tooltip
-            )
 
-            folium.PolyLine(
-                coords,
-                color=line_color,
-                weight=weight,
-                opacity=opacity,
-                tooltip=line_tooltip,
-            ).add_to(m)
+def draw_reach_layer(m, geojson, is_gradient=True, color="#15AABF"):
+    # 쿨 리치 조각을 GeoJSON 레이어 하나로 (색 = 가장 빠른 길의 누적 그늘 비율, 경로 그라데이션과 같은 색표)
+    # is_gradient=False: 비 올 때처럼 그늘 의미가 없으면 단색
+    if not geojson["features"]:
+        return
 
-            bounds_coords.extend(coords)
+    colormap = cm.LinearColormap(
+        colors=["#d73027", "#fc8d59", "#fee08b", "#d9ef8b", "#91cf60", "#1a9850"],
+        vmin=0.0,
+        vmax=1.0,
+        caption="누적 그늘 비율 (Shadow Ratio)",
+    )
+    if is_gradient:
+        colormap.add_to(m)
 
-    return bounds_coords
+    folium.GeoJson(
+        geojson,
+        name="쿨 리치",
+        style_function=lambda f: {
+            "color": colormap(f["properties"]["share"] / 100) if is_gradient else color,
+            "weight": 6,
+            "opacity": 0.9,
+        },
+        tooltip=folium.GeoJsonTooltip(
+            fields=["minutes", "share"],
+            aliases=["도착(분)", "누적 그늘(%)"],
+        ),
+    ).add_to(m)
 
 
 # ======================================
@@ -1456,18 +2127,12 @@ def draw_path_layer(
 def draw_marker_and_connector(
     m,
     user_lat, user_lon,
-    node_xy_5179,
+    snap_xy_5179,
     popup,
     color
 ):
-    # 스냅 노드 → WGS84
-    pt = gpd.GeoDataFrame(
-        geometry=[Point(node_xy_5179)],
-        crs="EPSG:5179"
-    ).to_crs("EPSG:4326")
-
-    node_lat = pt.geometry.iloc[0].y
-    node_lon = pt.geometry.iloc[0].x
+    # 도로 위 스냅 지점 → WGS84
+    node_lon, node_lat = get_transformer("EPSG:5179", "EPSG:4326").transform(*snap_xy_5179)
 
     # 마커
     folium.Marker(
@@ -1493,25 +2158,21 @@ def draw_marker_and_connector(
 
 # 엣지 중간 좌표 계산 함수 (핵심)
 def get_edge_midpoint(geom):
-    # LineString geometry → (lat, lon)
+    # LineString geometry (EPSG:5179) → (lat, lon)
     try:
-        gdf = gpd.GeoDataFrame(geometry=[geom], crs="EPSG:5179").to_crs("EPSG:4326")
-        line = gdf.geometry.iloc[0]
-        midpoint = line.interpolate(0.5, normalized=True)
-        return midpoint.y, midpoint.x
+        midpoint = geom.interpolate(0.5, normalized=True)
+        lon, lat = get_transformer("EPSG:5179", "EPSG:4326").transform(midpoint.x, midpoint.y)
+        return lat, lon
     except Exception:
         return None
 
 # 장애물 아이콘 오버레이 함수
 def draw_obstacle_icons(m, G, path):
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i + 1]
-        if not G.has_edge(u, v):
+    for d in G.path_edges(path):
+        if not (d["crosswalk"] or d["footbridge"] or d["tunnel"] or d["indoor"]):
             continue
 
-        d = G[u][v]
-        geom = d.get("geometry")
-        pos = get_edge_midpoint(geom)
+        pos = get_edge_midpoint(d["geometry"])
 
         if not pos:
             continue
@@ -1640,15 +2301,41 @@ with st.sidebar:
     st.divider()
     st.subheader("🕒 시간대 설정")
 
-    time_slot = st.slider(
-        "보행 시작 시간",
-        min_value=8,
-        max_value=19,
-        value=14,
-        step=1,
-        format="%d시"
+    # 그림자 아카이브 날짜 (mmap 핸들의 날짜 축만 읽음 → 날짜 수와 무관하게 시작 비용 동일)
+    shadow_dates = load_shadow_data().dates
+    shadow_date = st.selectbox(
+        "그림자 기준 날짜",
+        options=shadow_dates,
+        index=len(shadow_dates) - 1,
+        format_func=lambda d: f"{d // 10000}-{d // 100 % 100:02d}-{d % 100:02d}"
+    )
+
+    # 출발 시각: TIME_SLOT_MINUTES 단위 (저장된 시간대 사이는 그림자 선형 보간)
+    slot_options = time_slots_every(TIME_SLOT_MINUTES)
+
+    leave_now = st.toggle(
+        "지금 출발",
+        value=False,
+        help="현재 시각에 가장 가까운 시간대를 자동으로 선택합니다."
     )
 
+    if leave_now:
+        now = datetime.now(ZoneInfo("Asia/Seoul"))
+        now_slot = slot_of_minutes((now.hour * 60 + now.minute) // TIME_SLOT_MINUTES * TIME_SLOT_MINUTES)
+        time_slot = min(max(now_slot, slot_options[0]), slot_options[-1])
+
+        if time_slot != now_slot:
+            st.caption(f"🌙 지금({slot_label(now_slot)})은 서비스 시간 밖이라 {slot_label(time_slot)} 기준으로 안내해요.")
+        else:
+            st.caption(f"🕒 {slot_label(time_slot)} 출발 기준으로 안내해요.")
+    else:
+        time_slot = st.select_slider(
+            "보행 시작 시간",
+            options=slot_options,
+            value=slot_of_minutes(14 * 60),
+            format_func=slot_label
+        )
+
 
     st.divider()
     st.subheader("🎯 퍼스널 경로 설정")
@@ -1717,12 +2404,29 @@ with st.sidebar:
 # =========================
 # 데이터 로드 (앱 시작 시 1회)
 # =========================
-roads_gdf = load_roads()
-shadow_df = load_shadow_data()
+# 도로망은 바이너리 스냅샷, 그림자는 날짜별 아카이브에서 로드 (원본이 바뀌었을 때만 shapefile / CSV 파싱)
+network = load_network()
+shadow_archive = load_shadow_data()
 shade_shelters_df = load_shade_shelters()
 
-base_G = build_base_graph_with_shadow(roads_gdf, shadow_df)
-node_tree, node_ids, node_xy = build_node_index(roads_gdf)
+node_table = network["nodes"]
+base_G = build_base_graph_with_shadow(network, shadow_archive)
+base_net = build_base_network(base_G, node_table)
+road_snapper = build_road_snapper(base_net)
+
+if COST_KERNEL_VERIFY:
+    verify_cost_kernels(base_G, base_net, shadow_archive.dates[-1])
+refuges = get_refuges(base_net, road_snapper, shade_shelters_df)
+
+# 적재 리포트는 사이드바 하단 디버그 영역에만 표시
+with st.sidebar:
+    with st.expander("🛠 도로망 적재 정보", expanded=False):
+        st.caption(
+            "링크 {links:,}개 · 노드 쌍 {node_pairs:,}개 · "
+            "평행 링크 {collapsed_before:,}개 유지 (예전 그래프에서는 합쳐지던 링크)".format(
+                **base_G.graph["parallel_report"]
+            )
+        )
 
 
 # ======================================
@@ -1742,9 +2446,11 @@ if submit:
     start_lat, start_lon, start_name = start
     end_lat, end_lon, end_name = end
 
-    # 2. 좌표 → 네트워크 노드 스냅
-    u_node = get_nearest_node(start_lat, start_lon, node_tree, node_ids, node_xy)
-    v_node = get_nearest_node(end_lat, end_lon, node_tree, node_ids, node_xy)
+    # 2. 좌표 → 가장 가까운 도로 선분 스냅 (선분 중간이면 가상 노드 삽입)
+    query_net, u_node, v_node, snaps = snap_endpoints(
+        road_snapper, start_lat, start_lon, end_lat, end_lon
+    )
+    od_key = tuple((sn["edge"], round(sn["fraction"], 6)) for sn in snaps)
 
     new_input = {
         "start": {
@@ -1752,13 +2458,17 @@ if submit:
             "lat": start_lat,
             "lon": start_lon,
             "node": u_node,
+            "xy": snaps[0]["xy"],
         },
         "end": {
             "name": end_name,
             "lat": end_lat,
             "lon": end_lon,
             "node": v_node,
+            "xy": snaps[1]["xy"],
         },
+        "od_key": od_key,
+        "date": shadow_date,
         "time_slot": time_slot,
     }
 
@@ -1783,29 +2493,21 @@ if submit:
     env_at_time = get_env_at_time(env, time_slot)
 
     # --- 경로 계산 ---
-    G = copy.deepcopy(base_G)
-
-    # 3. 그림자 비율 적용
+    # 3. 그림자 비율 적용 (base graph는 공유, 요청별 오버레이만 생성)
     rain_mm = env_at_time["rain"]
-    apply_shadow_ratio(G, time_slot, rain_mm)
+    G = apply_shadow_ratio(base_G, query_net, shadow_date, time_slot, rain_mm)
 
-    # 💡 여기서 비용 계산
-    apply_costs(G)
+    # 💡 여기서 비용 계산 (날짜 x time_slot x 강수 구간 캐시 조회)
+    apply_costs(G, time_slot, rain_mm)
 
     if st.session_state.use_personal_mode:
-        apply_personal_costs(G, rain_mm, st.session_state.personal_pref)
+        apply_personal_costs(G, time_slot, rain_mm, st.session_state.personal_pref)
 
 
-    # 4. 경로 계산 (여기서 nx.shortest_path 사용)
-    path_shortest = nx.shortest_path(
-        G, u_node, v_node, weight="cost_shortest"
-    )
-    path_cooling = nx.shortest_path(
-        G, u_node, v_node, weight="cost_cooling"
-    )
-    path_main = nx.shortest_path(
-        G, u_node, v_node, weight="cost_main"
-    )
+    # 4. 경로 계산 (ROUTING_ENGINE 설정에 따라 csgraph / networkx)
+    path_shortest = find_path(G, u_node, v_node, "cost_shortest")
+    path_cooling = find_path(G, u_node, v_node, "cost_cooling")
+    path_main = find_path(G, u_node, v_node, "cost_main")
 
     if st.session_state.use_personal_mode:
         detour_limit = st.session_state.personal_pref.get("detour_limit", 0.2)
@@ -1815,6 +2517,8 @@ if submit:
     else:
         path_personal = None
 
+    # 파레토 프론트 · 피난처 · 출발 시각 스윕은 해당 뷰/차트를 열 때만 계산 (get_lazy_result)
+
     # 5. 세션에 저장
     st.session_state.route_result = {
         "paths": {
@@ -1823,6 +2527,14 @@ if submit:
             "main": path_main,
         },
         "graph": G,
+        "nodes": (u_node, v_node),
+        "snaps": snaps,
+        "od_key": od_key,
+        "base_length": calc_path_length(G, path_shortest),
+        "date": shadow_date,
+        "time_slot": time_slot,
+        "rain_mm": rain_mm,
+        "personal_pref": dict(st.session_state.personal_pref) if path_personal is not None else None,
     }
     if path_personal is not None:
         st.session_state.route_result["paths"]["personal"] = path_personal
@@ -1895,6 +2607,22 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
     G = result["graph"]
     paths = result["paths"]
 
+    # ---------- 퍼스널 설정 변경 시 캐시된 프론트에서 즉시 재선택 ----------
+    pref_now = st.session_state.get("personal_pref")
+    if (
+        st.session_state.get("personal_route_ready")
+        and pref_now is not None
+        and pref_now != result.get("personal_pref")
+    ):
+        reselected = select_personal_from_front(
+            G, get_result_front(result), result["base_length"],
+            result["time_slot"], result["rain_mm"], pref_now,
+        )
+        if reselected is not None:
+            paths["personal"] = reselected
+            st.session_state.avg_shadow["personal"] = calc_avg_shadow(G, reselected)
+            result["personal_pref"] = dict(pref_now)
+
     path_shortest = paths.get("shortest")
     path_cooling  = paths.get("cooling")
     path_main     = paths.get("main")
@@ -1912,7 +2640,7 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
     else:
         default_view = "🔍 모든 경로 비교"
 
-    view_options = ["🔍 모든 경로 비교", "❄️ 쿨링 경로", "⏱️ 최단 경로", "🛣️ 큰길 우선"]
+    view_options = ["🔍 모든 경로 비교", "❄️ 쿨링 경로", "⏱️ 최단 경로", "🛣️ 큰길 우선", REACH_VIEW, REFUGE_VIEW]
 
     if st.session_state.get("use_personal_mode"):
         view_options.insert(1, "🎯 나만의 경로")
@@ -1943,9 +2671,20 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
 
     view_mode = st.radio("지도 보기 모드", view_options, index=view_options.index(default_view), horizontal=True, label_visibility="collapsed")
 
+    # ---------- 쿨 리치: 출발지에서 N분 안에 가장 빠른 길로 닿는 범위 + 그 길의 그늘 비율 ----------
+    reach = None
+    if view_mode == REACH_VIEW:
+        reach_minutes = st.slider("⏱ 걸을 시간(분)", 5, 30, 10, 5)
+        if rain_mm > 0:
+            st.caption("☔ 비가 와서 그늘 비율 없이 걸어서 닿는 범위만 보여줘요.")
+
+        reach = find_cool_reach(G, s["node"], reach_minutes)
+
 
     # ---------- 타겟 설정 ----------
-    if rain_mm > 0:
+    if view_mode in (REACH_VIEW, REFUGE_VIEW):
+        target_key = None
+    elif rain_mm > 0:
         target_key = "shortest"
     elif view_mode == "🔍 모든 경로 비교":
         target_key = None
@@ -1989,7 +2728,18 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
         folium.TileLayer(tiles="https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png", attr="CARTO", name="Gray", control=False).add_to(m)
 
         # 경로 그리기
-        if view_mode == "🔍 모든 경로 비교":
+        refuge_route = get_result_refuge(result, base_G, road_snapper, refuges) if view_mode == REFUGE_VIEW else None
+        if reach is not None:
+            draw_reach_layer(m, build_reach_geojson(G, reach), is_gradient=(rain_mm == 0))
+        elif refuge_route is not None:
+            draw_path_layer(m, refuge_route["graph"], refuge_route["path"], weight=8, opacity=0.95, is_gradient=(rain_mm == 0), color="#15AABF")
+            lon, lat = refuges["lonlat"][refuge_route["refuge"]]
+            folium.Marker(
+                [lat, lon],
+                icon=folium.Icon(color="orange", icon="star", prefix="fa"),
+                tooltip=f"🏖 {refuges['name'][refuge_route['refuge']]}",
+            ).add_to(m)
+        elif view_mode == "🔍 모든 경로 비교":
             draw_path_layer(m, G, path_main, color="#9E9E9E", weight=5, opacity=0.85, tooltip="큰길 우선")
             draw_path_layer(m, G, path_shortest, color="#333333", weight=6, opacity=0.9, tooltip="최단 경로")
             # 비 올 때는 쿨링 경로도 그냥 파란색 실선으로 표시 (그늘 의미 없음)
@@ -2008,8 +2758,8 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
             for _, row in shade_shelters_df.iterrows():
                 folium.Marker([row['위도'], row['경도']], icon=folium.Icon(color='green', icon='umbrella', prefix='fa'), tooltip=f"⛱️ 그늘막").add_to(m)
 
-        draw_marker_and_connector(m, s["lat"], s["lon"], node_xy[node_ids.index(s["node"])], popup=f"출발: {s['name']}", color="green")
-        draw_marker_and_connector(m, e["lat"], e["lon"], node_xy[node_ids.index(e["node"])], popup=f"도착: {e['name']}", color="red")
+        draw_marker_and_connector(m, s["lat"], s["lon"], s["xy"], popup=f"출발: {s['name']}", color="green")
+        draw_marker_and_connector(m, e["lat"], e["lon"], e["xy"], popup=f"도착: {e['name']}", color="red")
 
         st_folium(m, height=600, use_container_width=True)
 
@@ -2104,9 +2854,50 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
         obs = count_obstacles(G, target_path)
         render_obstacle_badges(obs)
 
+        # 경로 위 어디서든 가장 가까운 피난처까지 (노드별 거리장 조회)
+        max_refuge = calc_max_refuge_distance(G, target_path, get_refuge_field_for(G, refuges, "length"))
+        if np.isfinite(max_refuge):
+            st.caption(f"🏖 이 경로 어디서든 그늘막·실내 보행로까지 최대 {max_refuge:.0f}m예요.")
+        else:
+            st.caption("🏖 이 경로 일부 구간은 걸어서 닿는 그늘막·실내 보행로가 없어요.")
+
+        # 실제로 쓴 탐색 엔진 (시간 의존 탐색은 그늘 비율·체감온도도 보행 시계 기준)
+        engine = G.search_stats.get(f"cost_{target_key}", {}).get("engine")
+        if engine == "time_dependent":
+            st.caption("🕒 보행 시계 기준 탐색: 구간마다 지나는 시각의 그늘로 경로와 그늘 비율·체감온도를 계산했어요.")
+        elif engine:
+            st.caption(f"🧭 탐색 엔진: {engine} (출발 시각 그늘 기준)")
+
+    elif view_mode == REFUGE_VIEW:
+        st.markdown("### 🏖 가장 가까운 피난처")
+        if refuge_route is None:
+            st.info("걸어서 닿는 그늘막·실내 보행로가 없다냥.")
+        else:
+            r = refuge_route["refuge"]
+            kind = "그늘막" if refuges["kind"][r] == "shelter" else "실내 보행로"
+            st.success(
+                f"{kind} **{refuges['name'][r]}** 까지 {refuge_route['length']:.0f}m, "
+                f"약 {refuge_route['time'] / 60:.1f}분이면 도착해! 🐾"
+            )
+            st.caption("그늘막·실내 보행로를 모두 출발점으로 한 거리장을 미리 계산해 두고, 출발지에서 따라가기만 해요.")
+    elif reach is not None:
+        st.markdown("### 🧊 시원하게 닿는 범위")
+        st.caption(
+            f"출발지에서 가장 빠른 길로 {reach_minutes}분 안에 닿는 도로 {reach['n_links']}개 구간이에요. "
+            f"색은 그 길로 거기까지 갔을 때의 누적 그늘 비율이에요. (탐색 {reach['elapsed_ms']:.0f}ms)"
+        )
     else:
         # 비교 모드일 때
         render_multi_route_summary(paths, G, st.session_state.env, time_slot, st.session_state.get("personal_pref"))
+        render_pareto_front_chart(get_result_front(result), G, paths)
+
+
+    # ---------- 출발 시각 추천 (비 오는 시각엔 그늘 의미 없음) ----------
+    if rain_mm == 0:
+        render_departure_sweep(
+            get_result_sweep(result, base_G, st.session_state.env), time_slot,
+            time_dependent=G.search_stats.get("cost_cooling", {}).get("engine") == "time_dependent",
+        )
 
 
     # ---------- 4. 그래프 (맨 아래) ----------
@@ -2132,9 +2923,11 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
             max_hour = max_row["hour"]
             max_temp = max_row["temp"]
 
-            if time_slot < max_hour:
-                st.info(f"⏳ {(max_hour-time_slot):.0f}시간 뒤에 제일 뜨거워져! 얼른 움직이자! 🐾")
-            elif time_slot > max_hour:
+            hour_now = int(time_slot)  # 예보는 정시 단위
+
+            if hour_now < max_hour:
+                st.info(f"⏳ {(max_hour-hour_now):.0f}시간 뒤에 제일 뜨거워져! 얼른 움직이자! 🐾")
+            elif hour_now > max_hour:
                 st.info("🌆 더위가 좀 가라앉았네! 아까보단 걷기 편할 거야.")
             else:
                 st.info("🔥 으악! 지금이 **제일 더운 시간**이야. 꼭 쿨링 경로로 가야 해!")
@@ -2155,7 +2948,7 @@ if st.session_state.get("route_ready") and not st.session_state.get("is_loading"
                 y=alt.Y("feels_like:Q", title="체감온도(℃)"),
             )
 
-            vline = alt.Chart(pd.DataFrame({"hour":[time_slot]})).mark_rule(
+            vline = alt.Chart(pd.DataFrame({"hour":[hour_now]})).mark_rule(
                 color="black",
                 strokeDash=[4,4]
             ).encode(x="hour:O")
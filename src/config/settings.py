@@ -6,8 +6,14 @@ KAKAO_API_KEY = "your-kakao-map-api-key"
 # Paths
 DATA_DIR = "data"
 ROADS_SHP = os.path.join(DATA_DIR, "non_buffered_roads.shp")
+BUILDINGS_SHP = os.path.join(DATA_DIR, "processed_buildings.shp")  # 그림자 시뮬레이션 입력 (height, floor)
+ROAD_POLYGONS_SHP = os.path.join(DATA_DIR, "processed_roads.shp")  # 보도 버퍼 폴리곤 (area) → 링크별 그늘 면적
 SHADOW_CSV = os.path.join(DATA_DIR, "hourly_link_stat_20250708.csv")
+SHADOW_CSV_PATTERN = os.path.join(DATA_DIR, "hourly_link_stat_*.csv")  # 날짜별 그림자 CSV (YYYYMMDD)
 SHELTER_CSV = os.path.join(DATA_DIR, "gangnamgu_shade_shelters.csv")
+CACHE_DIR = os.path.join(DATA_DIR, "cache")  # 전처리 결과 (ALT 거리표 등)
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "network")  # 도로망 바이너리 스냅샷 (.npy + manifest.json)
+SHADOW_ARCHIVE_DIR = os.path.join(CACHE_DIR, "shadow_archive")  # 날짜 x 시간대 x 링크 uint8 그늘 % (mmap)
 
 # Visualization
 ROUTE_COLOR_MAP = {
@@ -16,3 +22,21 @@ ROUTE_COLOR_MAP = {
     "main": {"label": "🛣️ 큰길 우선", "color": "#9E9E9E", "desc": "넓고 안정적인 보행로 중심"},
     "personal": {"label": "🎯 나만의 경로", "color": "#845EF7", "desc": "나의 선호도를 반영한 맞춤 경로"}
 }
+
+# Routing
+# "csgraph": 배열 기반 코어 (scipy.sparse.csgraph) / "networkx": 참조 엔진
+# "astar" / "bidirectional": 노드 좌표 기반 목표 지향 탐색 (settled 노드 수 기록)
+# "alt": 랜드마크 거리표 기반 A* (CACHE_DIR/alt 에 float32 거리표 저장)
+# "cch": Customizable Contraction Hierarchies (시간대·강수·페르소나별 비용을 커스터마이즈)
+ROUTING_ENGINE = "csgraph"
+CCH_VERIFY = False  # True: CCH 질의마다 Dijkstra 결과와 대조해 search_stats에 기록
+COST_KERNEL_VERIFY = False  # True: 시작 시 벡터 비용 커널을 스칼라 규칙(calc_facility_penalty 등)과 엣지별 대조
+TIME_DEPENDENT_ROUTING = False  # True: 쿨링 경로를 엣지 진입 시각(보행 시계)의 그늘로 평가 (ROUTING_ENGINE 대신 시간 의존 탐색)
+REFUGE_SNAP_MAX_M = 30.0  # 그늘막 → 도로 스냅 허용 거리 (m), 더 멀면 PoC 도로망 밖 그늘막으로 보고 피난처에서 제외
+
+# Time slots
+TIME_SLOT_MINUTES = 10  # 출발 시각 선택 단위 (분) — 그림자는 저장된 시간대 사이를 선형 보간
+
+# Shadow preprocessing
+# 래스터 그림자 백엔드 격자 해상도 (m) — 작을수록 폴리곤 오버레이에 가깝고 느림
+SHADOW_RASTER_RESOLUTION = 1.0
@@ -0,0 +1,216 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from src.data.shadow_matrix import time_slots_every
+from src.data.solar_position import solar_scenario
+
+# 층수만 있는 건물의 높이 추정 (층고 m)
+FLOOR_HEIGHT = 3.0
+
+# 워커 프로세스 공유 입력 (initializer로 1회 전달 → 시간대 작업마다 재전송하지 않음)
+_WORKER = {}
+
+
+# ======================================
+# 입력 로드 (BUILDING_FIXED / SOLAR_SCENARIO)
+# ======================================
+def load_buildings(shp_path):
+    gdf = gpd.read_file(shp_path)
+
+    if gdf.crs is None:
+        gdf = gdf.set_crs(epsg=5179)
+    elif gdf.crs.to_epsg() != 5179:
+        gdf = gdf.to_crs(epsg=5179)
+
+    # build_id: 원본 건물 키 (A0) / 높이: height, 없으면 floor x 층고
+    build_id = gdf["build_id"] if "build_id" in gdf else gdf["A0"]
+    height = gdf["height"].to_numpy(dtype=np.float64).copy()
+    if "floor" in gdf:
+        missing = ~np.isfinite(height) | (height <= 0)
+        height[missing] = gdf["floor"].to_numpy(dtype=np.float64)[missing] * FLOOR_HEIGHT
+
+    geoms = gdf.geometry.values
+    keep = np.isfinite(height) & (height > 0) & np.asarray(shapely.get_type_id(geoms) == 3)
+
+    return gpd.GeoDataFrame(
+        {"build_id": build_id.to_numpy()[keep], "height": height[keep]},
+        geometry=geoms[keep],
+        crs=gdf.crs,
+    )
+
+
+def load_solar_scenario(csv_path):
+    df = pd.read_csv(csv_path)
+
+    required_cols = {"time_slot", "sun_altitude", "sun_azimuth"}
+    if not required_cols.issubset(df.columns):
+        raise ValueError(f"{csv_path}: missing columns {sorted(required_cols - set(df.columns))}")
+
+    return df.sort_values("time_slot").reset_index(drop=True)
+
+
+def scenario_for_date(date, data_dir, time_slots=None):
+    # 기본 시간대는 solar_scenario_YYYYMMDD.csv가 있으면 그대로 사용,
+    # 없는 날짜·별도 시간대(분 단위 등)는 태양 위치 계산식으로 생성 (네트워크 불필요)
+    csv_path = os.path.join(data_dir, f"solar_scenario_{date}.csv")
+    if time_slots is None:
+        return load_solar_scenario(csv_path) if os.path.exists(csv_path) else solar_scenario(date)
+    return solar_scenario(date, time_slots)
+
+
+# ======================================
+# 태양 위치 → 그림자 방향 (높이 1m 기준 오프셋)
+# ======================================
+def shadow_offset(sun_altitude, sun_azimuth):
+    # 방위각: 북쪽 기준 시계방향(°) / 그림자는 태양 반대 방향으로 h / tan(고도) 만큼
+    # (EPSG:5179 격자 북쪽과 진북 차이는 강남 기준 0.3° 내외라 무시)
+    alt = np.radians(sun_altitude)
+    az = np.radians(sun_azimuth)
+    scale = 1.0 / np.tan(alt)
+    return -np.sin(az) * scale, -np.cos(az) * scale
+
+
+# ======================================
+# 건물 프리즘 그림자 (shapely 2 배열 연산)
+# ======================================
+def extrude_shadows(footprints, heights, sun_altitude, sun_azimuth):
+    # 그림자 = 바닥면 ∪ 지붕면 투영 ∪ 벽면(외곽·안뜰 링의 각 선분)을 쓸어낸 평행사변형
+    # → 오목한 건물·안뜰도 정확 (볼록 껍질 근사 없음) / 해가 진 시간대는 None
+    footprints = np.asarray(footprints, dtype=object)
+    n = len(footprints)
+    if n == 0 or sun_altitude <= 0:
+        return np.full(n, None, dtype=object)
+
+    ux, uy = shadow_offset(sun_altitude, sun_azimuth)
+    offset = np.asarray(heights, dtype=np.float64)[:, None] * np.array([ux, uy])
+
+    # 지붕면 투영: 전체 좌표 버퍼를 건물별 오프셋만큼 한 번에 이동
+    coords, owner = shapely.get_coordinates(footprints, return_index=True)
+    roofs = shapely.set_coordinates(footprints.copy(), coords + offset[owner])
+
+    # 벽면: 링 좌표 (닫힌 링이라 같은 링의 연속 좌표 쌍 = 선분)
+    rings, ring_owner = shapely.get_rings(footprints, return_index=True)
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+    seg = np.flatnonzero(coord_ring[:-1] == coord_ring[1:])
+    seg_owner = ring_owner[coord_ring[seg]]
+
+    p0, p1 = coords[seg], coords[seg + 1]
+    d = offset[seg_owner]
+    walls = shapely.polygons(np.stack([p0, p1, p1 + d, p0 + d, p0], axis=1))
+
+    # 건물별 조각을 (건물 x 최대 조각 수) 배열에 채워 행 단위로 한 번에 union (빈 칸 None은 무시)
+    counts = np.bincount(seg_owner, minlength=n)
+    parts = np.full((n, counts.max() + 2), None, dtype=object)
+    parts[:, 0] = footprints
+    parts[:, 1] = roofs
+    parts[seg_owner, 2 + np.arange(len(seg)) - np.repeat(np.cumsum(counts) - counts, counts)] = walls
+
+    return shapely.union_all(parts, axis=1)
+
+
+# ======================================
+# 시간대별 병렬 실행 (ProcessPool, 시간대 1개 = 작업 1개)
+# ======================================
+def _init_worker(footprints, heights):
+    _WORKER["footprints"] = footprints
+    _WORKER["heights"] = heights
+
+
+def _shadow_slot(args):
+    time_slot, sun_altitude, sun_azimuth = args
+    shadows = extrude_shadows(_WORKER["footprints"], _WORKER["heights"], sun_altitude, sun_azimuth)
+    return time_slot, shadows
+
+
+def simulate_hourly_shadows(buildings, solar_df, max_workers=None):
+    # buildings: load_buildings 결과 / solar_df: load_solar_scenario 결과
+    # 반환: HOURLY_SHADOW GeoDataFrame (shadow_id, build_id, time_slot, geometry)
+    footprints = buildings.geometry.values.to_numpy()
+    heights = buildings["height"].to_numpy(dtype=np.float64)
+    tasks = list(zip(
+        solar_df["time_slot"].tolist(),  # 분 단위 시간대(8.5 등)도 그대로
+        solar_df["sun_altitude"].astype(float),
+        solar_df["sun_azimuth"].astype(float),
+    ))
+
+    max_workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    if max_workers <= 1:
+        _init_worker(footprints, heights)
+        results = [_shadow_slot(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(footprints, heights)
+        ) as pool:
+            results = list(pool.map(_shadow_slot, tasks))
+
+    frames = []
+    for time_slot, shadows in results:
+        valid = ~shapely.is_missing(shadows) & ~shapely.is_empty(shadows)
+        frames.append(pd.DataFrame({
+            "build_id": buildings["build_id"].to_numpy()[valid],
+            "time_slot": time_slot,
+            "geometry": shadows[valid],
+        }))
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        {"build_id": [], "time_slot": [], "geometry": []}
+    )
+    df.insert(0, "shadow_id", np.arange(len(df)))
+    return gpd.GeoDataFrame(df, geometry="geometry", crs=buildings.crs)
+
+
+# ======================================
+# 오프라인 실행: 건물 + 태양 시나리오 → HOURLY_SHADOW (.gpkg)
+# ======================================
+def build_hourly_shadows(buildings_shp, solar_df, out_gpkg, max_workers=None):
+    # solar_df: 태양 시나리오 (정시 CSV 또는 scenario_for_date의 분 단위 시간대)
+    t0 = time.time()
+    buildings = load_buildings(buildings_shp)
+
+    shadows = simulate_hourly_shadows(buildings, solar_df, max_workers)
+
+    # 기존 파일(빈 자리표시 파일 포함)은 덮어씀
+    if os.path.exists(out_gpkg):
+        os.remove(out_gpkg)
+    shadows.to_file(out_gpkg, layer="hourly_shadow", driver="GPKG")
+
+    print(
+        f"[hourly shadow] buildings={len(buildings)} slots={len(solar_df)} "
+        f"polygons={len(shadows)} ({time.time() - t0:.1f}s) → {out_gpkg}"
+    )
+    return shadows
+
+
+def parse_pipeline_args(argv):
+    # [YYYYMMDD] [--step 분] → (날짜, 시간대 목록 또는 None=정시 시나리오)
+    step = int(argv[argv.index("--step") + 1]) if "--step" in argv else 60
+    skip = {argv.index("--step") + 1} if "--step" in argv else set()
+    date = next(
+        (a for i, a in enumerate(argv) if not a.startswith("-") and i not in skip), "20250708"
+    )
+    return date, (None if step == 60 else time_slots_every(step))
+
+
+if __name__ == "__main__":
+    # python -m src.data.building_shadow 20250708            (정시, 태양 시나리오 CSV가 없으면 계산해서 저장)
+    # python -m src.data.building_shadow 20250708 --step 10  (10분 단위 시간대)
+    from src.config.settings import BUILDINGS_SHP, DATA_DIR
+    from src.data.solar_position import write_solar_scenario
+
+    date, time_slots = parse_pipeline_args(sys.argv[1:])
+    solar_csv = os.path.join(DATA_DIR, f"solar_scenario_{date}.csv")
+    if time_slots is None and not os.path.exists(solar_csv):
+        write_solar_scenario(date, solar_csv)
+
+    build_hourly_shadows(
+        BUILDINGS_SHP,
+        scenario_for_date(date, DATA_DIR, time_slots),
+        os.path.join(DATA_DIR, f"hourly_shadows_{date}.gpkg"),
+    )
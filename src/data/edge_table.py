@@ -0,0 +1,134 @@
+import numpy as np
+import shapely
+from pyproj import Transformer
+
+
+# ======================================
+# 엣지 시설 비트 (flags uint8)
+# ======================================
+TUNNEL = 1 << 0
+FOOTBRIDGE = 1 << 1
+CROSSWALK = 1 << 2
+INDOOR = 1 << 3
+MAIN = 1 << 4
+
+FLAG_BITS = {
+    "tunnel": TUNNEL,
+    "footbridge": FOOTBRIDGE,
+    "crosswalk": CROSSWALK,
+    "indoor": INDOOR,
+    "main": MAIN,
+}
+
+# 엣지 1개 = 25 bytes (geometry 좌표는 공유 버퍼의 [coord_start, coord_stop) 구간)
+EDGE_DTYPE = np.dtype([
+    ("link_id", "<i4"),
+    ("u", "<i4"),            # 노드 테이블 연속 인덱스
+    ("v", "<i4"),
+    ("length", "<f4"),
+    ("flags", "u1"),
+    ("coord_start", "<i4"),
+    ("coord_stop", "<i4"),
+])
+
+
+# ======================================
+# 구조화 엣지 테이블
+# ======================================
+class EdgeTable:
+    # records: EDGE_DTYPE 배열 (엣지 인덱스 순서)
+    # coords: 모든 엣지 geometry 좌표를 이어 붙인 (k, 2) EPSG:5179 버퍼 / lonlat: 같은 버퍼의 EPSG:4326
+
+    def __init__(self, records, coords, lonlat=None):
+        self.records = records
+        self.coords = np.asarray(coords, dtype=np.float64)
+        self.n_edges = len(records)
+
+        # lonlat: 스냅샷에서 읽으면 그대로 사용, 없으면 1회 변환
+        if lonlat is None:
+            lon, lat = Transformer.from_crs(
+                "EPSG:5179", "EPSG:4326", always_xy=True
+            ).transform(self.coords[:, 0], self.coords[:, 1])
+            lonlat = np.column_stack([lon, lat])
+        self.lonlat = lonlat
+
+    def __len__(self):
+        return self.n_edges
+
+    # ---------- 컬럼 ----------
+    @property
+    def link_id(self):
+        return self.records["link_id"]
+
+    @property
+    def length(self):
+        return self.records["length"]
+
+    def flag(self, name):
+        return (self.records["flags"] & FLAG_BITS[name]) != 0
+
+    def attrs(self):
+        # 비용 커널 입력 (length float64 + 시설 여부 bool 배열)
+        return {
+            "length": self.records["length"].astype(np.float64),
+            **{name: self.flag(name) for name in FLAG_BITS},
+        }
+
+    # ---------- geometry ----------
+    def coord_slice(self, eid):
+        rec = self.records[eid]
+        return slice(int(rec["coord_start"]), int(rec["coord_stop"]))
+
+    def geometry(self, eid):
+        return shapely.linestrings(self.coords[self.coord_slice(eid)])
+
+    def geometries(self):
+        # 전체 엣지 LineString 배열 (STRtree 등 일괄 처리용)
+        counts = self.records["coord_stop"] - self.records["coord_start"]
+        return shapely.linestrings(
+            self.coords, indices=np.repeat(np.arange(self.n_edges), counts)
+        )
+
+    def nbytes(self):
+        return self.records.nbytes + self.coords.nbytes + self.lonlat.nbytes
+
+
+# ======================================
+# 도로 GeoDataFrame → 엣지 테이블
+# ======================================
+def build_edge_table(roads_gdf, nodes):
+    # roads_gdf: 엣지 인덱스 순서로 정렬된 도로 행 (EPSG:5179) / nodes: NodeTable
+    lines = roads_gdf.geometry.values
+    coords, owner = shapely.get_coordinates(lines, return_index=True)
+
+    counts = np.bincount(owner, minlength=len(lines))
+    stops = np.cumsum(counts)
+
+    def column(name):
+        if name in roads_gdf:
+            return roads_gdf[name].fillna(0).to_numpy().astype(bool)
+        return np.zeros(len(roads_gdf), dtype=bool)
+
+    length = roads_gdf["length"].to_numpy(dtype=np.float64)
+    tunnel, footbridge, indoor = column("tunnel"), column("footbridge"), column("indoor")
+
+    # 큰길: 100m 이상이면서 터널·육교·실내가 아닌 링크
+    main = (length >= 100) & ~tunnel & ~footbridge & ~indoor
+
+    flags = np.zeros(len(roads_gdf), dtype=np.uint8)
+    for name, values in (
+        ("tunnel", tunnel), ("footbridge", footbridge),
+        ("crosswalk", column("crosswalk")), ("indoor", indoor), ("main", main),
+    ):
+        flags |= np.where(values, FLAG_BITS[name], 0).astype(np.uint8)
+
+    records = np.zeros(len(roads_gdf), dtype=EDGE_DTYPE)
+    records["link_id"] = roads_gdf["link_id"].to_numpy()
+    records["u"] = nodes.index_of(roads_gdf["u"].to_numpy())
+    records["v"] = nodes.index_of(roads_gdf["v"].to_numpy())
+    records["length"] = length
+    records["flags"] = flags
+    records["coord_start"] = stops - counts
+    records["coord_stop"] = stops
+
+    return EdgeTable(records, coords)
@@ -0,0 +1,169 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+# 교차 면적 작업 단위 (도로 x 그림자 조각 후보 쌍 수)
+CHUNK_PAIRS = 2048
+
+# 워커 프로세스 공유 입력 (도로 폴리곤은 initializer로 1회 전달)
+_WORKER = {}
+
+
+# ======================================
+# 입력 로드 (ROADS_BUFFERED / HOURLY_SHADOW)
+# ======================================
+def load_road_polygons(shp_path):
+    gdf = gpd.read_file(shp_path)
+
+    if gdf.crs is None:
+        gdf = gdf.set_crs(epsg=5179)
+    elif gdf.crs.to_epsg() != 5179:
+        gdf = gdf.to_crs(epsg=5179)
+
+    # 링크 면적: area 컬럼 (없거나 0이면 폴리곤 면적)
+    area = gdf["area"].to_numpy(dtype=np.float64) if "area" in gdf else np.zeros(len(gdf))
+    area = np.where(area > 0, area, shapely.area(gdf.geometry.values))
+
+    return gpd.GeoDataFrame(
+        {"link_id": gdf["link_id"].to_numpy(dtype=np.int64), "area": area},
+        geometry=gdf.geometry.values,
+        crs=gdf.crs,
+    )
+
+
+def load_hourly_shadows(gpkg_path):
+    return gpd.read_file(gpkg_path, layer="hourly_shadow")
+
+
+# ======================================
+# 워커 작업 (시간대 union / 교차 면적 청크)
+# ======================================
+def _init_worker(roads):
+    _WORKER["roads"] = roads
+
+
+def _union_slot(args):
+    # 시간대 그림자 union → 서로 겹치지 않는 폴리곤 조각 (조각별 교차 면적 합 = 링크 그늘 면적)
+    time_slot, shadows = args
+    merged = shapely.union_all(shadows)
+    return time_slot, shapely.get_parts(merged)
+
+
+def _intersect_chunk(args):
+    slot_pos, road_idx, parts = args
+    area = shapely.area(shapely.intersection(_WORKER["roads"][road_idx], parts))
+    return slot_pos, road_idx, area
+
+
+def _run(pool, fn, tasks):
+    return pool.map(fn, tasks) if pool is not None else map(fn, tasks)
+
+
+# ======================================
+# 그림자 x 도로 오버레이 → HOURLY_LINK_STAT
+# ======================================
+def overlay_link_shadow(roads, shadows, time_slots=None, max_workers=None, chunk_pairs=CHUNK_PAIRS):
+    # roads: load_road_polygons 결과 / shadows: HOURLY_SHADOW (time_slot, geometry)
+    # 반환: link_id, time_slot, shadow_area, shadow_ratio (시간대 → 도로 행 순서)
+    road_geoms = roads.geometry.values.to_numpy()
+    if time_slots is None:
+        time_slots = sorted(shadows["time_slot"].unique().tolist())
+
+    slot_geoms = shadows.geometry.values.to_numpy()
+    slot_of = shadows["time_slot"].to_numpy()
+    union_tasks = [(slot, slot_geoms[slot_of == slot]) for slot in time_slots]
+
+    # 도로 폴리곤 STRtree (시간대 공통, 1회)
+    tree = shapely.STRtree(road_geoms)
+    shadow_area = np.zeros((len(time_slots), len(road_geoms)), dtype=np.float64)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(road_geoms,)
+    ) if max_workers > 1 else None
+    if pool is None:
+        _init_worker(road_geoms)
+
+    try:
+        # 1. 시간대별 union (병렬)
+        unions = dict(_run(pool, _union_slot, union_tasks))
+
+        # 2. STRtree 후보 쌍 → 청크로 나눠 교차 면적 (병렬)
+        chunks = []
+        for slot_pos, slot in enumerate(time_slots):
+            parts = unions[slot]
+            part_idx, road_idx = tree.query(parts, predicate="intersects")
+            for start in range(0, len(road_idx), chunk_pairs):
+                sl = slice(start, start + chunk_pairs)
+                chunks.append((slot_pos, road_idx[sl], parts[part_idx[sl]]))
+
+        for slot_pos, road_idx, area in _run(pool, _intersect_chunk, chunks):
+            np.add.at(shadow_area[slot_pos], road_idx, area)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    area = roads["area"].to_numpy(dtype=np.float64)
+    shadow_ratio = np.clip(shadow_area / area, 0.0, 1.0)
+
+    return pd.DataFrame({
+        "link_id": np.tile(roads["link_id"].to_numpy(dtype=np.int64), len(time_slots)),
+        "time_slot": np.repeat(np.asarray(time_slots), len(road_geoms)),
+        "shadow_area": shadow_area.ravel(),
+        "shadow_ratio": shadow_ratio.ravel(),
+    })
+
+
+# ======================================
+# 오프라인 실행: HOURLY_SHADOW + 도로 버퍼 → hourly_link_stat_YYYYMMDD.csv
+# ======================================
+def build_hourly_link_stat(roads_shp, shadows_gpkg, out_csv, max_workers=None):
+    t0 = time.time()
+    roads = load_road_polygons(roads_shp)
+    shadows = load_hourly_shadows(shadows_gpkg)
+
+    stat = overlay_link_shadow(roads, shadows, max_workers=max_workers)
+    stat.to_csv(out_csv, index=False)
+
+    print(
+        f"[hourly link stat] links={len(roads)} slots={stat['time_slot'].nunique()} "
+        f"rows={len(stat)} ({time.time() - t0:.1f}s) → {out_csv}"
+    )
+    return stat
+
+
+def benchmark_link_overlay(roads, shadows, worker_counts=(1, 2, 4), repeat=3):
+    # 처리량 = (링크 x 시간대) / 초, 워커 수별 최고 기록
+    n_slots = shadows["time_slot"].nunique()
+    report = {}
+    for workers in worker_counts:
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            overlay_link_shadow(roads, shadows, max_workers=workers)
+            best = min(best, time.perf_counter() - t0)
+        report[workers] = len(roads) * n_slots / best
+        print(f"[link overlay bench] workers={workers} {best:.2f}s {report[workers]:,.0f} links/s")
+    return report
+
+
+if __name__ == "__main__":
+    # python -m src.data.link_overlay 20250708          → CSV 생성
+    # python -m src.data.link_overlay 20250708 --bench  → 처리량(links/s) 측정만
+    from src.config.settings import DATA_DIR, ROAD_POLYGONS_SHP
+
+    date = next((a for a in sys.argv[1:] if not a.startswith("-")), "20250708")
+    shadows_gpkg = os.path.join(DATA_DIR, f"hourly_shadows_{date}.gpkg")
+
+    if "--bench" in sys.argv:
+        benchmark_link_overlay(load_road_polygons(ROAD_POLYGONS_SHP), load_hourly_shadows(shadows_gpkg))
+    else:
+        build_hourly_link_stat(
+            ROAD_POLYGONS_SHP, shadows_gpkg, os.path.join(DATA_DIR, f"hourly_link_stat_{date}.csv")
+        )
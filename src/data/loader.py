@@ -2,7 +2,8 @@ import streamlit as st
 import geopandas as gpd
 import pandas as pd
 import os
-from scipy.spatial import KDTree
+
+from src.data.node_table import build_node_table
 
 @st.cache_data
 def load_roads():
@@ -22,13 +23,5 @@ def load_shade_shelters():
     return pd.DataFrame()
 
 def build_node_index(roads_gdf):
-    node_coords = {}
-    for _, row in roads_gdf.iterrows():
-        geom = row.geometry
-        coords = list(geom.coords)
-        node_coords[row["u"]] = coords[0]
-        node_coords[row["v"]] = coords[-1]
-    
-    node_ids = list(node_coords.keys())
-    node_xy = list(node_coords.values())
-    return KDTree(node_xy), node_ids, node_xy
+    # 원본 ID → 연속 인덱스 / 좌표는 NodeTable 배열 인덱싱으로 조회
+    return build_node_table(roads_gdf)
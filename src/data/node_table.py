@@ -0,0 +1,87 @@
+import numpy as np
+import shapely
+from pyproj import Transformer
+
+
+# ======================================
+# 노드 테이블 (원본 ID ↔ 연속 인덱스, 1회 생성)
+# ======================================
+class NodeTable:
+    # 연속 인덱스 i: ids[i] (shapefile u/v 원본 ID), xy[i] (EPSG:5179), lonlat[i] (EPSG:4326)
+    # 원본 ID → 인덱스는 직접 주소 배열 (ID 범위가 너무 넓으면 정렬 배열 이진 탐색)
+
+    def __init__(self, ids, xy, lonlat=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.xy = np.asarray(xy, dtype=np.float64)
+        self.n_nodes = len(self.ids)
+
+        # lonlat: 스냅샷에서 읽으면 그대로 사용, 없으면 1회 변환
+        if lonlat is None:
+            lon, lat = Transformer.from_crs(
+                "EPSG:5179", "EPSG:4326", always_xy=True
+            ).transform(self.xy[:, 0], self.xy[:, 1])
+            lonlat = np.column_stack([lon, lat])
+        self.lonlat = lonlat
+
+        max_id = int(self.ids.max()) if self.n_nodes else -1
+        if self.n_nodes and self.ids.min() >= 0 and max_id < 16 * self.n_nodes + (1 << 20):
+            self._lookup = np.full(max_id + 1, -1, dtype=np.int64)
+            self._lookup[self.ids] = np.arange(self.n_nodes)
+            self._sorted = None
+        else:
+            self._lookup = None
+            self._sorted = np.argsort(self.ids, kind="stable")
+
+    def __len__(self):
+        return self.n_nodes
+
+    # ---------- 원본 ID → 인덱스 ----------
+    def index_of(self, node_ids):
+        # 스칼라/배열 모두 지원, 없는 ID는 -1
+        ids = np.asarray(node_ids, dtype=np.int64)
+
+        if self._lookup is not None:
+            inside = (ids >= 0) & (ids < len(self._lookup))
+            idx = np.where(inside, self._lookup[np.where(inside, ids, 0)], -1)
+        else:
+            pos = np.searchsorted(self.ids[self._sorted], ids)
+            pos = np.minimum(pos, self.n_nodes - 1)
+            idx = np.where(self.ids[self._sorted][pos] == ids, self._sorted[pos], -1)
+
+        return int(idx) if idx.ndim == 0 else idx
+
+    # RoadNetwork.node_index 로도 그대로 사용 (dict처럼 읽기)
+    def __getitem__(self, node_id):
+        idx = self.index_of(node_id)
+        if idx < 0:
+            raise KeyError(node_id)
+        return idx
+
+    def __contains__(self, node_id):
+        return isinstance(node_id, (int, np.integer)) and self.index_of(node_id) >= 0
+
+    def get(self, node_id, default=None):
+        return self[node_id] if node_id in self else default
+
+
+# ======================================
+# 도로 LineString 양끝점 → 노드 테이블
+# ======================================
+def build_node_table(roads_gdf):
+    # 노드 순서: 도로 행 순서대로 u, v가 처음 등장한 순서 (nx.Graph 노드 순서와 동일)
+    lines = roads_gdf.geometry.values
+    valid = np.asarray(shapely.get_type_id(lines) == 1)  # LineString만
+
+    u = roads_gdf["u"].to_numpy(dtype=np.int64)[valid]
+    v = roads_gdf["v"].to_numpy(dtype=np.int64)[valid]
+    start = shapely.get_coordinates(shapely.get_point(lines[valid], 0))
+    end = shapely.get_coordinates(shapely.get_point(lines[valid], -1))
+
+    # (u0, v0, u1, v1, ...) 교차 배열 → 첫 등장 순서로 고유화
+    all_ids = np.column_stack([u, v]).ravel()
+    all_xy = np.stack([start, end], axis=1).reshape(-1, 2)
+
+    _, first = np.unique(all_ids, return_index=True)
+    first.sort()
+
+    return NodeTable(all_ids[first], all_xy[first])
@@ -0,0 +1,235 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from src.data.building_shadow import (
+    load_buildings, parse_pipeline_args, scenario_for_date, simulate_hourly_shadows
+)
+from src.data.link_overlay import load_road_polygons, overlay_link_shadow
+
+# ======================================
+# 고정 해상도 격자 (EPSG:5179, 행 = y 증가 방향)
+# ======================================
+class RasterGrid:
+    # 셀 (row, col) 중심 = (minx + (col + 0.5) * res, miny + (row + 0.5) * res)
+
+    def __init__(self, bounds, resolution):
+        minx, miny, maxx, maxy = bounds
+        self.resolution = float(resolution)
+        self.minx, self.miny = float(minx), float(miny)
+        self.n_cols = int(np.ceil((maxx - minx) / self.resolution))
+        self.n_rows = int(np.ceil((maxy - miny) / self.resolution))
+
+    @property
+    def shape(self):
+        return self.n_rows, self.n_cols
+
+    def cells_in(self, polygons):
+        # 셀 중심이 폴리곤 안에 있는 (폴리곤 인덱스, 평탄화 셀 인덱스) 쌍
+        # 폴리곤마다 bbox 창의 셀 중심만 contains_xy로 판정 (전체 격자 Point 생성 없음)
+        bounds = shapely.bounds(polygons)
+        res = self.resolution
+        c0 = np.clip(np.floor((bounds[:, 0] - self.minx) / res - 0.5).astype(np.int64), 0, self.n_cols)
+        c1 = np.clip(np.ceil((bounds[:, 2] - self.minx) / res - 0.5).astype(np.int64) + 1, 0, self.n_cols)
+        r0 = np.clip(np.floor((bounds[:, 1] - self.miny) / res - 0.5).astype(np.int64), 0, self.n_rows)
+        r1 = np.clip(np.ceil((bounds[:, 3] - self.miny) / res - 0.5).astype(np.int64) + 1, 0, self.n_rows)
+
+        shapely.prepare(polygons)
+        owners, cells = [], []
+        for i, poly in enumerate(polygons):
+            rows, cols = np.mgrid[r0[i]:r1[i], c0[i]:c1[i]]
+            rows, cols = rows.ravel(), cols.ravel()
+            inside = shapely.contains_xy(
+                poly, self.minx + (cols + 0.5) * res, self.miny + (rows + 0.5) * res
+            )
+            owners.append(np.full(inside.sum(), i, dtype=np.int64))
+            cells.append(rows[inside] * self.n_cols + cols[inside])
+
+        if not owners:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(owners), np.concatenate(cells)
+
+
+def grid_for(buildings, roads, resolution):
+    # 건물·도로를 모두 덮는 격자 (가장자리 1셀 여유)
+    b = np.vstack([buildings.total_bounds, roads.total_bounds])
+    pad = resolution
+    bounds = (b[:, 0].min() - pad, b[:, 1].min() - pad, b[:, 2].max() + pad, b[:, 3].max() + pad)
+    return RasterGrid(bounds, resolution)
+
+
+# ======================================
+# 건물 높이 래스터 (셀별 최고 높이)
+# ======================================
+def rasterize_heights(grid, buildings):
+    owner, cells = grid.cells_in(buildings.geometry.values.to_numpy())
+    heights = np.zeros(grid.n_rows * grid.n_cols, dtype=np.float32)
+    np.maximum.at(heights, cells, buildings["height"].to_numpy(dtype=np.float32)[owner])
+    return heights.reshape(grid.shape)
+
+
+# ======================================
+# 태양 위치별 그림자 마스크 (높이맵 레이 마칭)
+# ======================================
+def shadow_mask(heights, resolution, sun_altitude, sun_azimuth):
+    # 셀 p가 그늘 ⇔ 태양 방향으로 거리 d 떨어진 셀 높이 > d x tan(고도)
+    # 높이 내림차순 정렬 → 거리 d에서 그림자를 드리울 수 있는 셀은 정렬 배열의 앞부분
+    # → 단계마다 그 셀들만 태양 반대 방향으로 밀어 표시 (총 작업량 ≈ 그림자 면적)
+    mask = heights > 0  # 건물 바닥면 (폴리곤 백엔드와 동일하게 그늘로 취급)
+    if sun_altitude <= 0:
+        return mask
+
+    # 그림자를 드리우는 셀: 8방향 이웃 중 더 낮은 셀이 있는 지붕 가장자리
+    # (평평한 지붕 안쪽 셀의 그림자는 가장자리 셀 그림자 + 바닥면에 포함,
+    #  대각선 벽도 4-연결 띠가 되도록 8방향 → 반올림 이동 시 빈틈 없음)
+    n_rows, n_cols = heights.shape
+    padded = np.pad(heights, 1)
+    lower = np.minimum.reduce([
+        padded[1 + dr:n_rows + 1 + dr, 1 + dc:n_cols + 1 + dc]
+        for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc
+    ])
+    edge = (heights > 0) & (lower < heights)
+
+    order = np.flatnonzero(edge.ravel())
+    order = order[np.argsort(-heights.ravel()[order], kind="stable")]
+    sorted_h = heights.ravel()[order]
+    rows, cols = np.divmod(order, n_cols)
+
+    tan_alt = np.tan(np.radians(sun_altitude))
+    az = np.radians(sun_azimuth)
+    step_x, step_y = np.sin(az), np.cos(az)  # 태양 쪽 단위 벡터 (셀)
+
+    # 최고 건물의 그림자 끝까지
+    max_steps = int(np.ceil(sorted_h[0] / tan_alt / resolution)) if len(order) else 0
+    for k in range(1, max_steps + 1):
+        # 높이 > d x tan(고도) 인 셀 수 (내림차순이므로 -h 기준 이진 탐색)
+        n = int(np.searchsorted(-sorted_h, -(k * resolution * tan_alt), side="left"))
+        if n == 0:
+            break
+        r = rows[:n] - int(round(k * step_y))
+        c = cols[:n] - int(round(k * step_x))
+        ok = (r >= 0) & (r < n_rows) & (c >= 0) & (c < n_cols)
+        mask[r[ok], c[ok]] = True
+
+    return mask
+
+
+# ======================================
+# 래스터 백엔드: 그림자 마스크 → 링크 버퍼 샘플링 → HOURLY_LINK_STAT
+# ======================================
+def road_cells(grid, roads):
+    # 링크 버퍼 안의 셀 / 셀이 하나도 없는 가는 링크는 내부 대표점 셀 1개로 대체
+    geoms = roads.geometry.values.to_numpy()
+    owner, cells = grid.cells_in(geoms)
+
+    empty = np.flatnonzero(np.bincount(owner, minlength=len(geoms)) == 0)
+    if len(empty):
+        xy = shapely.get_coordinates(shapely.point_on_surface(geoms[empty]))
+        col = ((xy[:, 0] - grid.minx) / grid.resolution).astype(np.int64)
+        row = ((xy[:, 1] - grid.miny) / grid.resolution).astype(np.int64)
+        owner = np.concatenate([owner, empty])
+        cells = np.concatenate([cells, row * grid.n_cols + col])
+
+    return owner, cells
+
+
+def raster_link_shadow(buildings, roads, solar_df, resolution):
+    # 반환: overlay_link_shadow와 같은 컬럼·행 순서 (link_id, time_slot, shadow_area, shadow_ratio)
+    grid = grid_for(buildings, roads, resolution)
+    heights = rasterize_heights(grid, buildings)
+    owner, cells = road_cells(grid, roads)
+    n_cells = np.bincount(owner, minlength=len(roads)).astype(np.float64)
+
+    time_slots = solar_df["time_slot"].tolist()
+    ratio = np.zeros((len(time_slots), len(roads)), dtype=np.float64)
+
+    for i, (alt, az) in enumerate(zip(solar_df["sun_altitude"], solar_df["sun_azimuth"])):
+        mask = shadow_mask(heights, grid.resolution, float(alt), float(az)).ravel()
+        ratio[i] = np.bincount(owner, weights=mask[cells], minlength=len(roads)) / n_cells
+
+    area = roads["area"].to_numpy(dtype=np.float64)
+    return pd.DataFrame({
+        "link_id": np.tile(roads["link_id"].to_numpy(dtype=np.int64), len(time_slots)),
+        "time_slot": np.repeat(np.asarray(time_slots), len(roads)),
+        "shadow_area": (ratio * area).ravel(),
+        "shadow_ratio": ratio.ravel(),
+    })
+
+
+# ======================================
+# 정확도 리포트 (폴리곤 백엔드 대비)
+# ======================================
+def accuracy_report(raster_stat, polygon_stat):
+    # 시간대별 shadow_ratio 오차 (MAE / RMSE / 최대 / 5%p 초과 링크 비율)
+    m = raster_stat.merge(polygon_stat, on=["link_id", "time_slot"], suffixes=("_raster", "_polygon"))
+    m["err"] = m["shadow_ratio_raster"] - m["shadow_ratio_polygon"]
+
+    def summary(err):
+        return pd.Series({
+            "mae": err.abs().mean(),
+            "rmse": np.sqrt((err ** 2).mean()),
+            "max_abs": err.abs().max(),
+            "bias": err.mean(),
+            "over_5pp": (err.abs() > 0.05).mean(),
+        })
+
+    report = m.groupby("time_slot")["err"].apply(summary).unstack()
+    report.loc["all"] = summary(m["err"])
+    return report
+
+
+def compare_backends(buildings, roads, solar_df, resolutions=(0.5, 1.0, 2.0)):
+    t0 = time.perf_counter()
+    polygon_stat = overlay_link_shadow(roads, simulate_hourly_shadows(buildings, solar_df))
+    print(f"[shadow backend] polygon: {time.perf_counter() - t0:.2f}s")
+
+    reports = {}
+    for res in resolutions:
+        t0 = time.perf_counter()
+        raster_stat = raster_link_shadow(buildings, roads, solar_df, res)
+        elapsed = time.perf_counter() - t0
+        reports[res] = accuracy_report(raster_stat, polygon_stat)
+        overall = reports[res].loc["all"]
+        print(
+            f"[shadow backend] raster {res:g}m: {elapsed:.2f}s "
+            f"mae={overall['mae']:.4f} rmse={overall['rmse']:.4f} "
+            f"max={overall['max_abs']:.3f} >5%p={overall['over_5pp'] * 100:.1f}%"
+        )
+    return reports
+
+
+if __name__ == "__main__":
+    # python -m src.data.raster_shadow 20250708            → 래스터 백엔드로 CSV 생성 (--step 10: 10분 단위)
+    #   기본 출력: hourly_link_stat_{date}_raster{해상도}m.csv (폴리곤 백엔드의 정밀 CSV·그림자 아카이브 입력과 겹치지 않음)
+    #   --out 경로: 출력 파일 직접 지정 (아카이브에 넣으려면 hourly_link_stat_YYYYMMDD.csv 로 명시)
+    # python -m src.data.raster_shadow 20250708 --report   → 폴리곤 백엔드 대비 정확도 리포트
+    from src.config.settings import (
+        BUILDINGS_SHP, DATA_DIR, ROAD_POLYGONS_SHP, SHADOW_RASTER_RESOLUTION
+    )
+
+    argv = sys.argv[1:]
+    out_csv = None
+    if "--out" in argv:
+        i = argv.index("--out")
+        out_csv = argv[i + 1]
+        argv = argv[:i] + argv[i + 2:]
+
+    date, time_slots = parse_pipeline_args(argv)
+    buildings = load_buildings(BUILDINGS_SHP)
+    roads = load_road_polygons(ROAD_POLYGONS_SHP)
+    solar_df = scenario_for_date(date, DATA_DIR, time_slots)
+
+    if "--report" in argv:
+        for res, report in compare_backends(buildings, roads, solar_df).items():
+            print(f"\n== raster {res:g}m vs polygon ==")
+            print(report.round(4).to_string())
+    else:
+        stat = raster_link_shadow(buildings, roads, solar_df, SHADOW_RASTER_RESOLUTION)
+        if out_csv is None:
+            out_csv = os.path.join(DATA_DIR, f"hourly_link_stat_{date}_raster{SHADOW_RASTER_RESOLUTION:g}m.csv")
+        stat.to_csv(out_csv, index=False)
+        print(f"[shadow backend] raster {SHADOW_RASTER_RESOLUTION:g}m → {out_csv}")
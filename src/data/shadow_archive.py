@@ -0,0 +1,175 @@
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+
+from src.data.shadow_matrix import build_shadow_matrix
+from src.data.snapshot import begin_snapshot, commit_snapshot, load_snapshot, source_hash
+
+# hourly_link_stat_YYYYMMDD.csv → 날짜 키 (int YYYYMMDD)
+_DATE_RE = re.compile(r"hourly_link_stat_(\d{8})\.csv$")
+
+
+# ======================================
+# 시즌 그림자 아카이브 (dates x time_slots x links, uint8 %)
+# ======================================
+class ShadowArchive:
+    # (날짜, 시간대) 한 칸 = links 길이의 연속 uint8 구간 → 요청은 그 한 줄(보간 시 두 줄)만 읽는다
+    # 파일은 첫 접근 시 mmap으로 열림 (날짜·시간대가 늘어도 상주 메모리는 접근한 페이지만큼)
+
+    def __init__(self, archive_dir, key):
+        self.archive_dir = archive_dir
+        self.key = key
+        self._arrays = None
+
+    def _open(self):
+        if self._arrays is None:
+            snapshot = load_snapshot(self.archive_dir, self.key)
+            if snapshot is None:
+                raise FileNotFoundError(f"shadow archive is missing or stale: {self.archive_dir}")
+            self._arrays = snapshot["arrays"]
+            self._slots = np.asarray(self._arrays["time_slots"], dtype=np.float64)
+        return self._arrays
+
+    @property
+    def dates(self):
+        return self._open()["dates"].tolist()
+
+    @property
+    def time_slots(self):
+        # 저장된 시간대 (시 단위, 분 단위 시간대는 소수)
+        self._open()
+        return self._slots.tolist()
+
+    @property
+    def link_ids(self):
+        return self._open()["link_ids"]
+
+    # ---------- 조회 ----------
+    def _date_index(self, date):
+        dates = self._open()["dates"]
+        d = int(np.searchsorted(dates, date))
+        if d >= len(dates) or dates[d] != date:
+            raise KeyError(date)
+        return d
+
+    def column(self, date, time_slot):
+        # 저장된 (date, time_slot) → links 순서 uint8 그늘 % (mmap 연속 구간 view)
+        d = self._date_index(date)
+        s = int(np.searchsorted(self._slots, time_slot - 1e-6))
+        if s >= len(self._slots) or abs(self._slots[s] - time_slot) > 1e-6:
+            raise KeyError(time_slot)
+        return self._arrays["shadow"][d, s]
+
+    def interpolated(self, date, time_slot):
+        # 임의 시각 → 앞뒤 저장 시간대 두 줄의 선형 보간 (float32 %, 범위 밖은 양 끝 시간대)
+        d = self._date_index(date)
+        slots = self._slots
+        t = min(max(float(time_slot), slots[0]), slots[-1])
+        hi = min(int(np.searchsorted(slots, t - 1e-6)), len(slots) - 1)
+        if abs(slots[hi] - t) <= 1e-6:
+            return self._arrays["shadow"][d, hi].astype(np.float32)
+
+        lo = hi - 1
+        w = np.float32((t - slots[lo]) / (slots[hi] - slots[lo]))
+        shadow = self._arrays["shadow"]
+        return (1 - w) * shadow[d, lo].astype(np.float32) + w * shadow[d, hi].astype(np.float32)
+
+    def link_rows(self, link_ids):
+        # 도로 링크 ID → 아카이브 링크 인덱스 (없으면 -1, 네트워크 로드 시 1회)
+        archive_ids = self.link_ids
+        link_ids = np.asarray(link_ids, dtype=archive_ids.dtype)
+        pos = np.minimum(np.searchsorted(archive_ids, link_ids), max(len(archive_ids) - 1, 0))
+        return np.where(archive_ids[pos] == link_ids, pos, -1)
+
+    def edge_shadow(self, date, time_slot, rows, covered):
+        # 엣지 순서 그늘 비율 (0~1 float64) / 누락 링크 0.0, 실내·터널 1.0
+        col = self.interpolated(date, time_slot)
+        shadow = np.where(rows >= 0, col[np.maximum(rows, 0)], 0).astype(np.float64) / 100.0
+        shadow[covered] = 1.0
+        return shadow
+
+
+# ======================================
+# 원본 CSV 목록 (날짜순)
+# ======================================
+def find_shadow_csvs(pattern):
+    paths = [p for p in glob.glob(pattern) if _DATE_RE.search(os.path.basename(p))]
+    return sorted(paths, key=lambda p: _DATE_RE.search(os.path.basename(p)).group(1))
+
+
+def csv_date(path):
+    return int(_DATE_RE.search(os.path.basename(path)).group(1))
+
+
+# ======================================
+# 아카이브 생성 (CSV를 하루씩 읽어 mmap 파일에 바로 기록)
+# ======================================
+def build_shadow_archive(csv_paths, archive_dir, key):
+    required = ["link_id", "time_slot", "shadow_ratio"]
+
+    # 1. 링크 축·시간대 축: 전체 날짜 합집합 (link_id / time_slot 컬럼만 읽음)
+    keys = [pd.read_csv(path, usecols=["link_id", "time_slot"]) for path in csv_paths]
+    if keys:
+        link_ids = np.unique(np.concatenate([k["link_id"].to_numpy() for k in keys]))
+        time_slots = np.unique(np.concatenate([k["time_slot"].to_numpy(dtype=np.float64) for k in keys]))
+    else:
+        link_ids, time_slots = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    del keys
+
+    tmp = begin_snapshot(archive_dir)
+    shadow = open_memmap(
+        os.path.join(tmp, "shadow.npy"), mode="w+", dtype=np.uint8,
+        shape=(len(csv_paths), len(time_slots), len(link_ids)),
+    )
+
+    # 2. 하루씩: links x slot 행렬 → 아카이브 링크 축으로 배치 → % 양자화
+    for d, path in enumerate(csv_paths):
+        df = pd.read_csv(path)
+        missing = set(required) - set(df.columns)
+        if missing:
+            raise ValueError(f"{path}: missing columns {sorted(missing)}")
+
+        matrix, link_index, _ = build_shadow_matrix(df, time_slots)
+        matrix = fill_missing_slots(matrix, time_slots, np.isin(time_slots, df["time_slot"].to_numpy()))
+        day_ids = np.fromiter(link_index.keys(), dtype=link_ids.dtype, count=len(link_index))
+        rows = np.searchsorted(link_ids, day_ids)
+
+        day = np.zeros((len(time_slots), len(link_ids)), dtype=np.uint8)
+        day[:, rows] = np.rint(np.clip(matrix, 0.0, 1.0) * 100).astype(np.uint8).T
+        shadow[d] = day
+
+    commit_snapshot(tmp, archive_dir, key, {
+        "shadow": shadow,
+        "dates": np.array([csv_date(p) for p in csv_paths], dtype=np.int64),
+        "time_slots": time_slots,
+        "link_ids": link_ids,
+    }, meta={"sources": [os.path.basename(p) for p in csv_paths], "unit": "percent"})
+
+
+def fill_missing_slots(matrix, time_slots, present):
+    # 날짜마다 시간대 해상도가 다를 수 있음 (정시 CSV + 10분 CSV) → 빈 시간대는 그날 값으로 선형 보간
+    if present.all() or not present.any():
+        return matrix
+
+    known = np.flatnonzero(present)
+    for j in np.flatnonzero(~present):
+        hi = known[min(np.searchsorted(known, j), len(known) - 1)]
+        lo = known[max(np.searchsorted(known, j) - 1, 0)]
+        w = 0.0 if hi == lo else (time_slots[j] - time_slots[lo]) / (time_slots[hi] - time_slots[lo])
+        matrix[:, j] = (1 - w) * matrix[:, lo] + w * matrix[:, hi]
+    return matrix
+
+
+def open_shadow_archive(pattern, archive_dir):
+    # 원본 CSV 내용이 바뀌었거나 날짜가 추가됐을 때만 재생성, 아니면 열기만 (지연 mmap)
+    csv_paths = find_shadow_csvs(pattern)
+    key = source_hash(csv_paths)
+
+    if load_snapshot(archive_dir, key) is None:
+        build_shadow_archive(csv_paths, archive_dir, key)
+
+    return ShadowArchive(archive_dir, key)
@@ -0,0 +1,45 @@
+import numpy as np
+
+# 서비스 시간대 (08~19시, 정시)
+TIME_SLOTS = list(range(8, 20))
+
+
+# ======================================
+# 분 단위 시간대 (시 단위 float, 소수 6자리 고정 → 캐시 키·CSV 왕복에서 같은 값)
+# ======================================
+def slot_of_minutes(minutes):
+    return round(minutes / 60.0, 6)
+
+
+def slot_label(time_slot):
+    minutes = int(round(time_slot * 60))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def time_slots_every(step_minutes, first_slot=TIME_SLOTS[0], last_slot=TIME_SLOTS[-1]):
+    # first_slot ~ last_slot (포함) 구간을 step_minutes 간격으로
+    start, stop = int(round(first_slot * 60)), int(round(last_slot * 60))
+    return [slot_of_minutes(m) for m in range(start, stop + 1, step_minutes)]
+
+
+# ======================================
+# HOURLY_LINK_STAT → links x time_slot 밀집 행렬
+# ======================================
+def build_shadow_matrix(shadow_df, time_slots=TIME_SLOTS):
+    link_ids = np.unique(shadow_df["link_id"].to_numpy())
+    link_index = {lid: i for i, lid in enumerate(link_ids.tolist())}
+
+    slot_index = {slot: i for i, slot in enumerate(time_slots)}
+
+    # 누락된 (link, time_slot) 조합은 그늘 0.0
+    matrix = np.zeros((len(link_ids), len(time_slots)), dtype=np.float64)
+
+    slots = shadow_df["time_slot"].to_numpy()
+    in_range = np.isin(slots, time_slots)
+
+    rows = np.searchsorted(link_ids, shadow_df["link_id"].to_numpy()[in_range])
+    cols = np.searchsorted(np.asarray(time_slots), slots[in_range])
+    matrix[rows, cols] = shadow_df["shadow_ratio"].to_numpy()[in_range]
+
+    return matrix, link_index, slot_index
+
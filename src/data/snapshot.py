@@ -0,0 +1,110 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+# 배열 구성·의미가 바뀌면 올림 → 기존 스냅샷은 자동으로 stale
+SNAPSHOT_VERSION = 3
+
+
+# ======================================
+# 원본 파일 내용 해시 (shapefile은 .dbf/.shx/.prj 등 부속 파일 포함)
+# ======================================
+def source_files(paths):
+    files = []
+    for path in paths:
+        if path.endswith(".shp"):
+            files.extend(sorted(glob.glob(os.path.splitext(path)[0] + ".*")))
+        else:
+            files.append(path)
+    return files
+
+
+def source_hash(paths):
+    h = hashlib.sha1(f"v{SNAPSHOT_VERSION}".encode())
+    for path in source_files(paths):
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+# ======================================
+# 스냅샷 저장 (배열별 .npy + manifest.json)
+# ======================================
+def save_snapshot(snapshot_dir, key, arrays, meta=None):
+    # .npy는 np.load(mmap_mode="r")로 바로 매핑 가능 (npz는 압축 해제가 필요해 제외)
+    tmp = begin_snapshot(snapshot_dir)
+    commit_snapshot(tmp, snapshot_dir, key, arrays, meta)
+
+
+def begin_snapshot(snapshot_dir):
+    # 임시 디렉터리에 모두 쓴 뒤 rename → 다른 세션이 반쯤 쓴 스냅샷을 읽지 않음
+    # (큰 배열은 이 디렉터리에 open_memmap으로 직접 채운 뒤 commit 가능)
+    parent = os.path.dirname(os.path.abspath(snapshot_dir))
+    os.makedirs(parent, exist_ok=True)
+
+    tmp = f"{snapshot_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    return tmp
+
+
+def commit_snapshot(tmp, snapshot_dir, key, arrays, meta=None):
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "source_hash": key,
+        "meta": meta or {},
+        "arrays": {},
+    }
+    for name, arr in arrays.items():
+        path = os.path.join(tmp, f"{name}.npy")
+        if isinstance(arr, np.memmap) and os.path.abspath(arr.filename) == os.path.abspath(path):
+            arr.flush()
+        else:
+            arr = np.ascontiguousarray(arr)
+            np.save(path, arr)
+        manifest["arrays"][name] = {"dtype": arr.dtype.str, "shape": list(arr.shape)}
+
+    with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    old = f"{snapshot_dir}.{os.getpid()}.old"
+    if os.path.exists(snapshot_dir):
+        os.replace(snapshot_dir, old)
+    os.replace(tmp, snapshot_dir)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+# ======================================
+# 스냅샷 로드 (버전·원본 해시가 같을 때만, 아니면 None)
+# ======================================
+def load_snapshot(snapshot_dir, key):
+    path = os.path.join(snapshot_dir, "manifest.json")
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("source_hash") != key:
+        return None
+
+    arrays = {}
+    for name, spec in manifest["arrays"].items():
+        try:
+            arr = np.load(os.path.join(snapshot_dir, f"{name}.npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if arr.dtype.str != spec["dtype"] or list(arr.shape) != spec["shape"]:
+            return None
+        arrays[name] = arr
+
+    return {"arrays": arrays, "meta": manifest["meta"]}
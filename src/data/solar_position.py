@@ -0,0 +1,125 @@
+from datetime import date as Date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.data.shadow_matrix import TIME_SLOTS
+
+# 기준 지점: PoC 도로망 중심 (강남구 역삼동 일대, WGS84)
+SITE_LAT = 37.5027
+SITE_LON = 127.0429
+
+# 한국 표준시 (UTC+9, 서머타임 없음)
+KST_OFFSET_HOURS = 9
+
+
+# ======================================
+# 날짜 키 정규화 (int YYYYMMDD)
+# ======================================
+def date_key(date):
+    # 20250708 / "20250708" / "2025-07-08" / datetime.date 모두 허용
+    if isinstance(date, Date):
+        return date.year * 10000 + date.month * 100 + date.day
+    return int(str(date).replace("-", ""))
+
+
+# ======================================
+# 태양 위치 (NOAA 태양 계산식, Meeus 천체력 근사)
+# ======================================
+def solar_position(utc_times, lat=SITE_LAT, lon=SITE_LON):
+    # utc_times: datetime64 배열 (UTC) → (고도°, 방위각°) / 고도는 대기 굴절 보정 포함
+    # 방위각: 북쪽 기준 시계방향 (solar_scenario CSV와 동일)
+    sec = np.asarray(utc_times, dtype="datetime64[ns]").astype(np.int64) / 1e9
+    T = (sec / 86400.0 + 2440587.5 - 2451545.0) / 36525.0  # J2000 기준 율리우스 세기
+
+    # 태양 평균 황경·평균 근점이각·궤도 이심률
+    L0 = (280.46646 + T * (36000.76983 + 0.0003032 * T)) % 360
+    M = np.radians(357.52911 + T * (35999.05029 - 0.0001537 * T))
+    e = 0.016708634 - T * (0.000042037 + 0.0000001267 * T)
+
+    # 중심차 → 겉보기 황경
+    C = (
+        np.sin(M) * (1.914602 - T * (0.004817 + 0.000014 * T))
+        + np.sin(2 * M) * (0.019993 - 0.000101 * T)
+        + np.sin(3 * M) * 0.000289
+    )
+    omega = np.radians(125.04 - 1934.136 * T)
+    app_long = np.radians(L0 + C - 0.00569 - 0.00478 * np.sin(omega))
+
+    # 황도 경사 → 적위
+    eps0 = 23 + (26 + (21.448 - T * (46.815 + T * (0.00059 - T * 0.001813))) / 60) / 60
+    eps = np.radians(eps0 + 0.00256 * np.cos(omega))
+    decl = np.arcsin(np.sin(eps) * np.sin(app_long))
+
+    # 균시차 (분)
+    y = np.tan(eps / 2) ** 2
+    L0r = np.radians(L0)
+    eot = 4 * np.degrees(
+        y * np.sin(2 * L0r) - 2 * e * np.sin(M)
+        + 4 * e * y * np.sin(M) * np.cos(2 * L0r)
+        - 0.5 * y * y * np.sin(4 * L0r) - 1.25 * e * e * np.sin(2 * M)
+    )
+
+    # 진태양시 → 시간각
+    minutes = (sec % 86400) / 60.0
+    ha = np.radians(((minutes + eot + 4 * lon) % 1440) / 4 - 180)
+
+    latr = np.radians(lat)
+    cos_zen = np.sin(latr) * np.sin(decl) + np.cos(latr) * np.cos(decl) * np.cos(ha)
+    altitude = 90 - np.degrees(np.arccos(np.clip(cos_zen, -1, 1)))
+    azimuth = (np.degrees(np.arctan2(
+        np.sin(ha), np.cos(ha) * np.sin(latr) - np.tan(decl) * np.cos(latr)
+    )) + 180) % 360
+
+    return altitude + atmospheric_refraction(altitude), azimuth
+
+
+def atmospheric_refraction(altitude):
+    # NOAA 근사식 (°) — 고도 10° 부근에서 약 0.09°, 85° 이상은 0
+    te = np.tan(np.radians(altitude))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        arcsec = np.select(
+            [altitude > 85, altitude > 5, altitude > -0.575],
+            [
+                0.0,
+                58.1 / te - 0.07 / te ** 3 + 0.000086 / te ** 5,
+                1735 + altitude * (-518.2 + altitude * (103.4 + altitude * (-12.79 + altitude * 0.711))),
+            ],
+            -20.772 / te,
+        )
+    return arcsec / 3600.0
+
+
+# ======================================
+# 날짜별 태양 시나리오 (SOLAR_SCENARIO, 날짜·시간대 조합별 1회 계산)
+# ======================================
+@lru_cache(maxsize=64)
+def _scenario_arrays(date, time_slots, lat, lon):
+    # time_slots: KST 시각 (시, 소수 가능: 8.5 = 08:30)
+    day = np.datetime64(f"{date // 10000:04d}-{date // 100 % 100:02d}-{date % 100:02d}", "ns")
+    offset = np.rint((np.asarray(time_slots, dtype=np.float64) - KST_OFFSET_HOURS) * 3600e9)
+    utc = day + offset.astype("timedelta64[ns]")
+
+    altitude, azimuth = solar_position(utc, lat, lon)
+    altitude.flags.writeable = False
+    azimuth.flags.writeable = False
+    return utc, altitude, azimuth
+
+
+def solar_scenario(date, time_slots=TIME_SLOTS, lat=SITE_LAT, lon=SITE_LON):
+    # 반환: solar_scenario_YYYYMMDD.csv와 같은 컬럼 (time_slot, sun_altitude, sun_azimuth, timestamp_kst)
+    utc, altitude, azimuth = _scenario_arrays(date_key(date), tuple(time_slots), lat, lon)
+
+    return pd.DataFrame({
+        "time_slot": list(time_slots),
+        "sun_altitude": altitude.round(2),
+        "sun_azimuth": azimuth.round(2),
+        "timestamp_kst": pd.DatetimeIndex(utc, tz="UTC").tz_convert("Asia/Seoul").astype(str),
+    })
+
+
+def write_solar_scenario(date, csv_path, time_slots=TIME_SLOTS):
+    df = solar_scenario(date, time_slots)
+    df.to_csv(csv_path, index=False)
+    return df
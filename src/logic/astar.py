@@ -0,0 +1,178 @@
+import heapq
+import math
+
+import networkx as nx
+import numpy as np
+
+
+# ======================================
+# 휴리스틱 스케일 (모드별 m당 최소 비용)
+# ======================================
+def min_cost_per_metre(net, cost):
+    # 엣지 비용 / 양끝 노드 직선거리의 최솟값
+    # → scale x 직선거리 는 어떤 경로 비용보다도 작거나 같음 (허용·일관 휴리스틱)
+    xy = net.node_xy
+    chord = np.hypot(*(xy[net.edge_u] - xy[net.edge_v]).T)
+
+    valid = chord > 0
+    if not valid.any():
+        return 0.0
+
+    return float(np.min(np.asarray(cost)[valid] / chord[valid]))
+
+
+def _euclid_to(net, t, scale):
+    # 노드 → t 직선거리 x scale (노드 인덱스 순서 리스트)
+    d = np.hypot(*(net.node_xy - net.node_xy[t]).T)
+    return (d * scale).tolist()
+
+
+# ======================================
+# A* (단방향)
+# ======================================
+def astar_path(net, s, t, cost, scale=None, heuristic=None):
+    # scale=0 이면 일반 Dijkstra와 동일 (탐색 공간 비교용)
+    # heuristic: 노드별 하한 리스트 (ALT 등 외부 휴리스틱, 주어지면 scale 무시)
+    if heuristic is not None:
+        h = heuristic
+    else:
+        if scale is None:
+            scale = min_cost_per_metre(net, cost)
+        h = _euclid_to(net, t, scale)
+
+    cost = np.asarray(cost, dtype=np.float64).tolist()
+    adjacency = net.adjacency
+
+    dist = [math.inf] * net.n_nodes
+    pred = [-1] * net.n_nodes
+
+    dist[s] = 0.0
+    heap = [(h[s], 0.0, s)]
+    settled = 0
+
+    while heap:
+        _, du, u = heapq.heappop(heap)
+
+        # 더 짧은 거리로 이미 전개된 항목은 건너뜀 (개선되면 재전개 허용)
+        if du > dist[u]:
+            continue
+        settled += 1
+
+        if u == t:
+            break
+
+        for v, eid in adjacency[u]:
+            nd = du + cost[eid]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd + h[v], nd, v))
+
+    if math.isinf(dist[t]):
+        raise nx.NetworkXNoPath(f"No path between {net.node_ids[s]} and {net.node_ids[t]}.")
+
+    idx = [t]
+    while idx[-1] != s:
+        idx.append(pred[idx[-1]])
+    idx.reverse()
+
+    return idx, {"settled": settled, "cost": dist[t]}
+
+
+# ======================================
+# 양방향 A* (대칭 평균 포텐셜)
+# ======================================
+def bidirectional_astar_path(net, s, t, cost, scale=None):
+    if scale is None:
+        scale = min_cost_per_metre(net, cost)
+
+    # p(v) = (h_t(v) - h_s(v)) / 2 → 정방향은 +p, 역방향은 -p (둘 다 일관)
+    h_t = _euclid_to(net, t, scale)
+    h_s = _euclid_to(net, s, scale)
+    p = [(a - b) / 2 for a, b in zip(h_t, h_s)]
+
+    cost = np.asarray(cost, dtype=np.float64).tolist()
+    adjacency = net.adjacency
+    n = net.n_nodes
+
+    dist = ([math.inf] * n, [math.inf] * n)
+    pred = ([-1] * n, [-1] * n)
+    done = ([False] * n, [False] * n)
+    sign = (1.0, -1.0)
+
+    dist[0][s] = 0.0
+    dist[1][t] = 0.0
+    heaps = ([(p[s], s)], [(-p[t], t)])
+
+    best, meet = math.inf, -1
+    settled = 0
+
+    while heaps[0] and heaps[1]:
+        # 종료 조건: 양쪽 최소 키 합 >= 현재 최적 (포텐셜 상쇄)
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        # 더 작은 큐를 가진 방향부터 전개
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, u = heapq.heappop(heaps[side])
+        if done[side][u]:
+            continue
+        done[side][u] = True
+        settled += 1
+
+        d_here, d_other = dist[side], dist[1 - side]
+        du = d_here[u]
+
+        for v, eid in adjacency[u]:
+            nd = du + cost[eid]
+            if nd < d_here[v]:
+                d_here[v] = nd
+                pred[side][v] = u
+                heapq.heappush(heaps[side], (nd + sign[side] * p[v], v))
+
+            if d_other[v] < math.inf and d_here[v] + d_other[v] < best:
+                best = d_here[v] + d_other[v]
+                meet = v
+
+        if d_other[u] < math.inf and du + d_other[u] < best:
+            best = du + d_other[u]
+            meet = u
+
+    if meet < 0:
+        raise nx.NetworkXNoPath(f"No path between {net.node_ids[s]} and {net.node_ids[t]}.")
+
+    forward = [meet]
+    while forward[-1] != s:
+        forward.append(pred[0][forward[-1]])
+    forward.reverse()
+
+    backward = []
+    v = meet
+    while v != t:
+        v = pred[1][v]
+        backward.append(v)
+
+    return forward + backward, {"settled": settled, "cost": best}
+
+
+# ======================================
+# 탐색 공간 비교 (settled 노드 수)
+# ======================================
+def search_space_report(net, s, t, cost, landmark_store=None):
+    _, dijkstra_stats = astar_path(net, s, t, cost, scale=0.0)
+    _, astar_stats = astar_path(net, s, t, cost)
+    _, bidir_stats = bidirectional_astar_path(net, s, t, cost)
+
+    report = {
+        "dijkstra": dijkstra_stats["settled"],
+        "astar": astar_stats["settled"],
+        "bidirectional_astar": bidir_stats["settled"],
+    }
+
+    if landmark_store is not None:
+        _, alt_stats = astar_path(
+            net, s, t, cost, heuristic=landmark_store.heuristic(cost, t)
+        )
+        report["alt"] = alt_stats["settled"]
+
+    return report
@@ -0,0 +1,384 @@
+import hashlib
+import math
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+
+# ======================================
+# Customizable Contraction Hierarchies (CCH)
+# ======================================
+# 1) 전처리 (메트릭 무관, 1회): 좌표 기반 nested dissection 순서 → 위상 축약 → 상향 arc / 삼각형 목록
+# 2) 커스터마이즈 (비용 벡터마다): 삼각형 완화를 레벨 단위 벡터 연산으로 수행
+# 3) 질의: 소거 트리(elimination tree) 조상만 완화 → 양쪽 최소 합 지점에서 만남 → shortcut 풀기
+class CCH:
+
+    def __init__(self, net, leaf_size=16, cache_size=16):
+        self.net = net
+        n = net.n_nodes
+
+        # 1. 축약 순서 (rank: 작을수록 먼저 축약)
+        order = nested_dissection_order(net, leaf_size)
+        self.rank = np.empty(n, dtype=np.int64)
+        self.rank[order] = np.arange(n)
+
+        # 2. 위상 축약 (chordal completion)
+        upward = self._contract(order)
+
+        # 3. 상향 arc 번호 / 소거 트리
+        self._build_arcs(upward)
+        self._build_triangles(upward)
+
+        self._customized = OrderedDict()
+        self._cache_size = cache_size
+
+    # ---------- 전처리 ----------
+    def _contract(self, order):
+        rank = self.rank
+        net = self.net
+
+        upward = [set() for _ in range(net.n_nodes)]
+        for u, v in zip(net.edge_u.tolist(), net.edge_v.tolist()):
+            if u == v:
+                continue
+            if rank[u] < rank[v]:
+                upward[u].add(v)
+            else:
+                upward[v].add(u)
+
+        # v 축약 시 상향 이웃끼리 clique → 가장 낮은 상향 이웃에 나머지를 넘김
+        for v in order.tolist():
+            if len(upward[v]) < 2:
+                continue
+            lowest = min(upward[v], key=lambda w: rank[w])
+            upward[lowest].update(w for w in upward[v] if w != lowest)
+
+        return [sorted(nbrs, key=lambda w: rank[w]) for nbrs in upward]
+
+    def _build_arcs(self, upward):
+        n = self.net.n_nodes
+
+        self.up_ptr = np.zeros(n + 1, dtype=np.int64)
+        self.up_ptr[1:] = np.cumsum([len(nbrs) for nbrs in upward])
+        self.up_head = np.array([w for nbrs in upward for w in nbrs], dtype=np.int64)
+        self.n_arcs = len(self.up_head)
+
+        self.arc_tail = np.repeat(np.arange(n), np.diff(self.up_ptr))
+        self._arc_of = {
+            (int(a), int(b)): i
+            for i, (a, b) in enumerate(zip(self.arc_tail, self.up_head))
+        }
+
+        # 소거 트리 부모 = 가장 낮은 rank의 상향 이웃
+        self.parent = np.full(n, -1, dtype=np.int64)
+        has_up = np.diff(self.up_ptr) > 0
+        self.parent[has_up] = self.up_head[self.up_ptr[:-1][has_up]]
+
+        # 원본 엣지 → arc (평행 엣지는 커스터마이즈 시 최솟값)
+        u, v = self.net.edge_u.astype(np.int64), self.net.edge_v.astype(np.int64)
+        keep = u != v
+        low = np.where(self.rank[u] < self.rank[v], u, v)[keep]
+        high = np.where(self.rank[u] < self.rank[v], v, u)[keep]
+        self.edge_ids = np.nonzero(keep)[0]
+        self.edge_arc = np.array(
+            [self._arc_of[(a, b)] for a, b in zip(low.tolist(), high.tolist())],
+            dtype=np.int64
+        )
+
+        self._up_lists = [
+            list(zip(self.up_head[self.up_ptr[v]:self.up_ptr[v + 1]].tolist(),
+                     range(self.up_ptr[v], self.up_ptr[v + 1])))
+            for v in range(n)
+        ]
+
+    def _build_triangles(self, upward):
+        # 하향 삼각형 (mid < a < b): arc(mid,a) + arc(mid,b) → arc(a,b) 후보
+        first, second, target, middle = [], [], [], []
+        for mid, nbrs in enumerate(upward):
+            for i in range(len(nbrs)):
+                a = nbrs[i]
+                arc_a = self._arc_of[(mid, a)]
+                for b in nbrs[i + 1:]:
+                    first.append(arc_a)
+                    second.append(self._arc_of[(mid, b)])
+                    target.append(self._arc_of[(a, b)])
+                    middle.append(mid)
+
+        first = np.array(first, dtype=np.int64)
+        second = np.array(second, dtype=np.int64)
+        target = np.array(target, dtype=np.int64)
+        middle = np.array(middle, dtype=np.int64)
+
+        # 레벨: 하향 이웃의 최대 레벨 + 1 → 같은 레벨 삼각형은 서로 독립
+        level = np.zeros(self.net.n_nodes, dtype=np.int64)
+        for v in np.argsort(self.rank).tolist():
+            for w in upward[v]:
+                level[w] = max(level[w], level[v] + 1)
+
+        order = np.argsort(level[middle], kind="stable")
+        self.tri_first = first[order]
+        self.tri_second = second[order]
+        self.tri_target = target[order]
+        self.tri_middle = middle[order]
+
+        tri_level = level[self.tri_middle]
+        self.level_bounds = np.searchsorted(
+            tri_level, np.arange(tri_level.max() + 2 if len(tri_level) else 1)
+        )
+
+    # ---------- 커스터마이즈 ----------
+    def customize(self, cost):
+        cost = np.ascontiguousarray(cost, dtype=np.float64)
+        key = hashlib.sha1(cost.tobytes()).hexdigest()
+
+        if key in self._customized:
+            self._customized.move_to_end(key)
+            return self._customized[key]
+
+        base = np.full(self.n_arcs, np.inf)
+        np.minimum.at(base, self.edge_arc, cost[self.edge_ids])
+
+        weight = base.copy()
+        for lo, hi in zip(self.level_bounds[:-1], self.level_bounds[1:]):
+            if lo == hi:
+                continue
+            sl = slice(lo, hi)
+            np.minimum.at(
+                weight, self.tri_target[sl],
+                weight[self.tri_first[sl]] + weight[self.tri_second[sl]]
+            )
+
+        # shortcut 풀기용 중간 노드 (원본 엣지보다 짧아진 arc만)
+        via = weight[self.tri_first] + weight[self.tri_second]
+        hit = (via == weight[self.tri_target]) & (weight[self.tri_target] < base[self.tri_target])
+        middle = np.full(self.n_arcs, -1, dtype=np.int64)
+        middle[self.tri_target[hit]] = self.tri_middle[hit]
+
+        metric = {"weight": weight.tolist(), "middle": middle.tolist()}
+
+        self._customized[key] = metric
+        if len(self._customized) > self._cache_size:
+            self._customized.popitem(last=False)
+
+        return metric
+
+    # ---------- 질의 ----------
+    def _upward_search(self, sources, weight):
+        # sources: [(노드, 시작 비용)] → 각 출발 노드의 소거 트리 조상 합집합을 rank 순으로 완화
+        dist, pred = {}, {}
+        chain = set()
+        for v, d in sources:
+            if d < dist.get(v, math.inf):
+                dist[v] = d
+                pred[v] = -1
+            while v >= 0 and v not in chain:
+                chain.add(v)
+                v = int(self.parent[v])
+
+        for v in sorted(chain, key=self.rank.__getitem__):
+            dv = dist.get(v, math.inf)
+            if dv < math.inf:
+                for w, arc in self._up_lists[v]:
+                    nd = dv + weight[arc]
+                    if nd < dist.get(w, math.inf):
+                        dist[w] = nd
+                        pred[w] = arc
+
+        return dist, pred
+
+    def query(self, s, t, cost, net=None):
+        # net: 가상 노드가 삽입된 질의 네트워크 (s, t, cost는 그 네트워크 기준)
+        # → 가상 노드는 분할 엣지 양끝 원본 노드에서 시작 비용을 두고 출발
+        net = net or self.net
+        cost = np.asarray(cost, dtype=np.float64)
+        base_cost = cost[:self.net.n_edges]
+
+        metric = self.customize(base_cost)
+        weight = metric["weight"]
+
+        dist_f, pred_f = self._upward_search(net.endpoint_offsets(s, base_cost), weight)
+        dist_b, pred_b = self._upward_search(net.endpoint_offsets(t, base_cost), weight)
+
+        best, meet = math.inf, -1
+        for v, d in dist_f.items():
+            total = d + dist_b.get(v, math.inf)
+            if total < best:
+                best, meet = total, v
+
+        # 서로 다른 연결요소 → 직접 구간 검사보다 먼저 (inf <= inf 로 가짜 경로가 나오지 않도록)
+        if meet < 0:
+            raise nx.NetworkXNoPath(
+                f"No path between {net.node_ids[s]} and {net.node_ids[t]}."
+            )
+
+        # 출발·도착이 같은 엣지 위의 가상 노드면 직접 구간이 더 짧을 수 있음
+        direct = min((cost[eid] for nxt, eid in net.adjacency[s] if nxt == t), default=math.inf)
+        if s != t and direct < math.inf and direct <= best:
+            return [s, t], {"settled": len(dist_f) + len(dist_b), "cost": float(direct)}
+
+        forward = self._trace(meet, pred_f, metric)
+        backward = self._trace(meet, pred_b, metric)
+        backward.reverse()
+
+        path = forward + backward[1:]
+        if path[0] != s:
+            path.insert(0, s)
+        if path[-1] != t:
+            path.append(t)
+        return path, {"settled": len(dist_f) + len(dist_b), "cost": best}
+
+    def _trace(self, v, pred, metric):
+        # pred arc를 따라 source → v 노드 리스트 (shortcut 풀어서)
+        segments = []
+        while pred[v] >= 0:
+            arc = pred[v]
+            low = int(self.arc_tail[arc])
+            segments.append(self._unpack(arc, low, v, metric))
+            v = low
+
+        path = [v]
+        for seg in reversed(segments):
+            path.extend(seg[1:])
+        return path
+
+    def _unpack(self, arc, a, b, metric):
+        # arc(a↔b) → a ... b 원본 노드 리스트 (재귀 대신 스택)
+        middle = metric["middle"]
+        out = [a]
+        stack = [(arc, a, b)]
+
+        while stack:
+            arc, x, y = stack.pop()
+            mid = middle[arc]
+            if mid < 0:
+                out.append(y)
+                continue
+
+            # x → mid → y 순서로 풀기 (mid는 x, y보다 rank가 낮음)
+            stack.append((self._arc_of[(mid, y)], mid, y))
+            stack.append((self._arc_of[(mid, x)], x, mid))
+
+        return out
+
+    # ---------- 검증 ----------
+    def verify(self, cost, n_samples=200, seed=0):
+        # CCH 거리·경로 비용을 csgraph Dijkstra와 비교 (도달 불가 쌍은 NetworkXNoPath 여야 일치)
+        # 질의 쌍: 무작위 노드 쌍 + 서로 다른 연결요소 쌍 + 가상 노드(엣지 중간) 쌍
+        rng = np.random.default_rng(seed)
+        net = self.net
+        cost = np.asarray(cost, dtype=np.float64)
+
+        cases = [
+            (net, s, t)
+            for s, t in zip(rng.integers(0, net.n_nodes, n_samples).tolist(), rng.integers(0, net.n_nodes, n_samples).tolist())
+        ]
+
+        # 연결요소마다 대표 노드 1개 → 가장 큰 요소의 대표 노드와 양방향 쌍
+        _, labels = connected_components(net.weight_matrix(cost), directed=False)
+        first = np.unique(labels, return_index=True)[1]
+        main = int(first[np.argmax(np.bincount(labels))])
+        for node in first.tolist():
+            if node != main:
+                cases += [(net, node, main), (net, main, node)]
+
+        # 가상 노드 쌍 (다른 연결요소의 엣지 쌍 포함)
+        edges = rng.integers(0, net.n_edges, (max(n_samples // 4, 1), 2)).tolist()
+        edges += [[int(np.flatnonzero(labels[net.edge_u] == labels[node])[0]), int(np.flatnonzero(labels[net.edge_u] == labels[main])[0])]
+                  for node in first.tolist() if node != main]
+        for e1, e2 in edges:
+            qnet = net.with_virtual_nodes([
+                {"id": -1 - k, "edge": e, "fraction": 0.5, "xy": tuple(net.node_xy[[net.edge_u[e], net.edge_v[e]]].mean(axis=0))}
+                for k, e in enumerate((e1, e2))
+            ])
+            cases.append((qnet, net.n_nodes, net.n_nodes + 1))
+
+        checked, mismatches, disconnected, max_error = 0, 0, 0, 0.0
+        for qnet, s, t in cases:
+            qcost = qnet.extend(cost)
+            ref = qnet.distances_from(s, qcost)[t]
+            checked += 1
+            try:
+                path, stats = self.query(s, t, qcost, qnet)
+            except nx.NetworkXNoPath:
+                disconnected += 1
+                if not math.isinf(ref):
+                    mismatches += 1
+                continue
+
+            if math.isinf(ref):
+                mismatches += 1
+                continue
+
+            path_cost = path_weight(qnet, path, qcost)
+            error = max(abs(stats["cost"] - ref), abs(path_cost - ref))
+            max_error = max(max_error, error)
+            if error > 1e-6 * max(1.0, ref):
+                mismatches += 1
+
+        return {"checked": checked, "mismatches": mismatches, "disconnected": disconnected, "max_abs_error": max_error}
+
+
+# ======================================
+# 경로(노드 인덱스) 비용 합 (평행 엣지는 최소 비용)
+# ======================================
+def path_weight(net, path, cost):
+    total = 0.0
+    for a, b in zip(path[:-1], path[1:]):
+        total += min(cost[eid] for nxt, eid in net.adjacency[a] if nxt == b)
+    return total
+
+
+# ======================================
+# 좌표 기반 nested dissection 축약 순서 (메트릭 무관)
+# ======================================
+def nested_dissection_order(net, leaf_size=16):
+    adjacency = [set(nxt for nxt, _ in nbrs) for nbrs in net.adjacency]
+    xy = net.node_xy
+
+    order = []
+    stack = [(np.arange(net.n_nodes), 0)]
+
+    # 스택으로 재귀 대신 처리: (노드 집합, 분할 단계) / 분할자 노드는 나중에 축약
+    while stack:
+        nodes, depth = stack.pop()
+
+        if depth < 0:
+            order.extend(nodes.tolist())
+            continue
+
+        if len(nodes) <= leaf_size:
+            # 소규모: 차수 낮은 노드부터
+            deg = np.array([len(adjacency[v]) for v in nodes.tolist()])
+            order.extend(nodes[np.argsort(deg, kind="stable")].tolist())
+            continue
+
+        # 좌표 범위가 넓은 축의 중앙값으로 이분할
+        span = xy[nodes].max(axis=0) - xy[nodes].min(axis=0)
+        axis = int(np.argmax(span))
+        coord = xy[nodes, axis]
+        split = np.median(coord)
+
+        left_mask = coord <= split
+        if left_mask.all() or not left_mask.any():
+            left_mask = np.zeros(len(nodes), dtype=bool)
+            left_mask[np.argsort(coord, kind="stable")[: len(nodes) // 2]] = True
+
+        left = set(nodes[left_mask].tolist())
+        right = set(nodes[~left_mask].tolist())
+
+        # 분할자: 반대쪽과 연결된 경계 노드 (작은 쪽 경계를 사용)
+        sep_left = {v for v in left if adjacency[v] & right}
+        sep_right = {v for v in right if adjacency[v] & left}
+        separator = sep_left if len(sep_left) <= len(sep_right) else sep_right
+
+        left -= separator
+        right -= separator
+
+        # 분할자는 양쪽 부분 문제 이후에 축약 → 스택에 먼저 넣음
+        stack.append((np.array(sorted(separator), dtype=np.int64), -1))
+        stack.append((np.array(sorted(right), dtype=np.int64), depth + 1))
+        stack.append((np.array(sorted(left), dtype=np.int64), depth + 1))
+
+    return np.array(order, dtype=np.int64)
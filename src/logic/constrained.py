@@ -0,0 +1,78 @@
+import heapq
+import math
+
+import networkx as nx
+
+from src.logic.graph_core import NodePath
+
+
+# ======================================
+# 우회 거리 제한 최소 비용 경로 (Resource-Constrained Shortest Path)
+# ======================================
+def constrained_shortest_path(net, s, t, cost, length, max_length):
+    # s, t: 노드 인덱스 / cost, length: 엣지 벡터
+    # 목적: sum(cost) 최소화, 제약: sum(length) <= max_length
+    # 라벨 설정법 + 지배 관계 가지치기 (후보 개수 제한 없음, 제약 내 정확해)
+
+    # 부동소수점 합산 순서 차이로 기준 경로가 잘리지 않도록 1mm 허용
+    max_length = max_length + 1e-3
+
+    # 1. 도착지 기준 하한 (무방향 그래프 → t 출발 Dijkstra)
+    lb_cost = net.distances_from(t, cost).tolist()
+    lb_len = net.distances_from(t, length).tolist()
+
+    if math.isinf(lb_len[s]) or lb_len[s] > max_length:
+        raise nx.NetworkXNoPath(
+            f"No path between {net.node_ids[s]} and {net.node_ids[t]} within {max_length:.1f}m."
+        )
+
+    cost = cost.tolist()
+    length = length.tolist()
+    adjacency = net.adjacency
+
+    # 2. 라벨: (node, cost, length, parent, 들어온 엣지) → 평행 링크도 실제 사용한 엣지로 구분
+    labels = [(s, 0.0, 0.0, -1, -1)]
+    heap = [(lb_cost[s], 0.0, 0)]
+
+    # 노드별로 이미 확정된 라벨의 최소 길이 (비용 순 확정 → 더 길면 지배됨)
+    settled_len = [math.inf] * net.n_nodes
+
+    while heap:
+        _, _, label_id = heapq.heappop(heap)
+        node, c, l, _, _ = labels[label_id]
+
+        if l >= settled_len[node]:
+            continue
+        settled_len[node] = l
+
+        # 3. 도착지 최초 확정 = 최적 (lb_cost는 일관된 휴리스틱)
+        if node == t:
+            return trace_labels(net, labels, label_id)
+
+        for nxt, eid in adjacency[node]:
+            nl = l + length[eid]
+
+            # 우회 제한 초과 / 지배된 라벨은 생성하지 않음
+            if nl + lb_len[nxt] > max_length or nl >= settled_len[nxt]:
+                continue
+
+            nc = c + cost[eid]
+            labels.append((nxt, nc, nl, label_id, eid))
+            heapq.heappush(heap, (nc + lb_cost[nxt], nl, len(labels) - 1))
+
+    raise nx.NetworkXNoPath(
+        f"No path between {net.node_ids[s]} and {net.node_ids[t]} within {max_length:.1f}m."
+    )
+
+
+def trace_labels(net, labels, label_id):
+    idx, eids = [], []
+    while label_id >= 0:
+        node, _, _, parent, eid = labels[label_id]
+        idx.append(node)
+        eids.append(eid)
+        label_id = parent
+    idx.reverse()
+    eids.reverse()
+
+    return NodePath(net.to_node_ids(idx), eids[1:])
@@ -0,0 +1,117 @@
+import numpy as np
+
+
+# ======================================
+# 시설 페널티 (calc_facility_penalty 벡터화)
+# ======================================
+def facility_penalty(attrs, mode):
+    penalty = np.zeros(len(attrs["length"]), dtype=np.float64)
+
+    # 스칼라 버전과 같은 순서로 더해야 부동소수점 결과가 정확히 일치
+    penalty = np.where(attrs["tunnel"], penalty + 0.4, penalty)
+    penalty = np.where(attrs["crosswalk"], penalty + 0.2, penalty)
+    penalty = np.where(
+        attrs["footbridge"],
+        penalty + (0.3 if mode != "cooling" else 1.0),
+        penalty
+    )
+
+    return penalty
+
+
+# ======================================
+# 실내 피로 페널티 (calc_indoor_penalty 벡터화)
+# ======================================
+def indoor_fatigue_penalty(attrs):
+    # station_or_underground: 0.6 / semi_indoor: 0.1
+    station = attrs["indoor"] & (attrs["length"] >= 60)
+    semi = attrs["indoor"] & ~station
+
+    return np.select([station, semi], [0.6, 0.1], default=0.0)
+
+
+# ======================================
+# 비용 커널 (쿨링/최단/큰길)
+# ======================================
+def compute_costs(attrs, shadow, rain_penalty):
+    length = attrs["length"]
+
+    # 1️⃣ 최단 경로
+    total_penalty = rain_penalty + facility_penalty(attrs, "shortest")
+    cost_shortest = length * (1 + total_penalty)
+
+    # 2️⃣ 큰길 우선
+    # 큰길 여부는 엣지 테이블 적재 시 MAIN 비트로 미리 계산
+    main_factor = np.where(attrs["main"], 1.0, 1.5)
+    total_penalty = rain_penalty + facility_penalty(attrs, "main")
+    cost_main = length * main_factor * (1 + total_penalty)
+
+    # 3️⃣ 쿨링 경로
+    heat_penalty = (1 - shadow) * 2.0
+    cooling_penalty = heat_penalty + indoor_fatigue_penalty(attrs)
+    total_penalty = rain_penalty + facility_penalty(attrs, "cooling")
+    cost_cooling = length * (1 + cooling_penalty + total_penalty)
+
+    return {
+        "cost_shortest": cost_shortest,
+        "cost_main": cost_main,
+        "cost_cooling": cost_cooling,
+    }
+
+
+# ======================================
+# 퍼스널 비용 커널
+# ======================================
+def compute_personal_cost(attrs, shadow, rain_penalty, pref):
+    cw = pref["cooling_weight"]
+    length = attrs["length"]
+
+    facility = np.zeros(len(length), dtype=np.float64)
+    if pref["avoid_tunnel"]:
+        facility = np.where(attrs["tunnel"], facility + 0.6, facility)
+    if pref["avoid_footbridge"]:
+        facility = np.where(attrs["footbridge"], facility + 0.4, facility)
+    if pref["avoid_indoor"]:
+        facility = np.where(attrs["indoor"], facility + 0.5, facility)
+
+    heat_penalty = (1 - shadow) * 2.0 * cw
+    time_penalty = (1 - cw)
+
+    return length * (
+        1 + heat_penalty + time_penalty + rain_penalty + facility
+    )
+
+
+# ======================================
+# 그늘 반응 계수 (비용 = a + b x shadow)
+# ======================================
+def shade_response(kernel, n_edges):
+    # kernel: shadow 벡터 → 비용 벡터 (compute_costs / compute_personal_cost 부분 적용)
+    # 두 비용 커널 모두 shadow에 대해 1차식 → 그늘 0 / 1 두 번 평가로 계수 복원
+    a = kernel(np.zeros(n_edges, dtype=np.float64))
+    b = kernel(np.ones(n_edges, dtype=np.float64)) - a
+    return a, b
+
+
+# ======================================
+# 엣지 보행 시간 (calc_edge_time 벡터화, 초)
+# ======================================
+def edge_walk_time(attrs, rain_mm=0.0, base_speed=1.2):
+    length = attrs["length"]
+    time_sec = length / base_speed
+
+    # 실내 시간 페널티 (역사·지하 40초 / 필로티·아케이드 8초)
+    station = attrs["indoor"] & (length >= 60)
+    semi = attrs["indoor"] & ~station
+    time_sec = time_sec + np.select([station, semi], [40.0, 8.0], default=0.0)
+
+    # 횡단보도 신호대기 / 육교 계단 (스칼라 버전과 같은 순서로 더함)
+    time_sec = np.where(attrs["crosswalk"], time_sec + 30, time_sec)
+    time_sec = np.where(attrs["footbridge"], time_sec + 20, time_sec)
+
+    if rain_mm >= 3:
+        time_sec = time_sec * 1.15
+    elif rain_mm >= 1:
+        time_sec = time_sec * 1.08
+
+    return time_sec
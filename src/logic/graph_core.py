@@ -0,0 +1,368 @@
+from collections import ChainMap
+
+import numpy as np
+import networkx as nx
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+
+
+# ======================================
+# 경로 (원본 노드 ID 리스트 + 실제 사용한 엣지 인덱스)
+# ======================================
+class NodePath(list):
+    # list 그대로 쓰이되, 평행 링크 중 어느 엣지를 지났는지 eids로 함께 보관
+    def __init__(self, nodes, eids=None):
+        super().__init__(nodes)
+        self.eids = None if eids is None else list(eids)
+
+
+# ======================================
+# 배열 기반 라우팅 코어 (CSR 인접 행렬)
+# ======================================
+class RoadNetwork:
+    # 노드: 0..n-1 연속 인덱스 / 엣지: 0..m-1 연속 인덱스
+    # arc: 무방향 엣지 1개 → 방향 arc 2개 (u→v, v→u)
+
+    # 가상 노드가 삽입된 질의 네트워크면 base = 원본 네트워크
+    base = None
+
+    def __init__(self, node_ids, edge_u, edge_v, node_index=None, csr=None):
+        # csr: (indptr, indices, arc_edge) 스냅샷에 저장된 CSR이 있으면 재정렬 생략
+        self.node_ids = np.asarray(node_ids)
+        if node_index is None:
+            node_index = {nid: i for i, nid in enumerate(self.node_ids.tolist())}
+        self.node_index = node_index
+
+        self.edge_u = np.asarray(edge_u, dtype=np.int32)
+        self.edge_v = np.asarray(edge_v, dtype=np.int32)
+
+        self.n_nodes = len(self.node_ids)
+        self.n_edges = len(self.edge_u)
+
+        self._adjacency = None
+        self._stacked = {}  # 블록 수 → 블록 대각 CSR 구조 (stacked_weight_matrix)
+        self._build_csr(csr)
+
+    def _build_csr(self, csr=None):
+        if csr is not None:
+            self.indptr, self.indices, self.arc_edge = csr
+            self._build_pairs()
+            return
+
+        eids = np.arange(self.n_edges, dtype=np.int32)
+
+        # self-loop은 경로 탐색에 의미가 없으므로 arc에서 제외
+        keep = self.edge_u != self.edge_v
+
+        tails = np.concatenate([self.edge_u[keep], self.edge_v[keep]])
+        heads = np.concatenate([self.edge_v[keep], self.edge_u[keep]])
+        arc_edge = np.concatenate([eids[keep], eids[keep]])
+
+        order = np.argsort(tails, kind="stable")
+
+        self.indices = heads[order]
+        self.arc_edge = arc_edge[order]
+        self.indptr = np.zeros(self.n_nodes + 1, dtype=np.int32)
+        np.cumsum(np.bincount(tails, minlength=self.n_nodes), out=self.indptr[1:])
+
+        self._build_pairs()
+
+    def _build_pairs(self):
+        # 노드 쌍 → 엣지 묶음 (평행 링크는 같은 묶음, 정렬 키 + 이진 탐색)
+        pair = self._pair_key(self.edge_u, self.edge_v)
+        self._pair_order = np.argsort(pair, kind="stable")
+        self._pair_keys, self._pair_start, self._pair_count = np.unique(
+            pair[self._pair_order], return_index=True, return_counts=True
+        )
+        self.n_parallel = self.n_edges - len(self._pair_keys)
+
+    def _pair_key(self, a, b):
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        return np.minimum(a, b) * self.n_nodes + np.maximum(a, b)
+
+    # ---------- Python 탐색용 인접 리스트 ----------
+    @property
+    def adjacency(self):
+        # 노드별 [(이웃 노드, 엣지 인덱스), ...] (라벨 탐색 등 Python 루프용, 최초 1회 생성)
+        if self._adjacency is None and self.base is not None:
+            # 질의 네트워크: 원본 인접 리스트를 공유하고 분할 엣지가 닿는 노드만 새 리스트로
+            adjacency = list(self.base.adjacency)
+            adjacency += [[] for _ in range(self.n_nodes - self.base.n_nodes)]
+            for j in range(self.base.n_edges, self.n_edges):
+                a, b = int(self.edge_u[j]), int(self.edge_v[j])
+                adjacency[a] = adjacency[a] + [(b, j)]
+                adjacency[b] = adjacency[b] + [(a, j)]
+            self._adjacency = adjacency
+
+        if self._adjacency is None:
+            indptr = self.indptr.tolist()
+            heads = self.indices.tolist()
+            eids = self.arc_edge.tolist()
+            self._adjacency = [
+                list(zip(heads[indptr[i]:indptr[i + 1]], eids[indptr[i]:indptr[i + 1]]))
+                for i in range(self.n_nodes)
+            ]
+        return self._adjacency
+
+    # ---------- 가상 노드 (스냅 지점) ----------
+    @property
+    def root(self):
+        return self if self.base is None else self.base
+
+    def with_virtual_nodes(self, points):
+        # points: [{"id": 가상 노드 ID, "edge": 엣지 인덱스, "fraction": edge_u 기준 비율, "xy": (x, y)}, ...]
+        # 원본 엣지는 그대로 두고, 가상 노드를 양끝에 잇는 분할 엣지만 뒤에 덧붙인다
+        # (분할 엣지 비용 = 원본 비용 x 비율 → 새 지름길이 생기지 않음)
+        n, m = self.n_nodes, self.n_edges
+        new_u, new_v, parent, frac = [], [], [], []
+        spans = {}
+
+        def add(a, b, e, lo, hi):
+            spans[m + len(new_u)] = (lo, hi)
+            new_u.append(a)
+            new_v.append(b)
+            parent.append(e)
+            frac.append(hi - lo)
+
+        for k, p in enumerate(points):
+            e, f = p["edge"], p["fraction"]
+            add(int(self.edge_u[e]), n + k, e, 0.0, f)
+            add(n + k, int(self.edge_v[e]), e, f, 1.0)
+
+        # 출발·도착이 같은 엣지 위면 둘을 직접 잇는 구간도 추가
+        for i in range(len(points)):
+            for j in range(i + 1, len(points)):
+                if points[i]["edge"] == points[j]["edge"]:
+                    lo, hi = sorted((points[i]["fraction"], points[j]["fraction"]))
+                    a, b = (n + i, n + j) if points[i]["fraction"] <= points[j]["fraction"] else (n + j, n + i)
+                    add(a, b, points[i]["edge"], lo, hi)
+
+        ids = [p["id"] for p in points]
+        net = RoadNetwork(
+            np.concatenate([self.node_ids, ids]),
+            np.concatenate([self.edge_u, new_u]),
+            np.concatenate([self.edge_v, new_v]),
+            node_index=ChainMap({nid: n + k for k, nid in enumerate(ids)}, self.node_index),
+        )
+        net.base = self
+        net.base_edge = np.concatenate([np.arange(m), parent]).astype(np.int64)
+        net.edge_fraction = np.concatenate([np.ones(m), frac])
+        net.virtual_points = points
+        net.virtual_spans = spans
+
+        net.node_xy = np.vstack([self.node_xy, [p["xy"] for p in points]])
+        net.edge_attrs = {
+            key: net.extend(arr, additive=(key == "length"))
+            for key, arr in self.edge_attrs.items()
+        }
+        return net
+
+    def parent_edge(self, eid):
+        # 질의 네트워크 엣지 → 원본 엣지 인덱스
+        if eid < self.root.n_edges:
+            return eid
+        return int(self.base_edge[eid])
+
+    def edge_geometry_of(self, eid):
+        # EPSG:5179 LineString (분할 엣지는 잘린 구간)
+        if eid < self.root.n_edges:
+            return self.root.edges.geometry(eid)
+        return self.edge_geometry[eid]
+
+    def edge_lonlat_of(self, eid):
+        # EPSG:4326 (lon, lat) 좌표 배열 (지도 렌더링용, 좌표 변환 없이 버퍼 슬라이스)
+        if eid < self.root.n_edges:
+            edges = self.root.edges
+            return edges.lonlat[edges.coord_slice(eid)]
+        return self.edge_lonlat[eid]
+
+    def extend(self, values, additive=True):
+        # 원본 엣지 벡터 → 질의 네트워크 엣지 벡터
+        # additive: 길이·비용처럼 구간 비율만큼 나눠지는 값 / 아니면 (그늘 비율·시설 여부) 그대로 복사
+        # values: (m,) 또는 (k, m) 묶음 (마지막 축이 엣지)
+        values = np.asarray(values)
+        if self.base is None:
+            return values
+
+        tail = values[..., self.base_edge[self.base.n_edges:]]
+        if additive:
+            tail = tail * self.edge_fraction[self.base.n_edges:]
+        return np.concatenate([values, tail], axis=-1)
+
+    def endpoint_offsets(self, idx, edge_weights):
+        # 노드 인덱스 → 원본 네트워크 기준 [(노드, 추가 비용)] (CCH·ALT 등 원본 전처리 재사용용)
+        root = self.root
+        if idx < root.n_nodes:
+            return [(idx, 0.0)]
+
+        p = self.virtual_points[idx - root.n_nodes]
+        w = float(edge_weights[p["edge"]])
+        return [
+            (int(root.edge_u[p["edge"]]), w * p["fraction"]),
+            (int(root.edge_v[p["edge"]]), w * (1.0 - p["fraction"])),
+        ]
+
+    # ---------- 가중치 ----------
+    def weight_matrix(self, edge_weights):
+        # 엣지 가중치(float64, 길이 m) → CSR 가중치 행렬
+        data = np.asarray(edge_weights, dtype=np.float64)[self.arc_edge]
+        return csr_matrix(
+            (data, self.indices, self.indptr),
+            shape=(self.n_nodes, self.n_nodes)
+        )
+
+    def stacked_weight_matrix(self, weight_stack):
+        # 가중치 벡터 K개 → 네트워크 K벌을 대각으로 이어 붙인 CSR (블록끼리 연결 없음)
+        # 구조(indices, indptr)는 블록 수별 1회만 만들고 호출마다 data만 채움
+        stack = np.asarray(weight_stack, dtype=np.float64)
+        k, n, n_arcs = len(stack), self.n_nodes, len(self.indices)
+
+        if k not in self._stacked:
+            # int32 인덱스: scipy가 호출마다 인덱스 범위를 다시 검사하지 않음
+            blocks = np.arange(k, dtype=np.int64)[:, None]
+            self._stacked[k] = (
+                (self.indices + n * blocks).ravel().astype(np.int32),
+                np.append((self.indptr[:-1] + n_arcs * blocks).ravel(), n_arcs * k).astype(np.int32),
+            )
+        indices, indptr = self._stacked[k]
+
+        return csr_matrix(
+            (np.take(stack, self.arc_edge, axis=1).ravel(), indices, indptr),
+            shape=(n * k, n * k)
+        )
+
+    # ---------- 탐색 ----------
+    def stacked_shortest_paths(self, u_node, v_node, weight_stack, bound_eids=None):
+        # 같은 OD를 가중치 벡터 K개(시간대별 비용 등)로 한 번의 dijkstra 호출에서 탐색
+        # 블록마다 출발 노드 1개 + min_only → 블록이 분리돼 있어 블록별 최단 경로 트리와 동일
+        # bound_eids: 아무 s→t 경로의 엣지 목록 (있으면 블록마다 그 경로 비용으로 나눠 limit=1
+        #             → 최단 경로는 그대로, 블록별로 그 비용보다 먼 노드는 확정하지 않음)
+        s = self.node_index[u_node]
+        t = self.node_index[v_node]
+        weight_stack = np.asarray(weight_stack, dtype=np.float64)
+        offsets = self.n_nodes * np.arange(len(weight_stack))
+
+        search, limit = weight_stack, np.inf
+        if bound_eids is not None and len(bound_eids) > 0:
+            bound = weight_stack[:, list(bound_eids)].sum(axis=1)
+            if np.all(np.isfinite(bound) & (bound > 0)):
+                search, limit = weight_stack / bound[:, None], 1.0 + 1e-9
+
+        _, pred, _ = dijkstra(
+            self.stacked_weight_matrix(search),
+            directed=True,
+            indices=s + offsets,
+            min_only=True,
+            limit=limit,
+            return_predecessors=True,
+        )
+
+        # 시간대가 달라도 같은 노드 경로가 많음 → 노드 쌍 → 엣지 묶음 조회는 경로별 1회 (평행 링크 선택만 블록별)
+        pred = pred.tolist()
+        paths, seen = [], {}
+        for offset, weights in zip(offsets.tolist(), weight_stack):
+            idx = self.pred_walk(pred, s, t, offset)
+
+            key = tuple(idx)
+            if key not in seen:
+                seen[key] = self._pair_pos(idx[:-1], idx[1:])
+            paths.append(NodePath(self.to_node_ids(idx), self._pos_edges(seen[key], weights).tolist()))
+        return paths
+
+    def shortest_path(self, u_node, v_node, edge_weights):
+        s = self.node_index[u_node]
+        t = self.node_index[v_node]
+
+        _, pred = dijkstra(
+            self.weight_matrix(edge_weights),
+            directed=True,
+            indices=s,
+            return_predecessors=True,
+        )
+        return self.reconstruct_path(pred, s, t, edge_weights)
+
+    def distances_from(self, idx, edge_weights, limit=np.inf):
+        # 단일/다중 출발 노드 인덱스 → 전체 노드 거리 (무방향이므로 도착 기준 하한으로도 사용)
+        return dijkstra(
+            self.weight_matrix(edge_weights),
+            directed=True,
+            indices=idx,
+            limit=limit,
+        )
+
+    def to_node_ids(self, idx_path):
+        return self.node_ids[list(idx_path)].tolist()
+
+    def path_edges(self, idx_path, edge_weights):
+        # 노드 인덱스 경로 → 구간별 엣지 인덱스
+        idx = np.asarray(idx_path, dtype=np.int64)
+        if len(idx) < 2:
+            return []
+        return self.pair_edges(idx[:-1], idx[1:], edge_weights).tolist()
+
+    def pair_edges(self, a, b, edge_weights):
+        # 인접 노드 인덱스 쌍 (a[i], b[i]) → 엣지 인덱스 배열
+        return self._pos_edges(self._pair_pos(a, b), edge_weights)
+
+    def _pair_pos(self, a, b):
+        # 노드 쌍 → 엣지 묶음 번호
+        return np.searchsorted(self._pair_keys, self._pair_key(np.asarray(a), np.asarray(b)))
+
+    def _pos_edges(self, pos, edge_weights):
+        # 평행 링크가 있는 쌍만 해당 비용 벡터에서 최소 엣지를 고른다 (묶음 크기만큼만 비교)
+        start = self._pair_start[pos]
+        eids = self._pair_order[start]
+
+        for i in np.nonzero(self._pair_count[pos] > 1)[0].tolist():
+            members = self._pair_order[start[i]:start[i] + self._pair_count[pos[i]]]
+            eids[i] = members[np.argmin(np.asarray(edge_weights)[members])]
+
+        return eids
+
+    def to_node_path(self, idx_path, edge_weights):
+        return NodePath(self.to_node_ids(idx_path), self.path_edges(idx_path, edge_weights))
+
+    def reconstruct_path(self, pred, s, t, edge_weights):
+        # predecessor 배열 → 원본 노드 ID 리스트 (nx.shortest_path와 동일한 형태)
+        return self.to_node_path(self.pred_walk(pred, s, t), edge_weights)
+
+    def pred_walk(self, pred, s, t, offset=0):
+        # predecessor 배열 → s ... t 노드 인덱스 리스트
+        # offset: 블록 대각 탐색의 블록 시작 (pred 값도 블록 기준으로 offset만큼 밀려 있음)
+        if s != t and pred[offset + t] < 0:
+            raise nx.NetworkXNoPath(
+                f"No path between {self.node_ids[s]} and {self.node_ids[t]}."
+            )
+
+        idx = [t]
+        while idx[-1] != s:
+            idx.append(int(pred[offset + idx[-1]]) - offset)
+        idx.reverse()
+        return idx
+
+
+# ======================================
+# nx.Graph → RoadNetwork 변환 (1회만)
+# ======================================
+def build_road_network(G, nodes):
+    # nodes: NodeTable (연속 인덱스 = 네트워크 노드 인덱스)
+    # 엣지 인덱스·양끝 노드·속성은 base graph에 보관된 엣지 테이블을 그대로 사용
+    # (스냅샷에서 읽은 CSR이 있으면 그대로 사용)
+    edges = G.graph["edges"]
+
+    net = RoadNetwork(
+        nodes.ids, edges.records["u"], edges.records["v"],
+        node_index=nodes, csr=G.graph.get("csr"),
+    )
+    net.nodes = nodes
+    net.edges = edges
+
+    # 노드 좌표 (A* 휴리스틱 등)
+    net.node_xy = nodes.xy
+
+    # 비용 커널 입력용 엣지 속성 배열 (length / tunnel / footbridge / crosswalk / indoor / main)
+    net.edge_attrs = edges.attrs()
+
+    return net
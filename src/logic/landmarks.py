@@ -0,0 +1,190 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from src.logic.astar import min_cost_per_metre
+
+
+# ======================================
+# ALT 랜드마크 (A*, Landmarks, Triangle inequality)
+# ======================================
+class LandmarkStore:
+    # 랜드마크: 도로망 위 노드 (보행 거리 기준 farthest-point 선택)
+    # 거리표: 기준 비용 벡터(정시 시간대)별 (n_landmarks x n_nodes) float32, 디스크 캐시
+    # 그 외 벡터(분 단위 시간대·비·퍼스널): 거리표를 새로 만들지 않고 기준 거리표 하한을 배율 조정해 재사용
+    # → 디스크·메모리 거리표 수는 기준 벡터 수로 고정
+
+    def __init__(self, net, cache_dir, n_landmarks=8, max_tables=48):
+        self.net = net
+        self.cache_dir = os.path.join(cache_dir, network_hash(net))
+        self.n_landmarks = n_landmarks
+        self.max_tables = max_tables
+        self._tables = OrderedDict()  # LRU (mmap 핸들)
+        self._base = {}               # 기준 벡터 키 → 비용 벡터
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.landmarks = self._load_or_select_landmarks()
+
+    # ---------- 랜드마크 선택 ----------
+    def _load_or_select_landmarks(self):
+        path = os.path.join(self.cache_dir, f"landmarks_{self.n_landmarks}.npy")
+        if os.path.exists(path):
+            return np.load(path)
+
+        landmarks = select_landmarks(self.net, self.n_landmarks)
+        np.save(path, landmarks)
+        return landmarks
+
+    # ---------- 거리표 ----------
+    def table(self, cost):
+        cost = np.ascontiguousarray(cost, dtype=np.float64)
+        key = cost_key(cost)
+
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            return self._tables[key]
+
+        path = os.path.join(self.cache_dir, f"dist_{key}.npy")
+        if os.path.exists(path):
+            table = np.load(path, mmap_mode="r")
+        else:
+            table = self.net.distances_from(self.landmarks, cost).astype(np.float32)
+            _atomic_save(path, table)
+
+        self._tables[key] = table
+        if len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def precompute(self, cost_vectors):
+        # 기준 비용 벡터 묶음 등록 → 없는 거리표만 계산 (증분)
+        for cost in cost_vectors:
+            cost = np.array(cost, dtype=np.float64)
+            self._base[cost_key(cost)] = cost
+            self.table(cost)
+
+    def prune(self):
+        # 기준 벡터에 없는 거리표 파일 삭제 (이전 날짜 아카이브 등으로 남은 파일)
+        keep = {f"dist_{key}.npy" for key in self._base}
+        for name in os.listdir(self.cache_dir):
+            if name.startswith("dist_") and name not in keep:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+    # ---------- 휴리스틱 ----------
+    def heuristic(self, cost, t, net=None):
+        # net: 가상 노드가 삽입된 질의 네트워크 (cost, t는 그 네트워크 기준)
+        # 기준 벡터면 그 거리표 그대로, 아니면 k x 기준 하한 (cost >= k x 기준 → 거리도 k배 이상)
+        # 직선거리 하한과 최댓값 (둘 다 허용·일관 → 최댓값도 허용·일관)
+        net = net or self.net
+        cost = np.asarray(cost, dtype=np.float64)
+        base_cost = cost[:self.net.n_edges]
+
+        h = _euclid_bound(net, cost, t)
+
+        key = cost_key(base_cost)
+        if key in self._base:
+            scale, ref = 1.0, self._base[key]
+        else:
+            scale, ref = self._best_scale(base_cost)
+
+        if scale > 0:
+            h = np.maximum(h, scale * self._alt_bound(ref, t, net))
+
+        return h.tolist()
+
+    def _best_scale(self, cost):
+        # 기준 벡터 중 min(cost / 기준) 이 가장 큰 것 (기준 비용 0 엣지는 제약 없음)
+        best, best_ref = 0.0, None
+        for ref in self._base.values():
+            positive = ref > 0
+            if not positive.any():
+                continue
+            scale = float(np.min(cost[positive] / ref[positive]))
+            if scale > best:
+                best, best_ref = scale, ref
+        return best, best_ref
+
+    def _alt_bound(self, base_cost, t, net):
+        # h(v) = max_L |d(L, t) - d(L, v)|  (무방향 → 삼각 부등식 양쪽 모두 사용)
+        table = np.asarray(self.table(base_cost), dtype=np.float64)
+
+        # 가상 노드 열: 분할 엣지 양끝 원본 노드를 거친 거리 중 최소
+        if net.n_nodes > self.net.n_nodes:
+            extra = [
+                np.min([table[:, a] + off for a, off in net.endpoint_offsets(v, base_cost)], axis=0)
+                for v in range(self.net.n_nodes, net.n_nodes)
+            ]
+            table = np.hstack([table, np.array(extra).T])
+
+        d_t = table[:, t:t + 1]
+        reachable = np.isfinite(d_t[:, 0])
+
+        if not reachable.any():
+            return np.zeros(net.n_nodes)
+
+        diff = np.abs(d_t[reachable] - table[reachable])
+        diff[~np.isfinite(diff)] = 0.0
+        h = diff.max(axis=0)
+
+        # float32 반올림 오차만큼 낮춰 허용 휴리스틱 유지
+        finite = table[np.isfinite(table)]
+        slack = float(finite.max()) * 2.0 ** -20 if finite.size else 0.0
+
+        return np.maximum(h - slack, 0.0)
+
+
+def _euclid_bound(net, cost, t):
+    # 직선거리 x m당 최소 비용 (astar 기본 휴리스틱과 동일)
+    d = np.hypot(*(net.node_xy - net.node_xy[t]).T)
+    return d * max(min_cost_per_metre(net, cost), 0.0)
+
+
+def cost_key(cost):
+    # 캐시 키: 비용 벡터 내용 해시
+    return hashlib.sha1(np.ascontiguousarray(cost, dtype=np.float64).tobytes()).hexdigest()[:16]
+
+
+# ======================================
+# 랜드마크 선택 (farthest-point, 보행 거리 기준)
+# ======================================
+def select_landmarks(net, n_landmarks):
+    length = net.edge_attrs["length"]
+
+    # 도로망 중심에 가장 가까운 노드에서 시작 → 가장 먼 노드를 첫 랜드마크로
+    center = net.node_xy.mean(axis=0)
+    start = int(np.argmin(np.hypot(*(net.node_xy - center).T)))
+
+    dist = net.distances_from(start, length)
+    landmarks = [int(np.argmax(np.where(np.isfinite(dist), dist, -1.0)))]
+    min_dist = net.distances_from(landmarks[0], length)
+
+    while len(landmarks) < min(n_landmarks, net.n_nodes):
+        # 기존 랜드마크에서 가장 먼 노드 (다른 연결요소의 노드는 inf → 우선 선택)
+        score = np.where(np.isin(np.arange(net.n_nodes), landmarks), -1.0, min_dist)
+        nxt = int(np.argmax(score))
+        landmarks.append(nxt)
+        min_dist = np.minimum(min_dist, net.distances_from(nxt, length))
+
+    return np.array(landmarks, dtype=np.int32)
+
+
+# ======================================
+# 캐시 키용 네트워크 해시
+# ======================================
+def network_hash(net):
+    h = hashlib.sha1()
+    for arr in (net.node_ids, net.edge_u, net.edge_v, net.edge_attrs["length"]):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()[:12]
+
+
+def _atomic_save(path, arr):
+    # 여러 세션이 동시에 쓰더라도 깨진 파일이 남지 않도록 임시 파일 → rename
+    tmp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp, arr)
+    os.replace(tmp, path)
@@ -0,0 +1,151 @@
+from collections.abc import Mapping
+
+import networkx as nx
+import numpy as np
+
+
+# ======================================
+# 요청별 비용 오버레이
+# ======================================
+class CostOverlay:
+    # base graph / network는 불변·공유, 요청별 상태는 엣지 인덱스 기반 벡터만 보관
+    # G[u][v] 형태로 읽으면 엣지 테이블 속성 + 오버레이 값(shadow_ratio, cost_*)이 합쳐져 보인다
+
+    def __init__(self, base_G, net, shadow):
+        self.base_G = base_G
+        self.net = net
+        self.shadow = np.asarray(shadow, dtype=np.float64)
+        self.costs = {}
+
+        # 모드별 탐색 통계 (settled 노드 수 등)
+        self.search_stats = {}
+
+        # 가상 노드(스냅 지점)에 닿는 분할 엣지: {u: {v: {"eid": j, "eids": [j]}}}
+        self.virtual_adj = {}
+        if net.base is not None:
+            self._build_virtual_adj()
+        self._nx_graph = None
+
+    def _build_virtual_adj(self):
+        net, root = self.net, self.net.root
+        for j in range(root.n_edges, net.n_edges):
+            d = {"eid": j, "eids": [j]}
+            u, v = net.node_ids[net.edge_u[j]].item(), net.node_ids[net.edge_v[j]].item()
+            self.virtual_adj.setdefault(u, {})[v] = d
+            self.virtual_adj.setdefault(v, {})[u] = d
+
+    # ---------- nx.Graph 읽기 호환 ----------
+    def __getitem__(self, u):
+        return _AdjacencyView(self, u)
+
+    def has_edge(self, u, v):
+        return v in self.virtual_adj.get(u, {}) or self.base_G.has_edge(u, v)
+
+    def edges(self, data=False):
+        # 평행 링크도 각각 한 번씩
+        for u, v, d in self.nx_graph().edges(data=True):
+            for eid in d["eids"]:
+                yield (u, v, EdgeView(self, eid)) if data else (u, v)
+
+    def nx_graph(self):
+        # networkx 참조 엔진용 그래프 (가상 노드가 있으면 분할 엣지를 더한 얕은 복사본)
+        if not self.virtual_adj:
+            return self.base_G
+        if self._nx_graph is None:
+            H = nx.Graph()
+            H.add_edges_from(self.base_G.edges(data=True))
+            for u, nbrs in self.virtual_adj.items():
+                for v, d in nbrs.items():
+                    H.add_edge(u, v, **d)
+            self._nx_graph = H
+        return self._nx_graph
+
+    def edge_data(self, d):
+        return EdgeView(self, d["eid"])
+
+    # ---------- 경로 ----------
+    def path_edges(self, path):
+        # 경로 → 구간별 엣지 뷰 (탐색 엔진이 고른 평행 링크가 있으면 그 엣지)
+        eids = getattr(path, "eids", None)
+        if eids is None:
+            return [self[u][v] for u, v in zip(path[:-1], path[1:])]
+        return [EdgeView(self, eid) for eid in eids]
+
+    def path_eids(self, path):
+        # 경로 → 구간별 엣지 인덱스 (질의 네트워크 기준, 엣지 벡터 인덱싱용)
+        eids = getattr(path, "eids", None)
+        if eids is None:
+            return [d.eid for d in self.path_edges(path)]
+        return list(eids)
+
+    def to_node_path(self, path, cost_key):
+        # 노드 ID 리스트 (networkx 참조 엔진 결과) → 평행 링크를 비용 기준으로 고른 NodePath
+        idx = [self.net.node_index[nid] for nid in path]
+        return self.net.to_node_path(idx, self.costs[cost_key])
+
+    # ---------- 가중치 ----------
+    def weight_fn(self, cost_key):
+        # networkx 참조 엔진용 weight 함수 (nx_graph()에 그대로 전달)
+        # 평행 링크 묶음은 최소 비용 (참조 엔진 전용, 묶음 크기만큼만 비교)
+        arr = self.costs[cost_key]
+        return lambda u, v, d: min(arr[eid] for eid in d["eids"])
+
+
+class _AdjacencyView:
+    def __init__(self, overlay, u):
+        self._overlay = overlay
+        self._virtual = overlay.virtual_adj.get(u, {})
+        self._adj = overlay.base_G[u] if u in overlay.base_G else {}
+
+    def __getitem__(self, v):
+        if v in self._virtual:
+            return self._overlay.edge_data(self._virtual[v])
+        return self._overlay.edge_data(self._adj[v])
+
+    def __contains__(self, v):
+        return v in self._virtual or v in self._adj
+
+
+# ======================================
+# 엣지 1개 읽기 뷰 (엣지 테이블 + 오버레이 벡터)
+# ======================================
+class EdgeView(Mapping):
+    # 엣지별 dict를 만들지 않고 키를 읽을 때 배열에서 꺼낸다
+    # 가상 노드 분할 엣지: 길이는 구간 비율만큼, 나머지는 원본 엣지 값, geometry는 잘린 구간
+
+    _TABLE_KEYS = ("link_id", "length", "tunnel", "footbridge", "crosswalk", "indoor", "main")
+
+    def __init__(self, overlay, eid):
+        self._overlay = overlay
+        self.eid = eid
+
+    def _keys(self):
+        return ("eid", *self._TABLE_KEYS, "geometry", "lonlat", "shadow_ratio", *self._overlay.costs)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __getitem__(self, key):
+        overlay, eid = self._overlay, self.eid
+        net = overlay.net
+
+        if key == "eid":
+            return eid
+        if key == "shadow_ratio":
+            return float(overlay.shadow[eid])
+        if key in overlay.costs:
+            return float(overlay.costs[key][eid])
+        if key == "link_id":
+            return int(net.root.edges.link_id[net.parent_edge(eid)])
+        if key == "length":
+            return float(net.edge_attrs["length"][eid])
+        if key in self._TABLE_KEYS:
+            return bool(net.edge_attrs[key][eid])
+        if key == "geometry":
+            return net.edge_geometry_of(eid)
+        if key == "lonlat":
+            return net.edge_lonlat_of(eid)
+        raise KeyError(key)
@@ -0,0 +1,93 @@
+import heapq
+import math
+
+import numpy as np
+
+from src.logic.constrained import trace_labels
+
+
+# ======================================
+# 길이 vs 햇빛 노출 길이 파레토 프론트
+# ======================================
+def pareto_front(net, s, t, shadow, max_detour=1.0):
+    # s, t: 노드 인덱스 / shadow: 엣지별 그늘 비율 벡터
+    # 목적 1: 보행 거리 / 목적 2: 그늘 없는 거리 (length x (1 - shadow))
+    # 최단 거리 x (1 + max_detour) 이내의 파레토 최적 경로를 거리 오름차순으로 반환
+
+    length = net.edge_attrs["length"]
+    unshaded = length * (1 - np.asarray(shadow, dtype=np.float64))
+
+    # 1. 도착지 기준 하한 (무방향 → t 출발)
+    lb_len = net.distances_from(t, length).tolist()
+    lb_uns = net.distances_from(t, unshaded).tolist()
+
+    if math.isinf(lb_len[s]):
+        return []
+
+    max_length = lb_len[s] * (1 + max_detour) + 1e-3
+
+    length = length.tolist()
+    unshaded = unshaded.tolist()
+    adjacency = net.adjacency
+
+    # 2. 라벨: (node, length, unshaded, parent, 들어온 엣지)
+    labels = [(s, 0.0, 0.0, -1, -1)]
+    heap = [(lb_len[s], lb_uns[s], 0)]
+
+    # 노드별 확정 라벨의 최소 노출 거리 (거리 순 확정 → 노출이 더 크면 지배됨)
+    settled_uns = [math.inf] * net.n_nodes
+    front = []
+
+    while heap:
+        key_len, _, label_id = heapq.heappop(heap)
+        if key_len > max_length:
+            break
+
+        node, l, u, _, _ = labels[label_id]
+
+        # 자기 노드 / 도착지 기준 지배 검사
+        if u >= settled_uns[node] or u + lb_uns[node] >= settled_uns[t]:
+            continue
+        settled_uns[node] = u
+
+        if node == t:
+            front.append({
+                "length": l,
+                "unshaded": u,
+                "path": trace_labels(net, labels, label_id),
+            })
+            continue
+
+        for nxt, eid in adjacency[node]:
+            nl = l + length[eid]
+            nu = u + unshaded[eid]
+
+            if nl + lb_len[nxt] > max_length:
+                continue
+            if nu >= settled_uns[nxt] or nu + lb_uns[nxt] >= settled_uns[t]:
+                continue
+
+            labels.append((nxt, nl, nu, label_id, eid))
+            heapq.heappush(heap, (nl + lb_len[nxt], nu + lb_uns[nxt], len(labels) - 1))
+
+    return front
+
+
+# ======================================
+# 프론트에서 우회 제한·선호 비용 기준 경로 선택
+# ======================================
+def select_from_front(front, path_cost, base_length, detour_limit):
+    # path_cost: 경로(노드 리스트) → 선호 비용 (cost_personal 합)
+    # 우회 제한을 만족하는 프론트 경로 중 비용 최소 경로 (없으면 None)
+    max_length = base_length * (1 + detour_limit) + 1e-3
+
+    best, best_cost = None, math.inf
+    for point in front:
+        if point["length"] > max_length:
+            break
+
+        cost = path_cost(point["path"])
+        if cost < best_cost:
+            best, best_cost = point, cost
+
+    return best
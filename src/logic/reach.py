@@ -0,0 +1,74 @@
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+
+# ======================================
+# 쿨 리치 (출발지에서 N분 안에 가장 빠른 길로 닿는 링크 + 그 길의 그늘 비율)
+# ======================================
+def cool_reach(net, s, edge_time, shade, budget):
+    # s: 출발 노드 인덱스 / edge_time: 엣지 보행 시간(초) / shade: 엣지 그늘 비율 / budget: 시간 예산(초)
+    # 그늘 비율은 가장 빠른 길 기준으로 보여주기만 (걸러내지 않음 → 닿는 범위는 항상 출발지와 이어짐)
+    # → one-to-many dijkstra 1회 (limit=budget: 예산 밖 노드는 확정하지 않고 종료)
+    edge_time = np.asarray(edge_time, dtype=np.float64)
+    sun_time = edge_time * (1.0 - np.asarray(shade, dtype=np.float64))
+
+    dist, pred = dijkstra(
+        net.weight_matrix(edge_time),
+        directed=True,
+        indices=s,
+        limit=budget,
+        return_predecessors=True,
+    )
+
+    # 1. 최단 시간 트리의 부모 엣지 (평행 링크는 시간이 맞는 쪽)
+    u, v = net.edge_u, net.edge_v
+    parent_edge = np.full(net.n_nodes, -1, dtype=np.int64)
+    for a, b in ((u, v), (v, u)):
+        hit = np.flatnonzero((pred[b] == a) & np.isclose(dist[a] + edge_time, dist[b]))
+        parent_edge[b[hit]] = hit
+
+    # 2. 트리를 따라 햇빛 노출 시간 누적 (도착 시간 순 → 부모가 항상 먼저)
+    reached = np.flatnonzero(np.isfinite(dist))
+    exposed = np.zeros(net.n_nodes, dtype=np.float64)
+    for b in reached[np.argsort(dist[reached], kind="stable")].tolist():
+        e = parent_edge[b]
+        if e >= 0:
+            exposed[b] = exposed[pred[b]] + sun_time[e]
+
+    # 3. 링크별 예산 안 구간: 양끝에서 각각 남은 시간만큼
+    #    두 구간이 링크를 덮으면 먼저 닿는 끝에서 한 조각, 못 덮으면 닿은 끝마다 한 조각
+    du, dv = dist[u], dist[v]
+    safe_time = np.maximum(edge_time, 1e-9)
+    with np.errstate(invalid="ignore"):
+        cover_u = np.nan_to_num(np.clip((budget - du) / safe_time, 0.0, 1.0))
+        cover_v = np.nan_to_num(np.clip((budget - dv) / safe_time, 0.0, 1.0))
+    full = cover_u + cover_v >= 1.0
+    from_u = du <= dv
+
+    piece_u = np.flatnonzero(np.where(full, from_u, cover_u > 0))
+    piece_v = np.flatnonzero(np.where(full, ~from_u, cover_v > 0))
+    frac_u = np.where(full[piece_u], 1.0, cover_u[piece_u])
+    frac_v = np.where(full[piece_v], 1.0, cover_v[piece_v])
+
+    # 조각: 엣지, edge_u 기준 비율 구간 [lo, hi], 들어온 끝 노드와 길이 비율
+    eids = np.concatenate([piece_u, piece_v])
+    lo = np.concatenate([np.zeros(len(piece_u)), 1.0 - frac_v])
+    hi = np.concatenate([frac_u, np.ones(len(piece_v))])
+    entry = np.concatenate([u[piece_u], v[piece_v]])
+    frac = np.concatenate([frac_u, frac_v])
+
+    # 4. 조각 끝까지의 누적 그늘 비율 (가장 빠른 길 + 조각)
+    t_entry = dist[entry]
+    walked = t_entry + frac * edge_time[eids]
+    sun = exposed[entry] + frac * sun_time[eids]
+    share = np.where(walked > 0, 1.0 - sun / np.maximum(walked, 1e-9), 1.0)
+
+    return {
+        "eids": eids,
+        "lo": lo,
+        "hi": hi,
+        "entry_time": t_entry,
+        "share": share,
+        "n_links": len(np.union1d(piece_u, piece_v)),
+        "reached_nodes": len(reached),
+    }
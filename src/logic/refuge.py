@@ -0,0 +1,101 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+
+# ======================================
+# 피난처 (그늘막 + 실내 링크) → 도로망 위 앵커
+# ======================================
+def build_refuges(net, shelter_snaps, shelter_names, max_snap_dist):
+    # shelter_snaps: RoadSnapper.snap 결과 (그늘막 좌표 일괄 스냅) / 스냅 거리가 먼 그늘막은 도로망 밖으로 보고 제외
+    # 피난처별 앵커: 엣지 + edge_u / edge_v 쪽 진입 비율 (앵커 비용 = 엣지 비용 x 비율)
+    # 실내 링크는 링크 전체가 피난처 → 양끝 어디서든 비용 0으로 진입
+    near = np.flatnonzero(shelter_snaps["distance"] <= max_snap_dist)
+    indoor = np.flatnonzero(net.edge_attrs["indoor"])
+
+    frac = shelter_snaps["fraction"][near]
+    mid = [net.edges.geometry(e).interpolate(0.5, normalized=True) for e in indoor.tolist()]
+
+    return {
+        "edge": np.concatenate([shelter_snaps["edge"][near], indoor]).astype(np.int64),
+        "to_u": np.concatenate([frac, np.zeros(len(indoor))]),
+        "to_v": np.concatenate([1.0 - frac, np.zeros(len(indoor))]),
+        "kind": ["shelter"] * len(near) + ["indoor"] * len(indoor),
+        "name": [shelter_names[i] for i in near.tolist()] + ["실내 보행로"] * len(indoor),
+        "xy": np.vstack([
+            shelter_snaps["xy"][near].reshape(-1, 2),
+            np.array([(p.x, p.y) for p in mid], dtype=np.float64).reshape(-1, 2),
+        ]),
+    }
+
+
+# ======================================
+# 최근접 피난처 거리장 (multi-source dijkstra 1회)
+# ======================================
+def refuge_field(net, refuges, edge_weights, edge_time):
+    # 피난처마다 앵커 노드(n + r)를 하나씩 붙이고 전부 출발점으로 min_only 탐색
+    # 반환 (노드 인덱스별): 최근접 피난처까지 비용 / 피난처 인덱스 / 그 길의 보행 시간(초) / 경로 복원용 predecessor
+    n, n_refuges = net.n_nodes, len(refuges["edge"])
+    weights = np.asarray(edge_weights, dtype=np.float64)
+    edge_time = np.asarray(edge_time, dtype=np.float64)
+    e = refuges["edge"]
+    u, v = net.edge_u[e], net.edge_v[e]
+
+    # 앵커 행은 원본 CSR 뒤에 2칸씩 이어 붙임 (평행 링크 arc가 합쳐지지 않도록 CSR 직접 구성)
+    graph = csr_matrix(
+        (
+            np.concatenate([weights[net.arc_edge], np.column_stack([weights[e] * refuges["to_u"], weights[e] * refuges["to_v"]]).ravel()]),
+            np.concatenate([net.indices, np.column_stack([u, v]).ravel()]),
+            np.concatenate([net.indptr, net.indptr[-1] + 2 * np.arange(1, n_refuges + 1)]),
+        ),
+        shape=(n + n_refuges, n + n_refuges),
+    )
+
+    dist, pred, sources = dijkstra(
+        graph,
+        directed=True,
+        indices=n + np.arange(n_refuges),
+        min_only=True,
+        return_predecessors=True,
+    )
+    dist, pred, sources = dist[:n], pred[:n], sources[:n]
+
+    # 트리 한 칸의 보행 시간: 일반 노드에서 왔으면 그 엣지, 앵커에서 왔으면 진입 비율만큼
+    reached = np.flatnonzero(np.isfinite(dist))
+    step = np.zeros(n, dtype=np.float64)
+
+    from_node = reached[pred[reached] < n]
+    step[from_node] = edge_time[net.pair_edges(pred[from_node], from_node, weights)]
+
+    from_anchor = reached[pred[reached] >= n]
+    r = pred[from_anchor] - n
+    step[from_anchor] = edge_time[e[r]] * np.where(
+        from_anchor == u[r], refuges["to_u"][r], refuges["to_v"][r]
+    )
+
+    # 도착 비용 순 → 부모가 항상 먼저
+    walk = np.zeros(n, dtype=np.float64)
+    parent = pred.tolist()
+    for b in reached[np.argsort(dist[reached], kind="stable")].tolist():
+        p = parent[b]
+        walk[b] = (walk[p] if p < n else 0.0) + step[b]
+    walk[~np.isfinite(dist)] = np.inf
+
+    return {
+        "cost": dist,
+        "refuge": np.where(sources >= 0, sources - n, -1),
+        "time": walk,
+        "pred": np.where(pred >= n, -1, pred),
+    }
+
+
+def path_to_refuge(field, idx):
+    # 노드 인덱스 → 최근접 피난처 앵커 노드까지 노드 인덱스 경로 (도달 불가면 None)
+    if field["refuge"][idx] < 0:
+        return None
+
+    pred = field["pred"]
+    path = [idx]
+    while pred[path[-1]] >= 0:
+        path.append(int(pred[path[-1]]))
+    return path
@@ -0,0 +1,132 @@
+from functools import lru_cache
+
+import numpy as np
+import shapely
+from pyproj import Transformer
+from shapely.ops import substring
+
+
+# ======================================
+# 좌표 변환기 (CRS 쌍별 1회 생성)
+# ======================================
+@lru_cache(maxsize=None)
+def get_transformer(src_crs="EPSG:4326", dst_crs="EPSG:5179"):
+    # always_xy: (lon, lat) / (x, y) 순서 고정
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
+
+# ======================================
+# 도로 선분 스냅 (STRtree + 최근접 선분 투영)
+# ======================================
+class RoadSnapper:
+    # 좌표 → 가장 가까운 도로 엣지 위의 투영점
+    # 결과: 엣지 인덱스, edge_u 쪽에서 잰 길이 비율, 투영점 좌표(EPSG:5179), 스냅 거리(m)
+
+    def __init__(self, net, geometries, endpoint_tol=0.5):
+        # geometries: 엣지 인덱스 순서의 LineString 배열 (EPSG:5179)
+        self.net = net
+        self.lines = np.asarray(geometries, dtype=object)
+        self.tree = shapely.STRtree(self.lines)
+        self.endpoint_tol = endpoint_tol
+
+        # geometry 시작점이 edge_u 쪽인지 (shapefile u/v 순서와 그래프 엣지 방향이 다를 수 있음)
+        start = shapely.get_coordinates(shapely.get_point(self.lines, 0))
+        xy = net.node_xy
+        self.forward = (
+            np.hypot(*(start - xy[net.edge_u]).T) <= np.hypot(*(start - xy[net.edge_v]).T)
+        )
+        self.line_length = shapely.length(self.lines)
+
+    def snap(self, lons, lats):
+        # 배열 입력 → 한 번의 변환 / 트리 질의 / 투영으로 일괄 처리
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+
+        x, y = get_transformer().transform(lons, lats)
+        points = shapely.points(x, y)
+
+        # 점마다 최근접 엣지 1개 (동률이면 첫 번째)
+        (pt_idx, edge), dist = self.tree.query_nearest(
+            points, return_distance=True, all_matches=False
+        )
+        order = np.argsort(pt_idx)
+        edge, dist = edge[order], dist[order]
+
+        lines = self.lines[edge]
+        t = shapely.line_locate_point(lines, points, normalized=True)
+        snapped = shapely.get_coordinates(shapely.line_interpolate_point(lines, t, normalized=True))
+
+        fraction = np.where(self.forward[edge], t, 1.0 - t)
+
+        return {
+            "edge": edge,
+            "fraction": fraction,
+            "xy": snapped,
+            "distance": dist,
+        }
+
+    def snap_points(self, lons, lats):
+        # 일괄 스냅 결과 → 좌표별 dict 리스트 (가상 노드 생성용)
+        res = self.snap(lons, lats)
+        return [
+            {
+                "edge": int(e),
+                "fraction": float(f),
+                "xy": (float(x), float(y)),
+                "distance": float(d),
+            }
+            for e, f, (x, y), d in zip(res["edge"], res["fraction"], res["xy"], res["distance"])
+        ]
+
+    # ---------- 스냅 → 탐색 노드 ----------
+    def endpoint_node(self, snap):
+        # 엣지 끝점에 충분히 가까우면 실제 노드 ID, 아니면 None (가상 노드 필요)
+        net = self.net
+        offset = snap["fraction"] * self.line_length[snap["edge"]]
+
+        if offset <= self.endpoint_tol:
+            return net.node_ids[net.edge_u[snap["edge"]]].item()
+        if self.line_length[snap["edge"]] - offset <= self.endpoint_tol:
+            return net.node_ids[net.edge_v[snap["edge"]]].item()
+        return None
+
+    def split_geometry(self, edge, frac_a, frac_b):
+        # 엣지 geometry 중 edge_u 기준 비율 구간 [frac_a, frac_b] 부분
+        if not self.forward[edge]:
+            frac_a, frac_b = 1.0 - frac_b, 1.0 - frac_a
+        return substring(self.lines[edge], frac_a, frac_b, normalized=True)
+
+
+# ======================================
+# 출발/도착 스냅 → 가상 노드가 삽입된 질의 네트워크
+# ======================================
+def insert_virtual_nodes(snapper, snaps, virtual_ids=(-1, -2)):
+    # snaps: 스냅 dict 리스트 (출발, 도착 순)
+    # 반환: (질의 네트워크, 스냅별 노드 ID)
+    # 끝점 스냅은 실제 노드를 그대로 쓰고, 나머지만 가상 노드로 엣지를 분할
+    node_of, virtual = [], []
+
+    for snap, vid in zip(snaps, virtual_ids):
+        nid = snapper.endpoint_node(snap)
+        if nid is None:
+            virtual.append(dict(snap, id=vid))
+            nid = vid
+        node_of.append(nid)
+
+    if not virtual:
+        return snapper.net, node_of
+
+    qnet = snapper.net.with_virtual_nodes(virtual)
+
+    # 분할 엣지 geometry (경로 렌더링·장애물 아이콘용)
+    qnet.edge_geometry = {
+        j: snapper.split_geometry(int(qnet.base_edge[j]), lo, hi)
+        for j, (lo, hi) in qnet.virtual_spans.items()
+    }
+    to_wgs84 = get_transformer("EPSG:5179", "EPSG:4326")
+    qnet.edge_lonlat = {
+        j: np.column_stack(to_wgs84.transform(*shapely.get_coordinates(geom).T))
+        for j, geom in qnet.edge_geometry.items()
+    }
+
+    return qnet, node_of
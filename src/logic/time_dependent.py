@@ -0,0 +1,129 @@
+import heapq
+import math
+from bisect import bisect_right
+
+import networkx as nx
+import numpy as np
+
+from src.logic.constrained import trace_labels
+
+
+# ======================================
+# 보행 시계 기반 시간 의존 Dijkstra
+# ======================================
+def td_dijkstra(net, s, t, depart, edge_time, cost_a, cost_b, slots, shade_column):
+    # 엣지 비용 = cost_a + cost_b x shadow(τ) / τ: 보행 시계로 잰 엣지 진입 시각
+    # depart: 출발 시각 (시, float) / edge_time: 엣지 보행 시간(초)
+    # slots: 저장 시간대 (오름차순, 시) / shade_column(j): slots[j]의 엣지 그늘 벡터 (처음 닿을 때만 호출)
+    #
+    # 남은 구간 비용이 도착 시각에 따라 달라지므로 노드별 라벨 1개로는 최적을 보장하지 못함
+    # → 노드별 (비용, 도착 시각) 비지배 라벨을 모두 유지 (pareto_front와 같은 라벨 구조)
+    # 비용·도착 시각이 모두 나쁜 라벨만 버림 (그런 라벨이 이후 그늘로 역전하는 경우까지 보장하지는 않음)
+    edge_time = np.asarray(edge_time, dtype=np.float64)
+    cost_a = np.asarray(cost_a, dtype=np.float64)
+    cost_b = np.asarray(cost_b, dtype=np.float64)
+    adjacency = net.adjacency
+
+    # 도착지 기준 하한: 그늘 0~1 중 가장 싼 비용 (무방향 → t 출발 1회)
+    lb = net.distances_from(t, np.maximum(cost_a + np.minimum(cost_b, 0.0), 0.0)).tolist()
+    if math.isinf(lb[s]):
+        raise nx.NetworkXNoPath(f"No path between {net.node_ids[s]} and {net.node_ids[t]}.")
+
+    edge_time = edge_time.tolist()
+    cost_a = cost_a.tolist()
+    cost_b = cost_b.tolist()
+
+    columns = {}
+
+    def shade_at(eid, clock):
+        j, w = slot_weight(slots, depart + clock / 3600.0)
+
+        if j not in columns:
+            columns[j] = np.asarray(shade_column(j), dtype=np.float64).tolist()
+        value = columns[j][eid]
+        if w > 0.0:
+            if j + 1 not in columns:
+                columns[j + 1] = np.asarray(shade_column(j + 1), dtype=np.float64).tolist()
+            value = (1.0 - w) * value + w * columns[j + 1][eid]
+        return value
+
+    # 라벨: (node, cost, clock, parent, 들어온 엣지) / 키: cost + 하한 (동률이면 이른 도착)
+    labels = [(s, 0.0, 0.0, -1, -1)]
+    heap = [(lb[s], 0.0, 0)]
+
+    # 노드별 확정 라벨의 최소 도착 시각 (키 순 확정 → 같은 노드에선 비용이 작거나 같음 → 도착도 늦으면 지배됨)
+    settled_clock = [math.inf] * net.n_nodes
+    settled = 0
+    found = -1
+
+    while heap:
+        _, _, label_id = heapq.heappop(heap)
+        node, cost, clock, _, _ = labels[label_id]
+
+        if clock >= settled_clock[node]:
+            continue
+        settled_clock[node] = clock
+        settled += 1
+
+        # 하한이 일관적이라 처음 확정되는 도착지 라벨이 최소 비용
+        if node == t:
+            found = label_id
+            break
+
+        for nxt, eid in adjacency[node]:
+            nclock = clock + edge_time[eid]
+            if nclock >= settled_clock[nxt]:
+                continue
+
+            ncost = cost + cost_a[eid] + cost_b[eid] * shade_at(eid, clock)
+            labels.append((nxt, ncost, nclock, label_id, eid))
+            heapq.heappush(heap, (ncost + lb[nxt], nclock, len(labels) - 1))
+
+    if found < 0:
+        raise nx.NetworkXNoPath(f"No path between {net.node_ids[s]} and {net.node_ids[t]}.")
+
+    path = trace_labels(net, labels, found)
+
+    # 노드별 도착 시각 (출발 후 초)
+    clocks = []
+    label_id = found
+    while label_id >= 0:
+        clocks.append(labels[label_id][2])
+        label_id = labels[label_id][3]
+    path.clock = clocks[::-1]
+
+    return path, {
+        "settled": settled,
+        "labels": len(labels),
+        "cost": labels[found][1],
+        "duration": labels[found][2],
+        "slots_touched": len(columns),
+    }
+
+
+# ======================================
+# 저장 시간대 보간 위치 / 경로 구간별 그늘
+# ======================================
+def slot_weight(slots, hour):
+    # hour → (앞 시간대 인덱스 j, 뒤 시간대 가중치 w) / 저장 시간대 사이 선형 보간 (범위 밖은 양 끝 시간대)
+    hi = bisect_right(slots, hour)
+    if hi == 0 or hi == len(slots):
+        return (0 if hi == 0 else len(slots) - 1), 0.0
+    return hi - 1, (hour - slots[hi - 1]) / (slots[hi] - slots[hi - 1])
+
+
+def shade_along(eids, clock, depart, slots, shade_column):
+    # 경로 구간별 진입 시각(depart + clock[k]초)의 그늘 (td_dijkstra 비용 평가와 같은 보간)
+    columns = {}
+    shade = np.zeros(len(eids), dtype=np.float64)
+
+    for k, eid in enumerate(eids):
+        j, w = slot_weight(slots, depart + clock[k] / 3600.0)
+        for col, weight in ((j, 1.0 - w), (j + 1, w)):
+            if weight <= 0.0:
+                continue
+            if col not in columns:
+                columns[col] = np.asarray(shade_column(col), dtype=np.float64)
+            shade[k] += weight * columns[col][eid]
+
+    return shade